@@ -0,0 +1,149 @@
+# 소스별 적응형 폴링. 리스트 수집 결과로 소스별 새 기사 게시량(건/분)의 EWMA를 추적하고
+# 다음 수집 주기와 페이지 깊이를 설정 범위 안에서 조정 (한산한 시간에는 드물게 얕게, 속보가 몰리면 자주 깊게)
+import os
+import math
+import threading
+from checkpoint import load_state, save_state
+import metrics
+
+ADAPTIVE_STATE_PATH = os.getenv("ADAPTIVE_STATE_PATH", "./checkpoints/adaptive_poll.json")
+ADAPTIVE_MIN_INTERVAL = float(os.getenv("ADAPTIVE_MIN_INTERVAL", "30"))  # 초
+ADAPTIVE_MAX_INTERVAL = float(os.getenv("ADAPTIVE_MAX_INTERVAL", "300"))  # 초, 한산한 소스에 속보가 몰릴 때 놓치는 양의 상한을 정함
+ADAPTIVE_MAX_PAGES = int(os.getenv("ADAPTIVE_MAX_PAGES", "20"))  # 소스별 최대 페이지 깊이 (최소 깊이는 소스의 기본 페이지 수)
+ADAPTIVE_ALPHA = float(os.getenv("ADAPTIVE_ALPHA", "0.3"))  # EWMA 가중치 (클수록 최근 관측을 빠르게 반영)
+ADAPTIVE_TARGET_PAGES = float(os.getenv("ADAPTIVE_TARGET_PAGES", "0.5"))  # 한 번 수집할 때 기대하는 새 기사 양(페이지 단위)
+ADAPTIVE_HEADROOM = float(os.getenv("ADAPTIVE_HEADROOM", "2"))  # 깊이 여유 (기대 새 기사 수의 배수, 급증 대비)
+
+DEFAULT_PAGE_SIZE = 20  # 리스트 한 페이지의 기사 수 (관측 전 기본값)
+
+poll_rate = metrics.Gauge("poll_publish_rate_per_minute", "소스별 새 기사 게시량 추정치 (EWMA, 건/분)", ["source"])
+poll_interval = metrics.Gauge("poll_interval_seconds", "소스별 다음 수집 주기", ["source"])
+poll_depth = metrics.Gauge("poll_depth_pages", "소스별 다음 수집 페이지 깊이", ["source"])
+poll_requests = metrics.Counter("poll_list_requests_total", "소스별 리스트 페이지 요청 수", ["source"])
+poll_missed = metrics.Counter("poll_missed_articles_estimate_total",
+                              "깊이 안에서 워터마크에 도달하지 못해 놓쳤을 것으로 추정되는 기사 수", ["source"])
+
+
+class AdaptivePoller:
+    """
+    소스별 게시량 EWMA로 다음 수집 주기/깊이를 계산. 시각은 호출하는 쪽에서 전달 (시뮬레이션에서도 사용).
+    base_interval, fixed_pages는 비교 기준인 고정 정책(매 주기 같은 깊이 전체 수집)의 설정.
+    워터마크에 도달하면 다음 페이지를 요청하지 않으므로 깊이는 상한일 뿐이고, 요청 수는 주기가 좌우함.
+    """
+
+    def __init__(self, fixed_pages, base_interval, min_interval=ADAPTIVE_MIN_INTERVAL,
+                 max_interval=ADAPTIVE_MAX_INTERVAL, max_pages=ADAPTIVE_MAX_PAGES, alpha=ADAPTIVE_ALPHA,
+                 target_pages=ADAPTIVE_TARGET_PAGES, headroom=ADAPTIVE_HEADROOM, path=None):
+        self.fixed_pages = fixed_pages  # {소스: 고정 깊이}
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_pages = max_pages
+        self.alpha = alpha
+        self.target_pages = target_pages
+        self.headroom = headroom
+        self.path = path
+        self._lock = threading.Lock()
+
+        saved = load_state(path, {}) if path else {}
+        self.sources = {}
+        for source, pages in fixed_pages.items():
+            state = {
+                "rate": None, "page_size": DEFAULT_PAGE_SIZE, "interval": base_interval, "depth": pages,
+                "last_poll": None, "polls": 0, "requests": 0, "baseline_requests": 0.0,
+                "new_articles": 0, "overflows": 0, "missed": 0.0, "gap": None,
+            }
+            state.update(saved.get(source, {}))
+            state["min_depth"] = pages
+            self.sources[source] = state
+            poll_rate.set_function(lambda source=source: self.sources[source]["rate"] or 0.0, source=source)
+            poll_interval.set_function(lambda source=source: self.sources[source]["interval"], source=source)
+            poll_depth.set_function(lambda source=source: self.sources[source]["depth"], source=source)
+
+    def plan(self, source):
+        """(다음 수집 주기(초), 페이지 깊이)"""
+        with self._lock:
+            state = self.sources[source]
+            return state["interval"], state["depth"]
+
+    def observe(self, source, new_count, pages, reached, page_size, now):
+        """
+        수집 결과 반영 후 다음 수집 주기(초) 반환.
+        new_count: 새 기사 수, pages: 요청한 페이지 수, reached: 깊이 안에서 워터마크(이전 수집 지점)에 도달했는지,
+        page_size: 이번에 관측한 페이지당 기사 수 (없으면 None)
+        """
+        with self._lock:
+            state = self.sources[source]
+            state["polls"] += 1
+            state["requests"] += pages
+            state["new_articles"] += new_count
+            poll_requests.inc(pages, source=source)
+            if page_size:
+                state["page_size"] = self._ewma(state["page_size"], page_size)
+
+            if state["last_poll"] is not None and now > state["last_poll"]:
+                elapsed = now - state["last_poll"]
+                # 같은 시간 동안 고정 정책이 보냈을 요청 수
+                state["baseline_requests"] += elapsed / self.base_interval * self.fixed_pages[source]
+
+                observed = new_count / (elapsed / 60)
+                if not reached:
+                    # 깊이를 다 써도 이전 수집 지점에 닿지 못함: 실제 게시량은 관측(하한)보다 많음.
+                    # 놓친 양은 다음에 워터마크까지 도달한 수집의 게시량으로 추정하기 위해 구간을 모아둠
+                    state["overflows"] += 1
+                    gap_elapsed, gap_count = state["gap"] or (0.0, 0)
+                    state["gap"] = (gap_elapsed + elapsed, gap_count + new_count)
+                    observed = max(observed, state["rate"] or 0.0)
+                elif state["gap"]:
+                    gap_elapsed, gap_count = state["gap"]
+                    missed = max(0.0, observed * gap_elapsed / 60 - gap_count)
+                    state["missed"] += missed
+                    state["gap"] = None
+                    poll_missed.inc(missed, source=source)
+                state["rate"] = observed if state["rate"] is None else self._ewma(state["rate"], observed)
+            state["last_poll"] = now
+
+            state["interval"], state["depth"] = self._next_plan(state, reached)
+            if self.path:
+                save_state(self.path, self.sources)
+            return state["interval"]
+
+    def _ewma(self, current, observed):
+        return self.alpha * observed + (1 - self.alpha) * current
+
+    def _next_plan(self, state, reached):
+        """기대 새 기사 수가 target_pages 페이지가 되는 주기, 그 주기 동안 기대 새 기사의 headroom배를 담는 깊이"""
+        if state["rate"] is None:
+            return self.base_interval, state["depth"]
+        if not reached:
+            # 놓치는 기사가 생기는 중이면 바로 최대 깊이로 다시 수집
+            return self.min_interval, self.max_pages
+
+        page_size = max(1.0, state["page_size"])
+        rate = state["rate"] / 60  # 건/초
+        interval = self.target_pages * page_size / rate if rate > 0 else self.max_interval
+        interval = min(self.max_interval, max(self.min_interval, interval))
+        depth = math.ceil(rate * interval * self.headroom / page_size)
+        return interval, min(self.max_pages, max(state["min_depth"], depth))
+
+    def stats(self):
+        """소스별 게시량, 현재 주기/깊이, 고정 정책 대비 요청 절감률, 추정 누락률"""
+        with self._lock:
+            result = {}
+            for source, state in self.sources.items():
+                baseline = state["baseline_requests"]
+                # 첫 수집은 비교 구간이 없으므로 절감률 계산에서 제외
+                first = min(state["requests"], self.fixed_pages[source]) if state["polls"] else 0
+                seen = state["new_articles"] + state["missed"]
+                result[source] = {
+                    "rate_per_minute": round(state["rate"] or 0.0, 3),
+                    "interval": round(state["interval"], 1),
+                    "depth": state["depth"],
+                    "polls": state["polls"],
+                    "requests": state["requests"],
+                    "request_savings": round(1 - (state["requests"] - first) / baseline, 4) if baseline else 0.0,
+                    "new_articles": state["new_articles"],
+                    "overflows": state["overflows"],
+                    "missed_rate": round(state["missed"] / seen, 4) if seen else 0.0,
+                }
+            return result
@@ -1,56 +1,400 @@
 # 스케줄링을 위한 모듈
-from apscheduler.schedulers.background import BackgroundScheduler
+import os
 import time
 import queue
+import threading
 import concurrent.futures  # for 멀티스레딩
 from datetime import datetime
 from news_crawler import get_news_list, get_news  # 네이버 뉴스 크롤러
 from enter_crawler import get_enter_list, get_enter  # 네이버 엔터 뉴스 크롤러
 from sports_crawler import get_sports_list, get_sports  # 네이버 스포츠 뉴스 크롤러
+from watermark import load_watermarks, save_watermarks, poll_source  # 소스별 워터마크
 from postprocess import analyze_news
-from db import save_news, check_db_connection, check_elasticsearch_connection
-
-news_queue = queue.Queue()
+import db  # news_writer, es_indexer, work_queue는 처음 사용할 때 생성되므로 db.<이름>으로 접근
+from db import save_news, check_db_connection, check_elasticsearch_connection, iter_saved_urls
+from seen_index import seen_index, is_seen  # 이미 저장된 기사 URL 인덱스
+import metrics  # 단계별 지표 (/metrics 엔드포인트)
+from durable_queue import DurableQueue, stage_journal, DURABLE_QUEUE_ENABLED  # 재시작 후 이어서 처리하는 디스크 큐
+from pipeline import Pipeline, Stage  # 단계 분리 파이프라인
+
+# DURABLE_QUEUE_ENABLED=true면 큐에 들어온 뉴스와 단계별 결과를 디스크에 기록
+news_queue = DurableQueue(stage_journal) if DURABLE_QUEUE_ENABLED else queue.Queue()
 STOP_SIGNAL = "STOP"
+metrics.news_queue_depth.set_function(news_queue.qsize)
 
 # thread 수 지정
 max_threads = 5
 
+# 크롤링 모드 (sync: 기존 requests 기반, stream: 소스별 리스트 동시 수집,
+# async: 공유 aiohttp 세션으로 리스트/본문 동시 수집, poll: 워터마크 기반 주기적 증분 수집,
+# adaptive: poll과 같지만 소스별 게시량에 따라 수집 주기와 페이지 깊이를 조정,
+# shared: 여러 replica가 DB 작업 큐를 공유하여 소스별 리스트 수집(워터마크 기반)과 기사를 나눠서 처리)
+CRAWL_MODE = os.getenv("CRAWL_MODE", "sync")
+
+# true면 분석된 뉴스를 배치 writer로 모아서 저장
+BATCH_WRITE = os.getenv("BATCH_WRITE", "false").lower() == "true"
+
+# poll 모드의 수집 주기(초), adaptive 모드에서는 첫 수집 주기이자 요청 절감률 비교 기준
+POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "120"))
+
+# 처리 방식 (worker: 스레드마다 수집→분석→저장을 순서대로, staged: 단계별 스레드 수를 따로 두고 제한된 큐로 연결)
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "worker")
+
+# staged 모드의 단계별 스레드 수와 단계 사이 큐 크기
+# 분석 단계의 실제 동시 LLM 호출 수는 postprocess.LLM_MAX_WORKERS와 rate_limiter 한도를 따름
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "50"))
+ANALYZE_WORKERS = int(os.getenv("ANALYZE_WORKERS", "20"))
+PERSIST_WORKERS = int(os.getenv("PERSIST_WORKERS", "1"))
+STAGE_QUEUE_SIZE = int(os.getenv("STAGE_QUEUE_SIZE", "100"))
+
+# shared 모드에서 worker가 한 번에 claim할 기사 수, 큐가 비었을 때 다시 확인하기까지 대기 시간(초)
+SHARED_CLAIM_SIZE = int(os.getenv("SHARED_CLAIM_SIZE", "1"))
+SHARED_IDLE_SLEEP = float(os.getenv("SHARED_IDLE_SLEEP", "2"))
+
+# shared 모드의 소스 샤드 lease 유지 시간 (POLL_INTERVAL 대비 비율). 앞 소스 수집 시간만큼 lease를 늦게 얻어도
+# 다음 주기에는 만료되어 있도록 주기보다 짧게 둠 (주기와 같으면 수집 시간 편차에 따라 한 주기씩 건너뜀)
+SHARED_LIST_LEASE_RATIO = float(os.getenv("SHARED_LIST_LEASE_RATIO", "0.8"))
+
+# (소스 이름, 리스트 함수, 뉴스 타입, 최대 페이지 수)
+NEWS_SOURCES = [
+    ("네이버 뉴스", get_news_list, "news", 10),  # 최대 10페이지
+    ("네이버 엔터 뉴스", get_enter_list, "enter", 4),  # 최대 4페이지
+    ("네이버 스포츠 뉴스", get_sports_list, "sport", 4)  # 최대 4페이지
+]
+
+seen_lock = threading.Lock()  # 여러 producer 스레드가 seen_urls를 공유하므로 lock 사용
+watermark_lock = threading.Lock()  # adaptive 모드에서 소스별 job이 워터마크 파일을 함께 갱신하므로 lock 사용
+adaptive_poller = None  # adaptive 모드에서만 생성 (소스별 게시량 상태 파일 로드)
+
+
+def enqueue_source(source_name, list_func, news_type, max_pages, seen_urls):
+    """한 소스의 리스트 페이지를 순회하며 파싱된 뉴스를 바로 큐에 추가"""
+    count = 0
+    start_page = 0 if news_type == "sport" else 1  # 스포츠 뉴스는 0부터 시작
+
+    for page in range(start_page, max_pages + start_page):
+        with metrics.list_fetch_seconds.time(source=news_type):
+            news_list = list_func(page)  # 해당 페이지의 뉴스 리스트 가져오기
+        if not news_list:
+            break  # 뉴스가 없으면 해당 소스 크롤링 종료
+
+        for news in news_list:
+            with seen_lock:
+                if news.naver_url in seen_urls:  # 중복 뉴스 제거
+                    continue
+                seen_urls.add(news.naver_url)  # URL을 집합에 추가
+
+            news_queue.put(news)  # 뉴스 큐에 추가
+            count += 1
+
+    return count
+
+
 def fetch_news():
     """네이버 뉴스, 엔터 뉴스, 스포츠 뉴스 크롤링 후 큐에 추가"""
     print("[info] 뉴스 데이터 수집 시작...")
 
+    total_news_count = 0
+    seen_urls = set()  # 중복 확인을 위한 집합
+
+    for source in NEWS_SOURCES:
+        total_news_count += enqueue_source(*source, seen_urls)
 
-    news_sources = [
-        ("네이버 뉴스", get_news_list, "news", 10),  # 최대 10페이지
-        ("네이버 엔터 뉴스", get_enter_list, "enter", 4),  # 최대 4페이지
-        ("네이버 스포츠 뉴스", get_sports_list, "sport", 4)  # 최대 4페이지
-    ]
+    print(f"\n[info] 총 {total_news_count}개 뉴스 큐에 추가 완료!\n")
 
 
+def fetch_news_streaming():
+    """모든 소스의 리스트를 동시에 수집하며, 파싱되는 즉시 큐에 추가 (worker는 미리 실행 중)"""
+    print("[info] 뉴스 데이터 스트리밍 수집 시작...")
 
     total_news_count = 0
-    seen_urls = set()  # 중복 확인을 위한 집합
+    seen_urls = set()
 
+    with concurrent.futures.ThreadPoolExecutor(len(NEWS_SOURCES)) as producer:
+        futures = {producer.submit(enqueue_source, *source, seen_urls): source[0] for source in NEWS_SOURCES}
 
-    for source_name, list_func, news_type, max_pages in news_sources:
-        start_page = 0 if news_type == "sport" else 1  # 스포츠 뉴스는 0부터 시작
+        for future in concurrent.futures.as_completed(futures):
+            source_name = futures[future]
+            try:
+                count = future.result()
+                total_news_count += count
+                print(f"[info] {source_name} 리스트 수집 완료 ({count}개)")
+            except Exception as e:
+                print(f"[error] {source_name} 리스트 수집 실패: {e}")
 
-        for page in range(start_page, max_pages + start_page):
-            news_list = list_func(page)  # 해당 페이지의 뉴스 리스트 가져오기
-            if not news_list:
-                break  # 뉴스가 없으면 해당 소스 크롤링 종료
+    print(f"\n[info] 총 {total_news_count}개 뉴스 큐에 추가 완료!\n")
 
-            for news in news_list:
-                if news["naverUrl"] in seen_urls:  # 중복 뉴스 제거
-                    continue
 
-                seen_urls.add(news["naverUrl"])  # URL을 집합에 추가
-                news_queue.put(news)  # 뉴스 큐에 추가
-                total_news_count += 1
+def fetch_news_async():
+    """비동기 크롤러로 리스트와 본문을 한 번에 수집 후 큐에 추가 (본문 수집 완료 상태)"""
+    print("[info] 뉴스 데이터 비동기 수집 시작...")
 
-    print(f"\n[info] 총 {total_news_count}개 뉴스 큐에 추가 완료!\n")
+    from async_crawler import run_crawl  # aiohttp 기반 비동기 크롤러 (async 모드에서만 로드)
 
+    news_list = run_crawl(on_item=news_queue.put)
+
+    print(f"\n[info] 총 {len(news_list)}개 뉴스 큐에 추가 완료!\n")
+
+
+def poll_news():
+    """소스별 워터마크 이후의 새 기사만 수집하여 큐에 추가 (스케줄러에서 주기적으로 실행)"""
+    marks = load_watermarks()
+    total_news_count = 0
+    seen_urls = set()
+
+    for source_name, list_func, news_type, max_pages in NEWS_SOURCES:
+        try:
+            news_list, marks[news_type] = poll_source(list_func, news_type, max_pages, marks.get(news_type))
+        except Exception as e:
+            print(f"[error] {source_name} 증분 수집 실패: {e}")
+            continue
+
+        for news in news_list:
+            if news.naver_url in seen_urls:
+                continue
+            seen_urls.add(news.naver_url)
+            news_queue.put(news)
+            total_news_count += 1
+
+        save_watermarks(marks)  # 큐에 추가한 뒤 워터마크 저장
+
+    print(f"[info] 증분 수집 완료: {total_news_count}개 뉴스 큐에 추가")
+
+
+def poll_news_adaptive(source):
+    """adaptive 모드: 한 소스를 현재 깊이만큼 증분 수집하여 큐에 추가하고 다음 수집 주기(초) 반환"""
+    source_name, list_func, news_type, _ = source
+    _, depth = adaptive_poller.plan(news_type)
+    with watermark_lock:
+        mark = load_watermarks().get(news_type)
+
+    stats = {}
+    news_list, mark = poll_source(list_func, news_type, depth, mark, stats=stats)
+    for news in news_list:
+        news_queue.put(news)
+
+    with watermark_lock:  # 큐에 추가한 뒤 워터마크 저장
+        marks = load_watermarks()
+        marks[news_type] = mark
+        save_watermarks(marks)
+
+    interval = adaptive_poller.observe(news_type, len(news_list), stats["pages"], stats["reached"],
+                                       stats["page_size"], time.time())
+    _, next_depth = adaptive_poller.plan(news_type)
+    state = adaptive_poller.stats()[news_type]
+    if not stats["reached"]:
+        print(f"[warn] {source_name} {depth}페이지 안에서 이전 수집 지점에 도달하지 못함 (누락 가능)")
+    print(f"[info] {source_name} 새 기사 {len(news_list)}개 ({stats['pages']}페이지 요청), "
+          f"게시량 {state['rate_per_minute']}건/분 → 다음 수집 {interval:.0f}초 후 {next_depth}페이지")
+    return interval
+
+
+def timed_list(list_func, news_type):
+    """리스트 페이지 요청마다 수집 시간을 기록하는 리스트 함수"""
+    def fetch_page(page, fresh_only=True):
+        with metrics.list_fetch_seconds.time(source=news_type):
+            return list_func(page, fresh_only)
+    return fetch_page
+
+
+def fetch_news_shared():
+    """
+    소스 샤드 중 lease를 얻은 소스만 워터마크 이후의 새 기사를 수집하여 공유 작업 큐에 추가 (스케줄러에서 주기적으로 실행).
+    lease는 주기보다 조금 짧게(SHARED_LIST_LEASE_RATIO) 유지되므로 replica가 여러 개여도 소스마다 주기당 한 번만 수집되고,
+    워터마크는 lease 행에 저장되어 다음 주기에 lease를 얻은 replica가 이어서 사용함.
+    """
+    total_news_count = 0
+    leased_shards = 0
+
+    for source_name, list_func, news_type, max_pages in NEWS_SOURCES:
+        key = f"list:{news_type}"
+        if not db.work_queue.try_lease(key, POLL_INTERVAL * SHARED_LIST_LEASE_RATIO):
+            continue  # 다른 replica가 이번 주기에 수집 중
+        leased_shards += 1
+
+        try:
+            news_list, mark = poll_source(timed_list(list_func, news_type), news_type, max_pages,
+                                          db.work_queue.lease_state(key))
+        except Exception as e:
+            print(f"[error] {source_name} 증분 수집 실패: {e}")
+            continue
+
+        total_news_count += db.work_queue.enqueue([news for news in news_list if not is_seen(news)])
+        if not db.work_queue.save_lease_state(key, mark):  # 큐에 추가한 뒤 워터마크 저장
+            print(f"[warn] {source_name} lease가 만료되어 워터마크를 저장하지 못함")
+
+    db.work_queue.cleanup()
+    print(f"[info] 소스 샤드 {leased_shards}개 수집, 공유 작업 큐에 {total_news_count}개 뉴스 추가")
+
+
+def process_claimed(key, news):
+    """claim한 기사 1건 처리, 저장까지 끝나면 완료 처리하고 실패하면 다른 replica가 가져갈 수 있도록 반환"""
+    try:
+        news_data = fetch_stage(news)
+        if news_data is None:
+            db.work_queue.complete(key)
+            return
+
+        result = persist_stage(analyze_stage(news_data))
+        if BATCH_WRITE:
+            result.add_done_callback(
+                lambda f: db.work_queue.release(key) if f.exception() else db.work_queue.complete(key))
+        else:
+            db.work_queue.complete(key)  # 저장 또는 중복 확인까지 끝남 (저장 실패는 예외로 아래에서 반환)
+    except Exception as e:
+        metrics.news_processed.inc(source=news.news_type or "", result="error")
+        print(f"[error] 뉴스 처리 실패: {news.naver_url} - {e}")
+        db.work_queue.release(key)
+
+
+def process_shared(stop_event, exit_after_idle=None):
+    """공유 작업 큐에서 기사를 claim하여 처리하는 worker (exit_after_idle초 동안 큐가 비어 있으면 종료)"""
+    idle_since = None
+    while not stop_event.is_set():
+        claimed = db.work_queue.claim(SHARED_CLAIM_SIZE)
+        if not claimed:
+            idle_since = idle_since or time.monotonic()
+            if exit_after_idle is not None and time.monotonic() - idle_since >= exit_after_idle:
+                return
+            stop_event.wait(SHARED_IDLE_SLEEP)
+            continue
+
+        idle_since = None
+        for key, news in claimed:
+            if stop_event.is_set():
+                db.work_queue.release(key)
+                continue
+            process_claimed(key, news)
+
+
+def run_shared():
+    """shared 모드 실행: 소스 샤드 수집은 스케줄러로, 기사 처리는 worker 스레드로 (종료 신호까지 실행)"""
+    db.work_queue.start()
+    stop_event = threading.Event()
+    workers = [threading.Thread(target=process_shared, args=(stop_event,), name=f"shared-{index}")
+               for index in range(max_threads)]
+    for worker in workers:
+        worker.start()
+
+    run_scheduled(fetch_news_shared)
+
+    # 처리 중인 기사는 마저 끝내고, 남은 claim은 다른 replica가 가져가도록 반환
+    stop_event.set()
+    for worker in workers:
+        worker.join()
+    db.work_queue.close()
+
+
+def report_saved(naver_url, news_type, future):
+    """배치 writer의 저장 결과 출력"""
+    try:
+        news_id = future.result()
+    except Exception as e:
+        metrics.news_processed.inc(source=news_type, result="error")
+        print(f"[error] 뉴스 저장 실패: {naver_url} - {e}")
+        return
+
+    if news_id is None:
+        metrics.news_processed.inc(source=news_type, result="duplicate")
+        print(f"[INFO] 이미 존재하는 뉴스: {naver_url} - 저장하지 않음.")
+    else:
+        metrics.news_processed.inc(source=news_type, result="saved")
+        print(f"[info] 뉴스 처리 완료: {naver_url} (news_id={news_id})")
+
+
+def checkpoint_item(news_data, stage):
+    """디스크 큐 사용 시 단계 결과 기록 (재시작 후 다음 단계부터 처리)"""
+    if DURABLE_QUEUE_ENABLED:
+        stage_journal.checkpoint(news_data, stage)
+
+
+def finish_item(naver_url, stage):
+    """디스크 큐 사용 시 처리가 끝난 뉴스 기록"""
+    if DURABLE_QUEUE_ENABLED:
+        stage_journal.finish(naver_url, stage)
+
+
+def fetch_stage(news):
+    """본문 수집 단계: 본문을 수집하여 반환 (건너뛰면 None)"""
+    news_data = fetch_article(news)
+    if news_data is None:
+        finish_item(news.naver_url, "dropped")
+    else:
+        checkpoint_item(news_data, "fetched")
+    return news_data
+
+
+def fetch_article(news):
+    """이미 저장된 기사를 걸러내고 본문을 수집하여 반환 (건너뛰면 None)"""
+    # 이미 저장된 기사는 본문 수집/분석 없이 건너뜀
+    if is_seen(news):
+        metrics.news_processed.inc(source=news.news_type, result="seen")
+        print(f"[info] 이미 저장된 뉴스: {news.naver_url} - 건너뜀")
+        return None
+
+    print(f"[info] 뉴스 처리 시작: {news.naver_url}")
+
+    # 뉴스 타입별로 적절한 본문 크롤링 함수 호출 (비동기 모드에서는 이미 본문이 수집되어 있음)
+    news_type = news.news_type
+    if news.content is not None:
+        news_data = news
+    elif news_type in ("news", "enter", "sport"):
+        with metrics.article_fetch_seconds.time(source=news_type):
+            if news_type == "news":
+                news_data = get_news(news)
+            elif news_type == "enter":
+                news_data = get_enter(news)
+            else:
+                news_data = get_sports(news)
+    else:
+        print(f"[warn] 알 수 없는 뉴스 타입: {news_type}")
+        return None
+
+    if not news_data:
+        metrics.news_processed.inc(source=news_type, result="crawl_failed")
+        print(f"[error] 뉴스 크롤링 실패: {news.naver_url}")
+        return None
+
+    # 다른 네이버 URL로 재등장한 같은 원문 기사는 분석하지 않음
+    if is_seen(news_data):
+        metrics.news_processed.inc(source=news_type, result="seen")
+        print(f"[info] 이미 저장된 원문 기사: {news_data.url} - 분석 건너뜀")
+        return None
+
+    return news_data
+
+
+def analyze_stage(news_data):
+    """분석 단계: 요약/카테고리/HS/FS/판단 근거"""
+    with metrics.analyze_seconds.time(source=news_data.news_type):
+        analyzed_data = analyze_news(news_data)
+    checkpoint_item(analyzed_data, "analyzed")
+    return analyzed_data
+
+
+def persist_stage(analyzed_data):
+    """저장 단계 (배치 모드에서는 writer에 넘기고 결과는 콜백으로 보고, 저장 결과 Future 반환. 그 외에는 저장된 news_id, 중복이면 None 반환)"""
+    naver_url, news_type = analyzed_data.naver_url, analyzed_data.news_type
+    if BATCH_WRITE:
+        future = db.news_writer.submit(analyzed_data)
+        future.add_done_callback(lambda f: report_saved(naver_url, news_type, f))
+        future.add_done_callback(lambda f: f.exception() or finish_item(naver_url, "saved"))
+        return future
+    else:
+        news_id = save_news(analyzed_data)  # 저장에 실패하면 예외 (디스크 큐에 analyzed로 남아 재시작 후 다시 저장)
+        finish_item(naver_url, "saved")
+        metrics.news_processed.inc(source=news_type, result="saved" if news_id else "duplicate")
+        print(f"[info] 뉴스 처리 완료: {naver_url}")
+        return news_id
+
+
+def build_pipeline():
+    """staged 모드 파이프라인 (본문 수집 → 분석 → 저장, 단계 사이 큐는 STAGE_QUEUE_SIZE로 제한)"""
+    return Pipeline([
+        Stage("fetch", fetch_stage, FETCH_WORKERS, STAGE_QUEUE_SIZE),
+        Stage("analyze", analyze_stage, ANALYZE_WORKERS, STAGE_QUEUE_SIZE),
+        Stage("persist", persist_stage, PERSIST_WORKERS, STAGE_QUEUE_SIZE),
+    ])
 
 
 def process_news():
@@ -67,52 +411,141 @@ def process_news():
             break
 
         try:
-            print(f"[info] 뉴스 처리 시작: {news['naverUrl']}")
-
-            # 뉴스 타입별로 적절한 본문 크롤링 함수 호출
-            if news["news_type"] == "news":
-                news_data = get_news(news)
-            elif news["news_type"] == "enter":
-                news_data = get_enter(news)
-            elif news["news_type"] == "sport":
-                news_data = get_sports(news)
-            else:
-                print(f"[warn] 알 수 없는 뉴스 타입: {news['news_type']}")
+            # 재시작 전에 분석까지 끝난 뉴스는 바로 저장
+            if DURABLE_QUEUE_ENABLED and stage_journal.stage_of(news) == "analyzed":
+                persist_stage(news)
                 continue
 
-            if not news_data:
-                print(f"[error] 뉴스 크롤링 실패: {news['naverUrl']}")
+            news_data = fetch_stage(news)
+            if news_data is None:
                 continue
 
-            # 뉴스 분석
-            analyzed_data = analyze_news(news_data)
-
-            # 뉴스 저장
-            save_news(analyzed_data)
-
-            print(f"[info] 뉴스 처리 완료: {news['naverUrl']}")
+            persist_stage(analyze_stage(news_data))
 
         except Exception as e:
-            print(f"[error] 뉴스 처리 실패: {news['naverUrl']} - {e}")
+            metrics.news_processed.inc(source=news.news_type or "", result="error")
+            print(f"[error] 뉴스 처리 실패: {news.naver_url} - {e}")
         finally:
             news_queue.task_done()  # 큐 작업 완료 처리
 
-# 스케줄러 설정 (뉴스 수집 주기: 2분)
-scheduler = BackgroundScheduler()
+def run_local():
+    """단일 replica 실행: 처리 스레드를 띄우고 CRAWL_MODE에 따라 수집한 뒤 큐를 비우고 종료"""
+    global news_queue
+
+    # 처리 스레드를 먼저 실행하여, 큐에 들어오는 뉴스를 바로 처리
+    if PIPELINE_MODE == "staged":
+        # 수집한 리스트 항목은 본문 수집 단계 입력 큐(크기 제한)로 바로 들어감
+        pipeline = build_pipeline().start()
+        fetch, analyze, persist = pipeline.stages
+        news_queue = DurableQueue(stage_journal, fetch.input) if DURABLE_QUEUE_ENABLED else fetch.input
+        metrics.news_queue_depth.set_function(news_queue.qsize)
+        resume_targets = {"listed": fetch.input.put, "fetched": analyze.input.put, "analyzed": persist.input.put}
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_threads)
+        for _ in range(max_threads):
+            executor.submit(process_news)
+        inner = news_queue.inner if DURABLE_QUEUE_ENABLED else news_queue
+        resume_targets = dict.fromkeys(("listed", "fetched", "analyzed"), inner.put)
+
+    # 이전 실행에서 끝나지 않은 뉴스는 마지막으로 끝난 단계의 다음 단계부터 처리
+    if DURABLE_QUEUE_ENABLED:
+        resumed = stage_journal.recover()
+        for stage, news in resumed:
+            resume_targets[stage](news)
+        print(f"[info] 디스크 큐에서 이전 실행의 뉴스 {len(resumed)}개 이어서 처리")
+
+    if CRAWL_MODE == "async":
+        fetch_news_async()  # 딱 1번만 실행
+    elif CRAWL_MODE == "stream":
+        fetch_news_streaming()  # 딱 1번만 실행
+    elif CRAWL_MODE == "poll":
+        run_scheduled(poll_news)
+    elif CRAWL_MODE == "adaptive":
+        run_adaptive()
+    else:
+        fetch_news()  # 딱 1번만 실행
+
+    if PIPELINE_MODE == "staged":
+        # 앞 단계부터 차례로 비우고 종료
+        pipeline.close()
+        print(f"[info] 단계별 사용률: {pipeline.report()}")
+    else:
+        # 수집이 끝나면 worker 수만큼 종료 신호 전달
+        for _ in range(max_threads):
+            news_queue.put(STOP_SIGNAL)
+
+        news_queue.join()
+        executor.shutdown(wait=True)
+
+
+def run_scheduled(job):
+    """poll/shared 모드: job을 POLL_INTERVAL마다 실행하며 종료 신호까지 대기 (이전 실행이 끝나지 않았으면 겹쳐서 실행하지 않음)"""
+    from apscheduler.schedulers.background import BackgroundScheduler  # 스케줄러를 쓰는 모드에서만 로드
+
+    scheduler = BackgroundScheduler()
+    scheduler.add_job(job, "interval", seconds=POLL_INTERVAL, next_run_time=datetime.now(),
+                      max_instances=1, coalesce=True)
+    scheduler.start()
+    wait_for_stop(scheduler)
+
+
+def run_adaptive():
+    """adaptive 모드: 소스마다 job을 따로 두고, 수집이 끝날 때마다 게시량에 맞춘 주기로 다시 예약"""
+    global adaptive_poller
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from adaptive_poll import AdaptivePoller, ADAPTIVE_STATE_PATH
+
+    adaptive_poller = AdaptivePoller({news_type: max_pages for _, _, news_type, max_pages in NEWS_SOURCES},
+                                     POLL_INTERVAL, path=ADAPTIVE_STATE_PATH)
+    scheduler = BackgroundScheduler()
+
+    def poll_job(source):
+        try:
+            interval = poll_news_adaptive(source)
+        except Exception as e:
+            print(f"[error] {source[0]} 증분 수집 실패: {e}")
+            interval, _ = adaptive_poller.plan(source[2])
+        scheduler.reschedule_job(source[2], trigger="interval", seconds=interval)
+
+    for source in NEWS_SOURCES:
+        interval, _ = adaptive_poller.plan(source[2])
+        scheduler.add_job(poll_job, "interval", args=[source], id=source[2], seconds=interval,
+                          next_run_time=datetime.now(), max_instances=1, coalesce=True)
+    scheduler.start()
+    wait_for_stop(scheduler)
+    print(f"[info] 소스별 적응형 폴링 결과: {adaptive_poller.stats()}")
+
+
+def wait_for_stop(scheduler):
+    """종료 신호까지 대기한 뒤 스케줄러 종료"""
+    try:
+        while True:
+            time.sleep(1)
+    except (KeyboardInterrupt, SystemExit):
+        scheduler.shutdown()
+
 
 if __name__ == "__main__":
     print("[info] 뉴스 크롤러 시작!")
+    metrics.start()
 
     check_db_connection()
     check_elasticsearch_connection()
 
-    fetch_news()  # 딱 1번만 실행
+    # 마지막 워밍 이후 저장된 뉴스 URL로 seen 인덱스 갱신
+    warmed = seen_index.warm(iter_saved_urls(seen_index.last_warmed_id()))
+    print(f"[info] seen 인덱스 로드 완료 ({len(seen_index)}개 URL, DB에서 {warmed}건 추가)")
+
+    if DURABLE_QUEUE_ENABLED:
+        print(f"[info] 디스크 큐 정리 ({stage_journal.compact()}개 삭제), 단계별 항목 수: {stage_journal.depths()}")
 
-    # 처리 스레드 실행
-    executor = concurrent.futures.ThreadPoolExecutor(max_threads)
-    for _ in range(max_threads):
-        executor.submit(process_news)
+    if BATCH_WRITE:
+        db.news_writer.start()
 
-    news_queue.join()
-    executor.shutdown(wait=True)
+    if CRAWL_MODE == "shared":
+        run_shared()  # 종료 신호까지 실행
+    else:
+        run_local()
 
+    # 배치 writer에 남은 뉴스 저장 후 남은 문서 색인
+    db.close_clients()
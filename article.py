@@ -0,0 +1,74 @@
+# 크롤러 → 분석(postprocess) → 저장(db)이 주고받는 기사 레코드
+# dict 대신 __slots__ 클래스로 기사당 메모리를 줄이고(큐에 수천 건이 쌓여도 키 테이블이 없음),
+# 반복되는 범주형 값(뉴스 타입, 언론사, 카테고리)은 intern하여 기사마다 같은 문자열을 따로 갖지 않도록 함
+import sys
+import time
+
+# 필드 이름은 news 테이블 컬럼과 같은 snake_case (HS/FS 판단 근거는 hs_reason/fs_reason)
+# listed_at은 리스트에서 받은 시각(epoch 초)으로, 모든 소스에 공통인 분석 우선순위 기준 (DB에는 저장하지 않음)
+LIST_FIELDS = ("naver_url", "news_type", "url", "image_url", "media_name", "created_date", "listed_at")
+ANALYSIS_FIELDS = (
+    "summary", "category",
+    "headline_score", "headline_score_origin", "headline_score_probs",
+    "fact_score", "fact_score_origin", "fact_score_probs",
+    "hs_reason", "fs_reason",
+)
+FIELDS = LIST_FIELDS + ("title", "content") + ANALYSIS_FIELDS
+
+INTERNED_FIELDS = frozenset(("news_type", "media_name", "category"))
+PROBS_FIELDS = frozenset(("headline_score_probs", "fact_score_probs"))  # 10바이트로 압축 저장 (score_probs.pack_probs)
+
+# 이전 버전의 dict 키 (디스크 큐/작업 큐에 남아 있는 항목, 분석 결과 JSON 파일을 읽기 위함)
+LEGACY_KEYS = {"naverUrl": "naver_url", "mediaName": "media_name", "createdDate": "created_date"}
+
+
+class Article:
+    """기사 한 건. 값이 없는 필드는 None"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, **fields):
+        for name in FIELDS:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f"알 수 없는 기사 필드: {', '.join(fields)}")
+
+    def __setattr__(self, name, value):
+        if value is not None and name in INTERNED_FIELDS:
+            value = sys.intern(value)
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def listed(cls, **fields):
+        """리스트 페이지에서 받은 기사 (listed_at을 현재 시각으로 기록)"""
+        return cls(listed_at=time.time(), **fields)
+
+    def __repr__(self):
+        return f"Article(news_type={self.news_type!r}, naver_url={self.naver_url!r}, title={self.title!r})"
+
+    def to_dict(self):
+        """JSON으로 저장할 수 있는 dict (None인 필드 제외, 확률 분포는 {"1": p1, ...}로 복원)"""
+        from score_probs import unpack_probs  # 크롤러만 쓰는 프로세스에서 sqlalchemy를 불러오지 않도록 지연 import
+
+        data = {}
+        for name in FIELDS:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            data[name] = unpack_probs(value) if name in PROBS_FIELDS else value
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict() 결과나 이전 버전의 dict로 기사 생성 (모르는 키는 무시)"""
+        from score_probs import pack_probs
+
+        article = cls()
+        for key, value in data.items():
+            name = LEGACY_KEYS.get(key, key)
+            if name not in FIELDS:
+                continue
+            if name in PROBS_FIELDS and isinstance(value, dict):
+                value = pack_probs(value)
+            setattr(article, name, value)
+        return article
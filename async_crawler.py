@@ -0,0 +1,199 @@
+# 비동기 크롤링 엔진. 하나의 keep-alive aiohttp 세션을 공유하여 세 크롤러의 리스트/본문을 동시에 수집
+# 파싱은 각 크롤러 모듈의 parse_* 함수를 그대로 사용하므로 동기 크롤러와 결과가 동일함
+import asyncio
+import json
+from urllib.parse import urlparse
+import aiohttp
+import metrics
+from seen_index import is_seen  # 이미 저장된 기사 URL 인덱스
+from news_crawler import news_list_url, parse_news_list, parse_news
+from enter_crawler import enter_list_url, enter_article_url, parse_enter_list, parse_enter
+from enter_crawler import header as enter_header
+from sports_crawler import sports_list_url, sports_article_url, parse_sports_list, parse_sports
+from sports_crawler import header as sports_header
+
+# 호스트별 동시 요청 수 제한
+HOST_LIMITS = {
+    "news.naver.com": 10,
+    "n.news.naver.com": 50,
+    "api-gw.entertain.naver.com": 50,
+    "api-gw.sports.naver.com": 50,
+}
+DEFAULT_HOST_LIMIT = 10
+
+# 전체 커넥션 풀 크기 및 요청 타임아웃(초)
+MAX_CONNECTIONS = 200
+REQUEST_TIMEOUT = 10
+
+# aiohttp는 brotli/zstd 디코딩을 기본 지원하지 않으므로 gzip, deflate만 요청
+ENTER_HEADER = {**enter_header, "Accept-Encoding": "gzip, deflate"}
+SPORTS_HEADER = {**sports_header, "Accept-Encoding": "gzip, deflate"}
+
+# 이벤트 루프마다 새로 만들어야 하므로 crawl_all() 안에서 초기화
+_host_semaphores = {}
+
+
+def create_session():
+    """keep-alive 커넥션 풀을 사용하는 공유 aiohttp 세션 생성"""
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        ttl_dns_cache=300,  # DNS 조회 결과 캐싱
+        keepalive_timeout=30,
+    )
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+def _get_semaphore(url):
+    """URL 호스트에 해당하는 세마포어 반환 (없으면 생성)"""
+    host = urlparse(url).hostname
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+    return _host_semaphores[host]
+
+
+async def fetch_bytes(session, url, headers=None):
+    """호스트별 동시성 제한을 지키며 (응답 bytes, 응답 인코딩) 반환 (lxml이 디코딩 없이 바로 파싱)"""
+    async with _get_semaphore(url):
+        async with session.get(url, headers=headers) as response:
+            return await response.read(), response.charset
+
+
+async def fetch_json(session, url, headers=None):
+    """호스트별 동시성 제한을 지키며 JSON 응답 반환"""
+    async with _get_semaphore(url):
+        async with session.get(url, headers=headers) as response:
+            return await response.json(content_type=None)
+
+
+# 네이버 뉴스
+async def get_news_list_async(session, page, fresh_only=True):
+    html, encoding = await fetch_bytes(session, news_list_url(page))
+    return parse_news_list(html, fresh_only, encoding)
+
+
+async def get_news_async(session, data):
+    try:
+        html, encoding = await fetch_bytes(session, data.naver_url)
+    except Exception:
+        return None
+    return parse_news(html, data, encoding)
+
+
+# 네이버 엔터 뉴스
+async def get_enter_list_async(session, page, fresh_only=True):
+    json_data = await fetch_json(session, enter_list_url(page), headers=ENTER_HEADER)
+    return parse_enter_list(json_data, fresh_only)
+
+
+async def get_enter_async(session, data):
+    try:
+        json_data = await fetch_json(session, enter_article_url(data), headers=ENTER_HEADER)
+    except Exception:
+        return None
+    return parse_enter(json_data, data)
+
+
+# 네이버 스포츠 뉴스
+async def get_sports_list_async(session, page, fresh_only=True):
+    json_data = await fetch_json(session, sports_list_url(page), headers=SPORTS_HEADER)
+    return parse_sports_list(json_data, fresh_only)
+
+
+async def get_sports_async(session, data):
+    try:
+        json_data = await fetch_json(session, sports_article_url(data), headers=SPORTS_HEADER)
+    except Exception:
+        return None
+    return parse_sports(json_data, data)
+
+
+# (리스트 함수, 본문 함수, 시작 페이지, 최대 페이지 수)
+ASYNC_SOURCES = {
+    "news": (get_news_list_async, get_news_async, 1, 10),
+    "enter": (get_enter_list_async, get_enter_async, 1, 4),
+    "sport": (get_sports_list_async, get_sports_async, 0, 4),
+}
+
+DETAIL_FUNCS = {news_type: detail_func for news_type, (_, detail_func, _, _) in ASYNC_SOURCES.items()}
+
+
+async def crawl_list(session, news_type, max_pages=None):
+    """한 소스의 리스트 페이지를 순서대로 수집 (빈 페이지가 나오면 종료)"""
+    list_func, _, start_page, default_pages = ASYNC_SOURCES[news_type]
+    max_pages = max_pages or default_pages
+
+    result = []
+    for page in range(start_page, start_page + max_pages):
+        try:
+            with metrics.list_fetch_seconds.time(source=news_type):
+                news_list = await list_func(session, page)
+        except Exception as e:
+            print(f"[error] 리스트 수집 실패 ({news_type}, page={page}): {e}")
+            break
+        if not news_list:
+            break
+        result.extend(news_list)
+    return result
+
+
+async def fetch_detail(session, news):
+    """뉴스 타입에 맞는 본문 수집 함수 호출"""
+    with metrics.article_fetch_seconds.time(source=news.news_type):
+        return await DETAIL_FUNCS[news.news_type](session, news)
+
+
+async def crawl_all(news_types=("news", "enter", "sport"), on_item=None):
+    """모든 소스의 리스트와 본문을 동시에 수집, on_item이 있으면 수집되는 즉시 전달"""
+    global _host_semaphores
+    _host_semaphores = {}
+
+    async with create_session() as session:
+        lists = await asyncio.gather(*(crawl_list(session, news_type) for news_type in news_types))
+
+        # 소스 간 중복 URL 제거, 이미 저장된 기사는 본문을 요청하지 않음
+        seen_urls = set()
+        targets = []
+        skipped = 0
+        for news_list in lists:
+            for news in news_list:
+                if news.naver_url in seen_urls:
+                    continue
+                seen_urls.add(news.naver_url)
+                if is_seen(news):
+                    metrics.news_processed.inc(source=news.news_type, result="seen")
+                    skipped += 1
+                    continue
+                targets.append(news)
+        if skipped:
+            print(f"[info] 이미 저장된 뉴스 {skipped}개 건너뜀")
+
+        results = []
+
+        async def _fetch(news):
+            data = await fetch_detail(session, news)
+            if not data:
+                print(f"[error] 뉴스 크롤링 실패: {news.naver_url}")
+                return
+            results.append(data)
+            if on_item:
+                on_item(data)
+
+        await asyncio.gather(*(_fetch(news) for news in targets))
+
+    return results
+
+
+def run_crawl(news_types=("news", "enter", "sport"), on_item=None):
+    """동기 코드에서 비동기 크롤링 실행"""
+    return asyncio.run(crawl_all(news_types, on_item))
+
+
+if __name__ == "__main__":
+    result = run_crawl()
+
+    with open("crawled.json", "w", encoding="utf-8") as f:
+        json.dump([news.to_dict() for news in result], f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+    print(f"[info] 총 {len(result)}개 뉴스 수집 완료")
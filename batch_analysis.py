@@ -0,0 +1,210 @@
+# OpenAI Batch API를 이용한 일괄 분석 모드. 밀린 기사나 재분석/백필을 실시간 호출 대신 batch로 처리 (처리량 증가, 비용 절감)
+# 1차 batch: 요약/카테고리, HS, FS → 2차 batch: 점수를 바탕으로 판단 근거 → analyze_news와 같은 형식으로 병합
+# OPENAI_BASE_URL 환경 변수로 로컬 가짜 batch 서버에 연결하여 테스트 가능
+import os
+import io
+import sys
+import json
+import time
+from types import SimpleNamespace
+from postprocess import (
+    get_client, load_prompts, summary_request, score_request, reasoning_request,
+    parse_json_response, parse_score_response, apply_analysis
+)
+from content_budget import fit_content
+from article import Article
+import metrics
+from llm_cache import llm_cache, make_key, LLM_CACHE_ENABLED
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_POLL_INTERVAL = int(os.getenv("BATCH_POLL_INTERVAL", "30"))  # 초
+BATCH_MAX_REQUESTS = 50000  # batch 하나에 담을 수 있는 최대 요청 수
+
+FINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _to_namespace(value):
+    """batch 결과(JSON)를 SDK 응답 객체처럼 속성으로 접근할 수 있도록 변환"""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _to_namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(item) for item in value]
+    return value
+
+
+def submit_batch(requests, description):
+    """{custom_id: 요청 파라미터}를 JSONL로 업로드하고 batch 생성"""
+    lines = [
+        json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}, ensure_ascii=False)
+        for custom_id, body in requests.items()
+    ]
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+
+    client = get_client("client")  # OpenAI 클라이언트는 batch를 실제로 제출할 때 생성
+    input_file = client.files.create(file=(f"{description}.jsonl", io.BytesIO(data)), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h",
+        metadata={"description": description},
+    )
+    print(f"[info] batch 제출 완료: {batch.id} ({len(requests)}건, {description})")
+    return batch.id
+
+
+def wait_for_batch(batch_id, poll_interval=BATCH_POLL_INTERVAL):
+    """batch가 끝날 때까지 주기적으로 상태 확인"""
+    client = get_client("client")
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        if counts is not None:
+            print(f"[info] batch {batch_id}: {batch.status} ({counts.completed}/{counts.total}, 실패 {counts.failed})")
+        if batch.status in FINAL_STATUSES:
+            return batch
+        time.sleep(poll_interval)
+
+
+def download_results(batch):
+    """batch 결과 파일에서 {custom_id: 응답 body} 반환, 실패한 요청은 로그 출력"""
+    client = get_client("client")
+    results = {}
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if response.get("status_code") == 200:
+                results[item["custom_id"]] = response["body"]
+            else:
+                print(f"[error] batch 요청 실패: {item['custom_id']} - {item.get('error') or response}")
+
+    if batch.error_file_id:
+        for line in client.files.content(batch.error_file_id).text.splitlines():
+            if line.strip():
+                item = json.loads(line)
+                print(f"[error] batch 요청 실패: {item.get('custom_id')} - {item.get('error')}")
+    return results
+
+
+def run_batch(tasks, description, poll_interval=BATCH_POLL_INTERVAL):
+    """
+    tasks: {custom_id: (kind, 요청 파라미터, 파싱 함수)}
+    캐시에 있는 결과는 그대로 사용하고, 나머지만 batch로 요청하여 {custom_id: 파싱 결과} 반환
+    """
+    parsed = {}
+    pending = {}
+    for custom_id, (kind, request, parse) in tasks.items():
+        cached = llm_cache.get(make_key(kind, request)) if LLM_CACHE_ENABLED else None
+        if cached is not None:
+            parsed[custom_id] = cached
+        else:
+            pending[custom_id] = (kind, request, parse)
+
+    if parsed:
+        print(f"[info] 캐시 재사용: {len(parsed)}건")
+
+    # batch를 모두 제출한 뒤 결과를 기다림 (서버에서 동시에 처리되도록)
+    custom_ids = list(pending)
+    batch_ids = [
+        submit_batch({custom_id: pending[custom_id][1] for custom_id in custom_ids[offset:offset + BATCH_MAX_REQUESTS]},
+                     description)
+        for offset in range(0, len(custom_ids), BATCH_MAX_REQUESTS)
+    ]
+
+    for batch_id in batch_ids:
+        batch = wait_for_batch(batch_id, poll_interval)
+        if batch.status != "completed":
+            print(f"[error] batch {batch_id} 종료 상태: {batch.status}")
+
+        for custom_id, body in download_results(batch).items():
+            kind, request, parse = pending[custom_id]
+            response = _to_namespace(body)
+            metrics.llm_requests.inc(kind=kind, result="batch")
+            metrics.record_llm_usage(kind, getattr(response, "usage", None))
+            try:
+                result = parse(response)
+            except Exception as e:
+                print(f"[error] batch 응답 파싱 실패: {custom_id} - {e}")
+                continue
+            parsed[custom_id] = result
+            if LLM_CACHE_ENABLED:
+                llm_cache.set(make_key(kind, request), result)
+
+    return parsed
+
+
+def analyze_news_batch(news_list, poll_interval=BATCH_POLL_INTERVAL):
+    """
+    뉴스 리스트를 batch로 분석하여 analyze_news와 같은 형식의 결과 리스트 반환.
+    요청이 하나라도 실패한 뉴스는 결과에서 제외.
+    """
+    prompts = load_prompts()
+
+    # 1차: 요약/카테고리, HS, FS (예산에 맞춘 본문은 2차에서도 그대로 사용)
+    contents = [fit_content(news.content) for news in news_list]
+    tasks = {}
+    for i, news in enumerate(news_list):
+        title, content = news.title, contents[i]
+        tasks[f"{i}:summary"] = ("summary", summary_request(title, content, prompts["summary"]), parse_json_response)
+        tasks[f"{i}:hs"] = ("score", score_request(title, content, prompts["hs"]), parse_score_response)
+        tasks[f"{i}:fs"] = ("score", score_request(title, content, prompts["fs"]), parse_score_response)
+    first = run_batch(tasks, "analysis", poll_interval)
+
+    scored = []
+    for i, news in enumerate(news_list):
+        try:
+            summary_result, hs_result, fs_result = (first[f"{i}:summary"], first[f"{i}:hs"], first[f"{i}:fs"])
+        except KeyError:
+            print(f"[error] 뉴스 분석 실패: {news.naver_url or news.title}")
+            continue
+        hs_score, fs_score = apply_analysis(news, summary_result, tuple(hs_result), tuple(fs_result))
+        scored.append((i, news, hs_score, fs_score))
+
+    # 2차: 점수를 바탕으로 판단 근거
+    tasks = {
+        f"{i}:reason": ("reason", reasoning_request(news.title, contents[i], hs_score, fs_score,
+                                                    prompts["reason"]), parse_json_response)
+        for i, news, hs_score, fs_score in scored
+    }
+    second = run_batch(tasks, "reasoning", poll_interval)
+
+    analyzed = []
+    for i, news, _, _ in scored:
+        reasoning_result = second.get(f"{i}:reason")
+        if reasoning_result is None:
+            print(f"[error] 판단 근거 생성 실패: {news.naver_url or news.title}")
+            continue
+        news.hs_reason = reasoning_result["hs_reason"]
+        news.fs_reason = reasoning_result["fs_reason"]
+        analyzed.append(news)
+
+    print(f"[info] batch 분석 완료: {len(analyzed)}/{len(news_list)}개")
+    return analyzed
+
+
+if __name__ == "__main__":
+    input_files = sys.argv[1:] or ["./news.json", "./enter.json", "./sport.json"]
+    output_file = "./analyzed_news.json"
+
+    news_list = []
+    for file_path in input_files:
+        try:
+            with open(file_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+                news_list.extend(Article.from_dict(news) for news in data)
+            print(f"[info] {file_path}에서 {len(data)}개의 뉴스 로드 완료")
+        except FileNotFoundError:
+            print(f"[error] {file_path} 파일을 찾을 수 없습니다. 건너뜁니다.")
+        except json.JSONDecodeError:
+            print(f"[error] {file_path} 파일의 JSON 형식이 올바르지 않습니다. 건너뜁니다.")
+
+    start_time = time.time()
+    analyzed_news = analyze_news_batch(news_list)
+    print(f"⏱ 분석에 걸린 시간: {time.time() - start_time:.2f}초")
+
+    with open(output_file, "w", encoding="utf-8") as file:
+        json.dump([news.to_dict() for news in analyzed_news], file, ensure_ascii=False, indent=4)
+
+    print(f"분석 완료! 결과가 {output_file}에 저장되었습니다.")
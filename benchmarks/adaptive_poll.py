@@ -0,0 +1,163 @@
+# 적응형 폴링 시뮬레이션: 하루 동안의 게시량 곡선(새벽 한산, 낮 증가, 속보 급증)으로 기사를 만들고
+# 고정 정책(POLL_INTERVAL마다 최대 페이지 전체 수집 / 워터마크 증분 수집)과 적응형 폴링의 리스트 요청 수와 누락 기사 수 비교
+# 실제 poll_source와 AdaptivePoller를 사용하고 시각만 시뮬레이션 (네트워크 없음)
+# 사용법: python -m benchmarks.adaptive_poll [--hours 24] [--interval 120] [--page-size 20] [--seed 0]
+import math
+import heapq
+import bisect
+import random
+import argparse
+from datetime import datetime, timezone
+from watermark import poll_source
+from article import Article
+from adaptive_poll import AdaptivePoller
+
+# (뉴스 타입, 최대 페이지 수, 평상시 낮 게시량(건/분), 속보 급증 시 게시량(건/분))
+SOURCES = [
+    ("news", 10, 4.0, 120.0),
+    ("enter", 4, 0.8, 15.0),
+    ("sport", 4, 0.6, 10.0),
+]
+
+BURSTS = [(9.5, 20), (14.0, 30), (21.0, 15)]  # (시작 시각(시), 지속 시간(분))
+FRESH_SECONDS = 120  # 첫 수집의 2분 규칙
+
+
+def publish_rate(hour, day_rate, burst_rate):
+    """시각별 게시량(건/분): 새벽에는 낮의 10%, 오전에 증가, 저녁에 감소, 속보 구간에는 burst_rate"""
+    for start, minutes in BURSTS:
+        if start <= hour < start + minutes / 60:
+            return burst_rate
+    daylight = max(0.0, math.sin(math.pi * (hour - 5) / 19)) if 5 <= hour < 24 else 0.0
+    return day_rate * (0.1 + 0.9 * daylight)
+
+
+def generate(news_type, day_rate, burst_rate, hours, rng):
+    """분 단위 포아송 도착으로 [(게시 시각(초), 기사)] 생성 (시각 오름차순)"""
+    articles = []
+    for minute in range(int(hours * 60)):
+        rate = publish_rate(minute / 60, day_rate, burst_rate)
+        count = _poisson(rate, rng)
+        for offset in sorted(rng.random() * 60 for _ in range(count)):
+            published = minute * 60 + offset
+            news = Article(naver_url=f"https://n.news.naver.com/{news_type}/{len(articles)}", news_type=news_type)
+            if news_type == "sport":
+                news.created_date = datetime.fromtimestamp(published, timezone.utc).isoformat().replace("+00:00", "Z")
+            articles.append((published, news))
+    return articles
+
+
+def _poisson(rate, rng):
+    limit, k, p = math.exp(-rate), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+class SimulatedList:
+    """시뮬레이션 시각 기준 최신순 리스트 페이지 (요청 수 집계)"""
+
+    def __init__(self, articles, page_size, start_page):
+        self.articles = articles
+        self.published = [published for published, _ in articles]
+        self.page_size = page_size
+        self.start_page = start_page
+        self.now = 0.0
+        self.requests = 0
+
+    def __call__(self, page, fresh_only=True):
+        self.requests += 1
+        end = bisect.bisect_right(self.published, self.now) - (page - self.start_page) * self.page_size
+        items = self.articles[max(0, end - self.page_size):max(0, end)][::-1]
+        if fresh_only:
+            items = [(published, news) for published, news in items if self.now - published <= FRESH_SECONDS]
+        return [news for _, news in items]
+
+
+def simulate(policy, sources, hours, interval, page_size):
+    """policy: full(매 주기 최대 페이지 전체), fixed(워터마크 증분, 고정 주기/깊이), adaptive"""
+    poller = AdaptivePoller({news_type: max_pages for news_type, max_pages, _ in sources}, interval)
+    end = hours * 3600
+    results = {}
+    schedule = [(0.0, news_type) for news_type, _, _ in sources]
+    heapq.heapify(schedule)
+    lists = {news_type: SimulatedList(articles, page_size, 0 if news_type == "sport" else 1)
+             for news_type, _, articles in sources}
+    depths = {news_type: max_pages for news_type, max_pages, _ in sources}
+    marks, seen = {}, {news_type: set() for news_type, _, _ in sources}
+
+    while schedule:
+        now, news_type = heapq.heappop(schedule)
+        if now > end:
+            continue
+        list_func = lists[news_type]
+        list_func.now = now
+
+        if policy == "full":
+            for page in range(list_func.start_page, list_func.start_page + depths[news_type]):
+                news_list = list_func(page, fresh_only=False)
+                seen[news_type].update(news.naver_url for news in news_list)
+                if not news_list:
+                    break
+            heapq.heappush(schedule, (now + interval, news_type))
+            continue
+
+        depth = depths[news_type] if policy == "fixed" else poller.plan(news_type)[1]
+        stats = {}
+        newer, marks[news_type] = poll_source(list_func, news_type, depth, marks.get(news_type), stats=stats)
+        seen[news_type].update(news.naver_url for news in newer)
+        if policy == "fixed":
+            heapq.heappush(schedule, (now + interval, news_type))
+        else:
+            next_interval = poller.observe(news_type, len(newer), stats["pages"], stats["reached"],
+                                           stats["page_size"], now)
+            heapq.heappush(schedule, (now + next_interval, news_type))
+
+    for news_type, _, articles in sources:
+        # 마지막 수집 이후에 게시된 기사는 정책과 관계없이 아직 수집 전이므로 최대 주기만큼 끝을 제외
+        target = [news for published, news in articles if published <= end - poller.max_interval]
+        missed = sum(1 for news in target if news.naver_url not in seen[news_type])
+        results[news_type] = {"requests": lists[news_type].requests, "articles": len(target), "missed": missed}
+    return results, poller.stats()
+
+
+def print_table(label, results):
+    requests = sum(result["requests"] for result in results.values())
+    articles = sum(result["articles"] for result in results.values())
+    missed = sum(result["missed"] for result in results.values())
+    detail = ", ".join(f"{news_type} {result['requests']}요청/누락 {result['missed']}"
+                       for news_type, result in results.items())
+    print(f"[info] {label:<9} 리스트 요청 {requests:6d}회, 누락 {missed:4d}/{articles}건 "
+          f"({missed / articles:.2%})  [{detail}]")
+    return requests
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="적응형 폴링 시뮬레이션")
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--interval", type=float, default=120, help="고정 정책의 수집 주기(초), POLL_INTERVAL")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sources = [(news_type, max_pages, generate(news_type, day_rate, burst_rate, args.hours, rng))
+               for news_type, max_pages, day_rate, burst_rate in SOURCES]
+    print(f"[info] {args.hours:g}시간, 기사 {sum(len(articles) for _, _, articles in sources)}건, "
+          f"속보 급증 구간 {len(BURSTS)}회")
+
+    full, _ = simulate("full", sources, args.hours, args.interval, args.page_size)
+    fixed, _ = simulate("fixed", sources, args.hours, args.interval, args.page_size)
+    adaptive, stats = simulate("adaptive", sources, args.hours, args.interval, args.page_size)
+
+    full_requests = print_table("full", full)
+    fixed_requests = print_table("fixed", fixed)
+    adaptive_requests = print_table("adaptive", adaptive)
+    print(f"[info] 적응형 요청 절감: full 대비 {1 - adaptive_requests / full_requests:.1%}, "
+          f"fixed 대비 {1 - adaptive_requests / fixed_requests:.1%}")
+    for news_type, state in stats.items():
+        print(f"       {news_type:<6} 게시량 {state['rate_per_minute']}건/분, 수집 {state['polls']}회, "
+              f"추정 절감률 {state['request_savings']:.1%}, 깊이 초과 {state['overflows']}회, "
+              f"추정 누락률 {state['missed_rate']:.2%}")
@@ -0,0 +1,92 @@
+# 기사 레코드 메모리 벤치마크: 큐에 밀린 기사 N건을 기존 dict(camelCase 키, 확률 분포 dict)와 Article(__slots__)로
+# 들고 있을 때 기사당 메모리 비교 (tracemalloc으로 레코드가 붙잡고 있는 전체 바이트 측정)
+# 단계별로 비교: listed(리스트에서 받은 기사), fetched(본문 수집), analyzed(분석 완료)
+# 기사마다 JSON을 따로 파싱하여 실제 크롤러처럼 문자열을 공유하지 않도록 만듦 (언론사/카테고리 등은 Article에서만 intern)
+# 사용법: python -m benchmarks.article_memory [--articles 10000] [--content 2000] [--seed 0]
+import sys
+import json
+import random
+import argparse
+import tracemalloc
+from article import Article
+
+MEDIA_NAMES = ["연합뉴스", "뉴시스", "뉴스1", "조선일보", "중앙일보", "동아일보", "한겨레", "경향신문", "매일경제", "한국경제",
+               "스포츠조선", "스포츠동아", "OSEN", "스타뉴스", "엑스포츠뉴스"]
+CATEGORIES = ["정치", "경제", "사회", "생활/문화", "IT/과학", "세계", "연예", "스포츠"]
+STAGES = ("listed", "fetched", "analyzed")
+
+
+def _probs(rng):
+    weights = [rng.random() for _ in range(5)]
+    return {str(token): weight / sum(weights) for token, weight in enumerate(weights, start=1)}
+
+
+def payloads(size, content_length, stage, seed=0):
+    """단계별 기존 형식(dict)의 기사 JSON 문자열 목록"""
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + i) for i in range(0, 11172, 7)]
+    result = []
+    for i in range(size):
+        news_type = ("news", "enter", "sport")[i % 3]
+        news = {"naverUrl": f"https://n.news.naver.com/mnews/article/{i % 1000:03d}/{i:010d}", "news_type": news_type,
+                "image_url": f"https://imgnews.pstatic.net/image/{i:010d}.jpg", "mediaName": rng.choice(MEDIA_NAMES)}
+        if news_type == "sport":
+            news["createdDate"] = f"2026-10-18T{i % 24:02d}:{i % 60:02d}:00Z"
+        if stage != "listed":
+            news["url"] = f"https://www.example.co.kr/article/{i}"
+            news["title"] = "".join(rng.choice(syllables) for _ in range(30))
+            news["content"] = "".join(rng.choice(syllables) for _ in range(content_length))
+        if stage == "analyzed":
+            news.update({
+                "summary": "".join(rng.choice(syllables) for _ in range(150)), "category": rng.choice(CATEGORIES),
+                "headline_score": rng.uniform(0, 100), "headline_score_origin": rng.uniform(1, 5),
+                "headline_score_probs": _probs(rng),
+                "fact_score": rng.uniform(0, 100), "fact_score_origin": rng.uniform(1, 5),
+                "fact_score_probs": _probs(rng),
+                "hs_reason": "".join(rng.choice(syllables) for _ in range(200)),
+                "fs_reason": "".join(rng.choice(syllables) for _ in range(200)),
+            })
+        result.append(json.dumps(news, ensure_ascii=False))
+    return result
+
+
+def measure(lines, build):
+    """레코드 목록을 만든 뒤 남아 있는 바이트 수 (목록 자체 포함)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [build(json.loads(line)) for line in lines]
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return records, retained
+
+
+def text_bytes(records):
+    """기사 본문/제목/요약/판단 근거 문자열 크기 (형식과 관계없이 같은 값)"""
+    fields = ("title", "content", "summary", "hs_reason", "fs_reason")
+    return sum(sys.getsizeof(getattr(record, field)) for record in records for field in fields
+               if getattr(record, field) is not None)
+
+
+def run(size, content_length, seed):
+    print(f"[info] 기사 {size}건 (본문 {content_length}자), 기사당 바이트 = 레코드 목록이 붙잡고 있는 전체 메모리 / 기사 수")
+    Article.from_dict(json.loads(payloads(1, 10, "analyzed")[0]))  # 지연 import(score_probs)가 측정에 포함되지 않도록
+    for stage in STAGES:
+        lines = payloads(size, content_length, stage, seed)
+        legacy, legacy_bytes = measure(lines, lambda news: news)
+        articles, article_bytes = measure(lines, Article.from_dict)
+        text = text_bytes(articles)
+        print(f"[info] {stage:<8} dict {legacy_bytes / size:8.0f} B/건 ({legacy_bytes / 1024 / 1024:6.1f} MiB) → "
+              f"Article {article_bytes / size:8.0f} B/건 ({article_bytes / 1024 / 1024:6.1f} MiB), "
+              f"{(1 - article_bytes / legacy_bytes) * 100:4.1f}% 감소 | "
+              f"본문 등 텍스트 제외 {(legacy_bytes - text) / size:5.0f} → {(article_bytes - text) / size:5.0f} B/건")
+        del legacy, articles
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기사 레코드(dict/Article) 메모리 비교")
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--content", type=int, default=2000, help="본문 글자 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.articles, args.content, args.seed)
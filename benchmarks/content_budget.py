@@ -0,0 +1,101 @@
+# 본문 토큰 예산 벤치마크: 기사별 프롬프트 입력 토큰 감소량과 문장 보존 여부(잘린 문장이 없는지) 측정
+# 가짜 OpenAI 서버(입력 토큰에 비례하는 지연)로 원문/잘린 본문 요청의 응답 시간도 비교
+# 사용법: python -m benchmarks.content_budget [기사 JSON 파일 ...] [--synthetic N] [--budget 토큰수] [--strategy lead|lead_tail]
+#        [--llm-sample N] [--llm-latency 초] [--prefill-ms 입력 1000토큰당 ms]
+import sys
+import time
+import random
+from openai import OpenAI
+from benchmarks import fake_openai
+from content_budget import trim_content, split_sentences, count_tokens, GAP_MARKER, CONTENT_TOKEN_BUDGET, TRIM_STRATEGY
+from benchmarks.near_duplicates import load_corpus, DEFAULT_FILES, CALLS_PER_ARTICLE
+
+
+def synthetic_corpus(size, seed=0):
+    """짧은 속보와 긴 기획 기사가 섞인 기사 목록 (문단 3~40개)"""
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + i) for i in range(0, 11172, 7)]
+    words = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(3000)]
+
+    def sentence():
+        return " ".join(rng.choice(words) for _ in range(rng.randint(6, 14))) + rng.choice(["다.", "다.", "까?", "3.5%다."])
+
+    corpus = []
+    for i in range(size):
+        paragraphs = ["  ".join(sentence() for _ in range(rng.randint(2, 5))) for _ in range(rng.randint(3, 40))]
+        corpus.append({"title": f"기사 {i}", "content": "\n".join(paragraphs)})
+    return corpus
+
+
+def run(corpus, budget, strategy):
+    before = after = trimmed = broken = 0
+    elapsed = 0.0
+    for news in corpus:
+        content = news["content"]
+        start = time.perf_counter()
+        result = trim_content(content, budget, strategy)
+        elapsed += time.perf_counter() - start
+        before += count_tokens(content)
+        after += count_tokens(result)
+        if result is not content:
+            trimmed += 1
+            # 잘린 본문의 모든 문장이 원문 문장 그대로인지 확인
+            original = {sentence for sentence, _ in split_sentences(content)}
+            broken += sum(1 for sentence, _ in split_sentences(result)
+                          if sentence != GAP_MARKER and sentence not in original)
+
+    print(f"[info] 기사 수: {len(corpus)}, 예산: {budget} 토큰, 전략: {strategy}")
+    print(f"[info] 잘린 기사: {trimmed}건, 깨진 문장: {broken}개")
+    print(f"[info] 기사당 입력 토큰(프롬프트 {CALLS_PER_ARTICLE}개 합계): "
+          f"{before * CALLS_PER_ARTICLE / len(corpus):.0f} → {after * CALLS_PER_ARTICLE / len(corpus):.0f} "
+          f"({(1 - after / before) * 100 if before else 0:.1f}% 감소)")
+    print(f"[info] 자르기 비용: 기사당 {elapsed / len(corpus) * 1000:.2f}ms")
+
+
+def measure_latency(corpus, budget, strategy, sample, latency, prefill_ms):
+    """원문과 잘린 본문으로 각각 chat completion을 요청하여 평균 응답 시간 비교 (자르기 시간 포함)"""
+    server, _ = fake_openai.start_server(latency=latency, prefill_latency=prefill_ms / 1000)
+    client = OpenAI(base_url=f"http://127.0.0.1:{server.server_port}/v1", api_key="benchmark", max_retries=0)
+
+    def request(content):
+        client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": content}])
+
+    news_list = corpus[:sample]
+    request(news_list[0]["content"])  # 커넥션 준비
+    full = trimmed = 0.0
+    for news in news_list:
+        start = time.perf_counter()
+        request(news["content"])
+        full += time.perf_counter() - start
+
+        start = time.perf_counter()
+        request(trim_content(news["content"], budget, strategy))
+        trimmed += time.perf_counter() - start
+    server.shutdown()
+
+    full, trimmed = full / len(news_list) * 1000, trimmed / len(news_list) * 1000
+    print(f"[info] LLM 요청 지연(기사 {len(news_list)}개, 기본 {latency * 1000:.0f}ms + 입력 1000토큰당 {prefill_ms:.0f}ms): "
+          f"원문 {full:.1f}ms → 잘린 본문 {trimmed:.1f}ms ({(1 - trimmed / full) * 100:.1f}% 감소)")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    budget = int(args[args.index("--budget") + 1]) if "--budget" in args else CONTENT_TOKEN_BUDGET
+    strategy = args[args.index("--strategy") + 1] if "--strategy" in args else TRIM_STRATEGY
+
+    if "--synthetic" in args:
+        corpus = synthetic_corpus(int(args[args.index("--synthetic") + 1]))
+    else:
+        corpus = load_corpus([arg for arg in args if arg.endswith(".json")] or DEFAULT_FILES)
+
+    if not corpus:
+        print("[error] 측정할 기사가 없습니다.")
+        sys.exit(1)
+
+    run(corpus, budget, strategy)
+
+    sample = int(args[args.index("--llm-sample") + 1]) if "--llm-sample" in args else 50
+    latency = float(args[args.index("--llm-latency") + 1]) if "--llm-latency" in args else 0.0
+    prefill_ms = float(args[args.index("--prefill-ms") + 1]) if "--prefill-ms" in args else 0.0
+    if sample > 0:
+        measure_latency(corpus, budget, strategy, sample, latency, prefill_ms)
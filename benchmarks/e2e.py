@@ -0,0 +1,250 @@
+# 오프라인 end-to-end 벤치마크: 네이버 재현 서버, 가짜 OpenAI, SQLite, 가짜 OpenSearch로 app.py 파이프라인 전체를 실행
+# worker 수별로 초당 처리 기사 수, 단계별(본문 수집/분석/저장) p50/p99 지연, 리스트 노출부터 색인까지 걸린 시간 측정
+# 사용법: python -m benchmarks.e2e [--articles N] [--workers 1,5,10] [--mode sync|stream|async|shared] [--batch-write]
+#                                  [--llm-latency 초] [--naver-latency 초] [--recordings 디렉터리] [--staged]
+#                                  [--replicas 1,2,4]
+# --staged는 app의 PIPELINE_MODE=staged로 실행 (단계별 스레드 수는 FETCH_WORKERS/ANALYZE_WORKERS/PERSIST_WORKERS 환경 변수)
+# --replicas는 같은 DB를 공유하는 app 프로세스 여러 개를 동시에 실행 (shared 모드면 작업 큐로 나눠서 처리,
+# 그 외 모드는 replica마다 같은 기사를 처리하므로 LLM 요청 수로 중복 비용 확인)
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+from benchmarks import fake_openai, fake_naver, fake_opensearch
+
+RESULT_PREFIX = "E2E_RESULT "
+
+# shared 모드 replica는 작업 큐가 이 시간(초) 동안 비어 있으면 종료
+SHARED_EXIT_AFTER_IDLE = 3.0
+
+# 벤치마크용 SQLite 스키마 (운영 MySQL의 news, news_content 테이블과 같은 컬럼)
+SQLITE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS news (
+        news_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE, naver_url TEXT, title TEXT, summary TEXT, image_url TEXT, media_name TEXT,
+        category TEXT, headline_score REAL, fact_score REAL,
+        headline_score_reason TEXT, fact_score_reason TEXT,
+        like_count INTEGER, hate_count INTEGER, comment_count INTEGER, view_count INTEGER,
+        rating_count INTEGER, total_rating_sum INTEGER
+    )""",
+    "CREATE TABLE IF NOT EXISTS news_content (news_id INTEGER PRIMARY KEY, content TEXT)",
+]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+def timed(name, func, samples, lock):
+    """func 실행 시간을 samples[name]에 기록하는 래퍼"""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with lock:
+                samples.setdefault(name, []).append(time.perf_counter() - start)
+    return wrapper
+
+
+def run_pipeline(workers):
+    """(자식 프로세스) 환경 변수로 지정된 가짜 서버들을 대상으로 app 파이프라인을 1회 실행하고 결과를 출력"""
+    from sqlalchemy import text
+    import app
+    import db
+
+    with db.engine.begin() as connection:
+        for statement in SQLITE_SCHEMA:
+            connection.execute(text(statement))
+    db.check_db_connection()
+    db.check_elasticsearch_connection()
+
+    # 단계별 지연 측정 (app이 참조하는 함수를 측정 래퍼로 교체)
+    samples, lock = {}, threading.Lock()
+    for name, stage in (("get_news", "crawl"), ("get_enter", "crawl"), ("get_sports", "crawl"),
+                        ("analyze_news", "analyze"), ("save_news", "save")):
+        setattr(app, name, timed(stage, getattr(app, name), samples, lock))
+    db.news_writer.write_batch = timed("save_batch", db.news_writer.write_batch, samples, lock)
+
+    start = time.time()
+    finished = [start]  # 마지막으로 처리를 끝낸 시각 (shared 모드의 종료 대기 시간은 제외)
+    if app.BATCH_WRITE:
+        db.news_writer.start()
+
+    if app.CRAWL_MODE == "shared":
+        complete = db.work_queue.complete
+
+        def complete_and_record(key):
+            complete(key)
+            finished.append(time.time())
+
+        db.work_queue.complete = complete_and_record
+        db.work_queue.start()
+        app.fetch_news_shared()
+        stop_event = threading.Event()
+        threads = [threading.Thread(target=app.process_shared, args=(stop_event, SHARED_EXIT_AFTER_IDLE))
+                   for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        db.close_clients()
+        db.work_queue.close()
+        return report_child(workers, start, max(finished), samples, None)
+
+    pipeline, threads = None, []
+    if app.PIPELINE_MODE == "staged":
+        pipeline = app.build_pipeline().start()
+        app.news_queue = pipeline.stages[0].input
+    else:
+        threads = [threading.Thread(target=app.process_news) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+
+    if app.CRAWL_MODE == "async":
+        app.fetch_news_async()
+    elif app.CRAWL_MODE == "stream":
+        app.fetch_news_streaming()
+    else:
+        app.fetch_news()
+
+    utilization = None
+    if pipeline:
+        pipeline.close()
+        utilization = pipeline.report()
+    else:
+        for _ in range(workers):
+            app.news_queue.put(app.STOP_SIGNAL)
+        for thread in threads:
+            thread.join()
+    db.close_clients()
+    report_child(workers, start, time.time(), samples, utilization)
+
+
+def report_child(workers, start, end, samples, utilization):
+    """(자식 프로세스) 실행 구간과 단계별 지연 원본을 부모 프로세스에 전달"""
+    from sqlalchemy import text
+    import db
+
+    with db.engine.connect() as connection:
+        saved = connection.execute(text("SELECT COUNT(*) FROM news")).scalar()
+    print(RESULT_PREFIX + json.dumps({"workers": workers, "start": start, "end": end, "saved": saved,
+                                      "samples": samples, "utilization": utilization}))
+
+
+def run_once(corpus, workers, replicas, args):
+    """가짜 서버를 새로 띄우고 자식 프로세스(replica 수만큼 동시에)에서 파이프라인 실행, 결과 dict 반환"""
+    naver, naver_state = fake_naver.start_server(corpus, latency=args.naver_latency)
+    openai_server, openai_state = fake_openai.start_server(latency=args.llm_latency)
+    opensearch, opensearch_state = fake_opensearch.start_server()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        naver_base = f"http://127.0.0.1:{naver.server_port}"
+        processes = []
+        for replica in range(replicas):
+            # DB는 공유하고, 로컬 디스크 상태(seen 인덱스, 워터마크)는 replica별로 분리
+            env = dict(
+                os.environ,
+                NAVER_NEWS_BASE=naver_base, NAVER_ENTER_API_BASE=naver_base, NAVER_SPORTS_API_BASE=naver_base,
+                OPENAI_BASE_URL=f"http://127.0.0.1:{openai_server.server_port}/v1", OPENAI_API_KEY="benchmark",
+                ES_HOST="127.0.0.1", ES_PORT=str(opensearch.server_port), ES_USE_SSL="false",
+                DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'news.sqlite3')}?timeout=30",
+                SEEN_INDEX_PATH=os.path.join(workdir, f"seen_urls_{replica}.bin"),
+                WATERMARK_PATH=os.path.join(workdir, f"watermarks_{replica}.json"),
+                WORKER_ID=f"replica-{replica}",
+                LLM_CACHE_ENABLED="false",
+                CRAWL_MODE=args.mode,
+                BATCH_WRITE="true" if args.batch_write else "false",
+                PIPELINE_MODE="staged" if args.staged else "worker",
+                SHARED_IDLE_SLEEP="0.2",
+            )
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.e2e", "--child", str(workers)],
+                env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            ))
+        outputs = [process.communicate() for process in processes]
+
+    for server in (naver, openai_server, opensearch):
+        server.shutdown()
+
+    children = []
+    for process, (stdout, stderr) in zip(processes, outputs):
+        lines = [line for line in stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+        if process.returncode != 0 or not lines:
+            print(stdout[-2000:], stderr[-2000:])
+            raise RuntimeError(f"파이프라인 실행 실패 (workers={workers}, exit={process.returncode})")
+        children.append(json.loads(lines[-1][len(RESULT_PREFIX):]))
+
+    # replica별 결과 합산 (처리 구간은 가장 먼저 시작한 replica부터 가장 늦게 끝난 replica까지)
+    samples = {}
+    for child in children:
+        for name, values in child["samples"].items():
+            samples.setdefault(name, []).extend(values)
+    result = {
+        "workers": workers,
+        "replicas": replicas,
+        "elapsed": max(child["end"] for child in children) - min(child["start"] for child in children),
+        "saved": max(child["saved"] for child in children),
+        "stages": {name: {"count": len(values), "p50": percentile(values, 50), "p99": percentile(values, 99)}
+                   for name, values in samples.items()},
+        "utilization": children[0]["utilization"] if replicas == 1 else None,
+    }
+    time_to_index = [indexed - naver_state.listed_at[title]
+                     for title, indexed in opensearch_state.indexed_at.items() if title in naver_state.listed_at]
+    result["time_to_index"] = {"p50": percentile(time_to_index, 50), "p99": percentile(time_to_index, 99)}
+    result["indexed"] = len(opensearch_state.documents)
+    result["llm_requests"] = openai_state.requests
+    return result
+
+
+def report(result, corpus_size):
+    stages = result["stages"]
+    print(f"\n[info] replicas={result['replicas']}, workers={result['workers']}: "
+          f"{result['saved']}/{corpus_size}건 저장, {result['indexed']}건 색인, "
+          f"{result['elapsed']:.2f}초 → {result['saved'] / result['elapsed']:.2f} articles/s "
+          f"(LLM 요청 {result['llm_requests']}회, 기사당 {result['llm_requests'] / max(1, result['saved']):.1f}회)")
+    for name in ("crawl", "analyze", "save", "save_batch"):
+        if name in stages:
+            stage = stages[name]
+            print(f"       {name:<10} n={stage['count']:<5} p50={stage['p50'] * 1000:8.1f}ms  "
+                  f"p99={stage['p99'] * 1000:8.1f}ms")
+    print(f"       {'색인까지':<8}           p50={result['time_to_index']['p50'] * 1000:8.1f}ms  "
+          f"p99={result['time_to_index']['p99'] * 1000:8.1f}ms")
+    for name, stage in (result.get("utilization") or {}).items():
+        print(f"       {name:<10} workers={stage['workers']:<4} 사용률={stage['utilization']:.2f}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        run_pipeline(int(sys.argv[sys.argv.index("--child") + 1]))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="오프라인 end-to-end 파이프라인 벤치마크")
+    parser.add_argument("--articles", type=int, default=150, help="합성 기사 수 (뉴스/엔터/스포츠 1/3씩)")
+    parser.add_argument("--workers", default="5", help="쉼표로 구분한 worker 수 목록")
+    parser.add_argument("--mode", default="sync", choices=["sync", "stream", "async", "shared"], help="app의 CRAWL_MODE")
+    parser.add_argument("--batch-write", action="store_true", help="배치 writer로 저장 (BATCH_WRITE=true)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="가짜 OpenAI 응답 지연(초)")
+    parser.add_argument("--naver-latency", type=float, default=0.02, help="네이버 재현 서버 응답 지연(초)")
+    parser.add_argument("--recordings", help="fake_naver --record로 저장한 응답 디렉터리 (없으면 합성 기사)")
+    parser.add_argument("--staged", action="store_true",
+                        help="단계 분리 파이프라인으로 실행 (PIPELINE_MODE=staged, --workers 값은 무시)")
+    parser.add_argument("--replicas", default="1", help="쉼표로 구분한 동시 실행 replica 수 목록")
+    args = parser.parse_args()
+
+    corpus = (fake_naver.load_recordings(args.recordings) if args.recordings
+              else fake_naver.synthetic_corpus(args.articles))
+    print(f"[info] 기사 {len(corpus)}개, 모드 {args.mode}{' + 배치 저장' if args.batch_write else ''}"
+          f"{' + 단계 분리' if args.staged else ''}, "
+          f"LLM 지연 {args.llm_latency}초, 네이버 지연 {args.naver_latency}초")
+
+    for replicas in [int(value) for value in args.replicas.split(",")]:
+        for workers in [int(value) for value in args.workers.split(",")]:
+            report(run_once(corpus, workers, replicas, args), len(corpus))
@@ -0,0 +1,232 @@
+# 로컬 네이버 재현 서버. 뉴스(HTML), 엔터/스포츠(JSON API)의 리스트와 기사 응답을 재생하여 네트워크 없이 크롤링 경로를 측정
+# 기사 응답은 저장된 녹화본(--record로 저장) 또는 합성 데이터를 사용하고, 리스트는 요청 시점 기준 "방금 올라온" 기사로 생성
+# 사용법: python -m benchmarks.fake_naver [포트] [--recordings 디렉터리] 후
+#        NAVER_NEWS_BASE / NAVER_ENTER_API_BASE / NAVER_SPORTS_API_BASE=http://127.0.0.1:<포트> 로 실행
+import os
+import sys
+import glob
+import json
+import time
+import random
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from news_crawler import parse_news
+from article import Article
+from benchmarks.html_parsing import synthetic_article
+
+# 크롤러가 순회하는 페이지 범위 (app.NEWS_SOURCES와 동일)
+NEWS_PAGES = range(1, 11)
+ENTER_PAGES = range(1, 5)
+SPORTS_PAGES = range(0, 4)
+
+SYLLABLES = [chr(0xAC00 + n) for n in range(0, 11172, 13)]
+
+ENTER_OFFICE = "311"
+SPORTS_OFFICE = "477"
+
+
+def _json_bytes(payload):
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def synthetic_corpus(size, seed=0):
+    """뉴스/엔터/스포츠 기사를 1/3씩 합성. [{"source", "id", "title", "body", "url"}]"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        source = ("news", "enter", "sport")[i % 3]
+        if source == "news":
+            body = synthetic_article(i, rng).encode("utf-8")
+            title = parse_news(body, Article(naver_url="", news_type="news"), "utf-8").title
+            corpus.append({"source": source, "id": i, "title": title, "body": body,
+                           "url": f"https://www.example.co.kr/news/{i}"})
+            continue
+
+        title = f"{'엔터' if source == 'enter' else '스포츠'} 기사 {i}"
+        content = "\n".join(" ".join("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+                                      for _ in range(rng.randint(8, 14))) + "다."
+                            for _ in range(rng.randint(10, 40)))
+        url = f"https://www.example-{source}.co.kr/article/{i}"
+        if source == "enter":
+            body = {"result": {"articleInfo": {"article": {
+                "title": title, "refinedContent": content, "orgUrl": {"pc": {"url": url}}}}}}
+        else:
+            body = {"result": {"articleInfo": {"article": {"title": title, "refinedContent": content}},
+                               "officeInfo": {"hname": "스포츠신문"}}}
+        corpus.append({"source": source, "id": i, "title": title, "body": _json_bytes(body), "url": url})
+    return corpus
+
+
+def load_recordings(directory):
+    """--record로 저장한 기사 응답(news/*.html, enter/*.json, sport/*.json)을 재생용 코퍼스로 로드"""
+    corpus = []
+    for source in ("news", "enter", "sport"):
+        for index, path in enumerate(sorted(glob.glob(os.path.join(directory, source, "*")))):
+            with open(path, "rb") as file:
+                body = file.read()
+            if source == "news":
+                parsed = parse_news(body, Article(naver_url="", news_type="news"), "utf-8")
+                if not parsed:
+                    continue
+                title, url = parsed.title, parsed.url
+            else:
+                article = json.loads(body)["result"]["articleInfo"]["article"]
+                title = article["title"]
+                url = article.get("orgUrl", {}).get("pc", {}).get("url") or f"https://recorded/{source}/{index}"
+            corpus.append({"source": source, "id": len(corpus), "title": title, "body": body, "url": url})
+    return corpus
+
+
+def record(directory, count):
+    """실제 네이버 리스트/기사 응답을 소스별로 count개씩 저장"""
+    import requests
+    from news_crawler import get_news_list
+    from enter_crawler import get_enter_list, enter_article_url, header as enter_header
+    from sports_crawler import get_sports_list, sports_article_url, header as sports_header
+
+    sources = [
+        ("news", get_news_list, NEWS_PAGES, lambda item: (item.naver_url, None), "html"),
+        ("enter", get_enter_list, ENTER_PAGES, lambda item: (enter_article_url(item), enter_header), "json"),
+        ("sport", get_sports_list, SPORTS_PAGES, lambda item: (sports_article_url(item), sports_header), "json"),
+    ]
+    for source, list_func, pages, article_request, extension in sources:
+        os.makedirs(os.path.join(directory, source), exist_ok=True)
+        saved = 0
+        for page in pages:
+            for item in list_func(page, fresh_only=False):
+                url, headers = article_request(item)
+                response = requests.get(url, headers=headers)
+                with open(os.path.join(directory, source, f"{saved:05d}.{extension}"), "wb") as file:
+                    file.write(response.text.encode("utf-8"))
+                saved += 1
+                if saved >= count:
+                    break
+            if saved >= count:
+                break
+        print(f"[info] {source} 응답 {saved}개 저장 완료")
+
+
+class FakeNaverState:
+    """재생할 기사와 리스트 페이지 배치, 기사별 리스트 노출 시각(색인까지 걸린 시간 측정용)"""
+
+    def __init__(self, corpus, latency=0.0):
+        self.latency = latency  # 응답 지연(초)
+        self.articles = {}  # 기사 응답 경로 → 기사
+        self.pages = {"news": {}, "enter": {}, "sport": {}}  # 소스별 페이지 → 기사 리스트
+        self.listed_at = {}  # 제목 → 리스트에 처음 노출된 시각
+        self._lock = threading.Lock()
+
+        for source, pages in (("news", NEWS_PAGES), ("enter", ENTER_PAGES), ("sport", SPORTS_PAGES)):
+            items = [article for article in corpus if article["source"] == source]
+            per_page = max(1, -(-len(items) // len(pages)))
+            for index, page in enumerate(pages):
+                self.pages[source][page] = items[index * per_page:(index + 1) * per_page]
+
+        for article in corpus:
+            self.articles[self.article_path(article)] = article
+
+    @staticmethod
+    def article_path(article):
+        if article["source"] == "news":
+            return f"/mnews/article/001/{article['id']:010d}"
+        office = ENTER_OFFICE if article["source"] == "enter" else SPORTS_OFFICE
+        return f"/news/article/{office}/{article['id']:010d}"
+
+    def list_page(self, source, page, base):
+        items = self.pages[source].get(page, [])
+        now = time.time()
+        with self._lock:
+            for article in items:
+                self.listed_at.setdefault(article["title"], now)
+
+        if source == "news":
+            lis = "".join(
+                f'<li><dl><dt><a href="{base}{self.article_path(article)}">{article["title"]}</a></dt>'
+                f'<dd><span class="date is_new">1분전</span></dd></dl></li>' for article in items
+            )
+            return "text/html; charset=utf-8", (
+                f'<html><head><meta charset="utf-8"></head><body><div class="list_body newsflash_body">'
+                f'<ul class="type06_headline">{lis}</ul></div></body></html>').encode("utf-8")
+
+        if source == "enter":
+            return "application/json", _json_bytes({"result": {"newsList": [{
+                "url": f"https://m.entertain.naver.com/now/article/{ENTER_OFFICE}/{article['id']:010d}",
+                "image": "https://imgnews.pstatic.net/enter.jpg",
+                "officeName": "엔터신문",
+                "articleTime": "방금전",
+            } for article in items]}})
+
+        created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        return "application/json", _json_bytes({"result": {"contents": [{"packItemContents": [{
+            "orgUrl": {"pc": article["url"]},
+            "linkUrl": f"https://m.sports.naver.com/kbaseball/article/{SPORTS_OFFICE}/{article['id']:010d}",
+            "imageUrl": "https://imgnews.pstatic.net/sports.jpg",
+            "createdDate": created,
+        } for article in items]}]}})
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, content_type, data):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if state.latency:
+                time.sleep(state.latency)
+
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            base = f"http://{self.headers['Host']}"
+            page = int(query.get("page", ["0"])[0])
+
+            if parsed.path == "/main/list.naver":
+                return self._send(200, *state.list_page("news", page, base))
+            if parsed.path == "/news/articles":
+                return self._send(200, *state.list_page("enter", page, base))
+            if parsed.path == "/news/scs/series":
+                return self._send(200, *state.list_page("sport", page, base))
+
+            article = state.articles.get(parsed.path)
+            if article is None:
+                return self._send(404, "application/json", _json_bytes({"error": "not found"}))
+            content_type = "text/html; charset=utf-8" if article["source"] == "news" else "application/json"
+            self._send(200, content_type, article["body"])
+
+    return Handler
+
+
+def start_server(corpus, port=0, latency=0.0):
+    """백그라운드 스레드로 서버 시작, (server, state) 반환"""
+    state = FakeNaverState(corpus, latency)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--record" in args:
+        record(args[args.index("--record") + 1], int(args[args.index("--record") + 2]))
+        sys.exit(0)
+
+    corpus = (load_recordings(args[args.index("--recordings") + 1]) if "--recordings" in args
+              else synthetic_corpus(300))
+    port = int(args[0]) if args and args[0].isdigit() else 8900
+    server, _ = start_server(corpus, port)
+    print(f"[info] 네이버 재현 서버 실행 중: http://127.0.0.1:{server.server_port} (기사 {len(corpus)}개)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
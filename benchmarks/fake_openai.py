@@ -0,0 +1,190 @@
+# 로컬 가짜 OpenAI 서버. chat completions(logprobs 포함)와 files/batches API를 흉내 내어 네트워크 없이 분석 경로를 측정/검증
+# 사용법: python -m benchmarks.fake_openai [포트] 후 OPENAI_BASE_URL=http://127.0.0.1:<포트>/v1 로 실행
+import sys
+import json
+import math
+import time
+import random
+import threading
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CATEGORIES = ["Politics", "Economy", "Society", "International", "tech", "Culture", "Entertainment", "Sports"]
+
+
+class FakeOpenAIState:
+    """서버 설정(응답 지연, 429 비율)과 업로드 파일/batch 저장소"""
+
+    def __init__(self, latency=0.0, rate_limit_ratio=0.0, retry_after=1, rate_limit_first=0, prefill_latency=0.0):
+        self.latency = latency  # chat completion 응답 지연(초)
+        self.prefill_latency = prefill_latency  # 입력 토큰 1000개당 추가 지연(초), 프롬프트 길이에 따른 처리 시간
+        self.rate_limit_ratio = rate_limit_ratio  # 429를 반환할 비율
+        self.rate_limit_first = rate_limit_first  # 처음 N개 요청은 항상 429 (테스트용)
+        self.retry_after = retry_after
+        self.files = {}
+        self.batches = {}
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def next_id(self, prefix):
+        with self._lock:
+            self._seq += 1
+            return f"{prefix}-{self._seq}"
+
+
+def chat_completion(body):
+    """요청 파라미터에 맞는 가짜 chat completion 응답 생성"""
+    prompt = body["messages"][-1]["content"]
+    rng = random.Random(len(prompt))
+
+    if body.get("logprobs"):
+        # 점수 토큰 1~5에 대한 top_logprobs
+        weights = [rng.random() for _ in range(5)]
+        total = sum(weights)
+        top = sorted(({"token": str(i + 1), "logprob": math.log(w / total), "bytes": None}
+                      for i, w in enumerate(weights)), key=lambda item: -item["logprob"])
+        content = top[0]["token"]
+        logprobs = {"content": [{"token": content, "logprob": top[0]["logprob"], "bytes": None, "top_logprobs": top}]}
+    else:
+        content = json.dumps({
+            "summary": "가짜 요약입니다.",
+            "category": rng.choice(CATEGORIES),
+            "hs_reason": "가짜 제목 점수 근거입니다.",
+            "fs_reason": "가짜 팩트 점수 근거입니다.",
+        }, ensure_ascii=False)
+        logprobs = None
+
+    prompt_tokens = len(prompt) // 2
+    return {
+        "id": f"chatcmpl-{rng.randrange(10 ** 9)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "logprobs": logprobs,
+            "finish_reason": "stop",
+        }],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 20, "total_tokens": prompt_tokens + 20},
+    }
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, payload, headers=None, raw=None):
+            data = raw if raw is not None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _body(self):
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        def do_POST(self):
+            if self.path.endswith("/chat/completions"):
+                body = json.loads(self._body())
+                with state._lock:
+                    state.requests += 1
+                    limited = state.requests <= state.rate_limit_first or random.random() < state.rate_limit_ratio
+                    if limited:
+                        state.rate_limited += 1
+                if limited:
+                    return self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                                      headers={"retry-after": str(state.retry_after)})
+                completion = chat_completion(body)
+                delay = state.latency + state.prefill_latency * completion["usage"]["prompt_tokens"] / 1000
+                if delay:
+                    time.sleep(delay)
+                return self._send(200, completion)
+
+            if self.path.endswith("/files"):
+                raw = self._body()
+                message = BytesParser(policy=default_policy).parsebytes(
+                    f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + raw)
+                content, purpose, filename = b"", "batch", "input.jsonl"
+                for part in message.iter_parts():
+                    name = part.get_param("name", header="content-disposition")
+                    if name == "file":
+                        content = part.get_payload(decode=True)
+                        filename = part.get_filename() or filename
+                    elif name == "purpose":
+                        purpose = part.get_content().strip()
+                file_id = state.next_id("file")
+                state.files[file_id] = content
+                return self._send(200, {"id": file_id, "object": "file", "bytes": len(content),
+                                        "created_at": int(time.time()), "filename": filename,
+                                        "purpose": purpose, "status": "processed"})
+
+            if self.path.endswith("/batches"):
+                body = json.loads(self._body())
+                batch_id = state.next_id("batch")
+                lines = [json.loads(line) for line in state.files[body["input_file_id"]].decode("utf-8").splitlines()
+                         if line.strip()]
+                output = [json.dumps({
+                    "id": f"req-{i}",
+                    "custom_id": line["custom_id"],
+                    "response": {"status_code": 200, "request_id": f"req-{i}", "body": chat_completion(line["body"])},
+                    "error": None,
+                }, ensure_ascii=False) for i, line in enumerate(lines)]
+                output_file_id = state.next_id("file")
+                state.files[output_file_id] = ("\n".join(output) + "\n").encode("utf-8")
+
+                batch = {
+                    "id": batch_id, "object": "batch", "endpoint": body["endpoint"], "errors": None,
+                    "input_file_id": body["input_file_id"], "completion_window": body["completion_window"],
+                    "status": "in_progress", "output_file_id": None, "error_file_id": None,
+                    "created_at": int(time.time()), "metadata": body.get("metadata"),
+                    "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+                }
+                state.batches[batch_id] = (batch, output_file_id)
+                return self._send(200, batch)
+
+            self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+
+        def do_GET(self):
+            parts = self.path.rstrip("/").split("/")
+            if "batches" in parts:
+                batch, output_file_id = state.batches[parts[-1]]
+                # 첫 조회에서는 진행 중, 이후 조회부터 완료 상태로 응답
+                if batch["status"] == "in_progress" and batch.get("_polled"):
+                    batch.update(status="completed", output_file_id=output_file_id,
+                                 request_counts={"total": batch["request_counts"]["total"],
+                                                 "completed": batch["request_counts"]["total"], "failed": 0})
+                batch["_polled"] = True
+                return self._send(200, {key: value for key, value in batch.items() if not key.startswith("_")})
+
+            if parts[-1] == "content":
+                return self._send(200, None, raw=state.files[parts[-2]])
+
+            self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    return Handler
+
+
+def start_server(port=0, **options):
+    """백그라운드 스레드로 서버 시작, (server, state) 반환"""
+    state = FakeOpenAIState(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8800
+    server, _ = start_server(port)
+    print(f"[info] 가짜 OpenAI 서버 실행 중: http://127.0.0.1:{server.server_port}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
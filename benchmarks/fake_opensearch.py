@@ -0,0 +1,303 @@
+# 메모리 기반 가짜 OpenSearch 서버. ping, _bulk 색인과 인덱스 관리 API(index template, 인덱스 생성/삭제, alias, settings,
+# refresh, _count, 단순 _search, _cat/plugins)를 지원하며 문서별 색인 시각을 기록 (색인까지 걸린 시간 측정, es_index 동작 확인용)
+# 사용법: python -m benchmarks.fake_opensearch [포트] 후 ES_HOST=127.0.0.1 ES_PORT=<포트> ES_USE_SSL=false 로 실행
+import sys
+import json
+import time
+import fnmatch
+import threading
+from urllib.parse import urlsplit, unquote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class FakeOpenSearchState:
+    def __init__(self, plugins=("analysis-nori",)):
+        self.plugins = list(plugins)  # 설치된 플러그인 (analysis-nori가 없으면 nori 분석기를 쓰는 인덱스 생성 실패)
+        self.documents = {}  # (index, _id) → 문서
+        self.indexed_at = {}  # 제목 → 처음 색인된 시각
+        self.bulk_requests = 0
+        self.templates = {}  # 이름 → index template
+        self.indices = {}  # 인덱스 이름 → {"settings", "mappings"}
+        self.aliases = {}  # alias → {인덱스 이름: alias 설정}
+        self._lock = threading.Lock()
+
+    def create_index(self, name, body=None):
+        """template(index_patterns가 맞는 것 중 priority가 가장 높은 것)을 적용하여 인덱스 생성"""
+        body = body or {}
+        settings, mappings = {}, {}
+        matched = [template for template in self.templates.values()
+                   if any(fnmatch.fnmatch(name, pattern) for pattern in template.get("index_patterns", []))]
+        if matched:
+            template = max(matched, key=lambda template: template.get("priority", 0)).get("template", {})
+            settings.update(_flatten(template.get("settings", {})))
+            mappings = template.get("mappings", {})
+        settings.update(_flatten(body.get("settings", {})))
+        analysis = json.dumps(settings.get("index.analysis", {}))
+        if "analysis-nori" not in self.plugins and "nori_tokenizer" in analysis:
+            raise ValueError("Unknown tokenizer type [nori_tokenizer] for [korean_tokenizer]")
+        self.indices[name] = {"settings": settings, "mappings": body.get("mappings", mappings)}
+        for alias, options in body.get("aliases", {}).items():
+            self.aliases.setdefault(alias, {})[name] = options
+
+    def resolve(self, name, write=False):
+        """인덱스/alias/와일드카드 이름을 실제 인덱스 이름 목록으로 변환 (write=True면 쓰기 대상 인덱스)"""
+        if name in self.aliases:
+            targets = self.aliases[name]
+            if write:
+                writable = [index for index, options in targets.items() if options.get("is_write_index")]
+                return writable or (list(targets) if len(targets) == 1 else [])
+            return list(targets)
+        if any(char in name for char in "*?"):
+            return [index for index in self.indices if fnmatch.fnmatch(index, name)]
+        return [name] if name in self.indices else []
+
+    def delete_index(self, name):
+        self.indices.pop(name, None)
+        for targets in self.aliases.values():
+            targets.pop(name, None)
+        self.aliases = {alias: targets for alias, targets in self.aliases.items() if targets}
+        for key in [key for key in self.documents if key[0] == name]:
+            del self.documents[key]
+
+
+def _flatten(settings, prefix=""):
+    """{"index": {"number_of_replicas": 1}}와 {"number_of_replicas": 1}을 같은 키(index.number_of_replicas)로 정리"""
+    flat = {}
+    for key, value in settings.items():
+        key = f"{prefix}{key}"
+        if isinstance(value, dict) and key not in ("analysis", "index.analysis"):
+            flat.update(_flatten(value, f"{key}."))
+        else:
+            flat[key if key.startswith("index.") else f"index.{key}"] = value
+    return flat
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(data)
+
+        def _not_found(self, name):
+            self._send(404, {"error": {"type": "index_not_found_exception", "reason": f"no such index [{name}]"},
+                             "status": 404})
+
+        def _read_body(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return self.rfile.read(length).decode("utf-8") if length else ""
+
+        def _parts(self):
+            return [unquote(part) for part in urlsplit(self.path).path.split("/") if part]
+
+        def do_HEAD(self):
+            parts = self._parts()
+            if not parts:
+                return self._send(200, {})
+            with state._lock:
+                exists = bool(state.resolve(parts[0])) if parts[0] != "_index_template" else parts[-1] in state.templates
+            self._send(200 if exists else 404, {})
+
+        def do_GET(self):
+            parts = self._parts()
+            if not parts:
+                return self._send(200, {"name": "fake-opensearch",
+                                        "version": {"distribution": "opensearch", "number": "2.11.0"}})
+            with state._lock:
+                if parts[0] == "_index_template":
+                    name = parts[1] if len(parts) > 1 else "*"
+                    templates = [{"name": key, "index_template": value}
+                                 for key, value in state.templates.items() if fnmatch.fnmatch(key, name)]
+                    return self._send(200 if templates else 404, {"index_templates": templates})
+                if parts[0] == "_alias" or (len(parts) > 1 and parts[1] == "_alias"):
+                    name = parts[-1]
+                    targets = state.aliases.get(name)
+                    if not targets:
+                        return self._send(404, {"error": f"alias [{name}] missing", "status": 404})
+                    return self._send(200, {index: {"aliases": {name: options}} for index, options in targets.items()})
+                if parts[:2] == ["_cat", "plugins"]:
+                    return self._send(200, [{"name": "fake-node", "component": plugin, "version": "2.11.0"}
+                                            for plugin in state.plugins])
+                if parts[0] == "_cluster":
+                    return self._send(200, {"status": "green", "timed_out": False})
+                if len(parts) > 1 and parts[1] in ("_count", "_search"):
+                    return self._query(parts, {})
+                if len(parts) > 1 and parts[1] == "_settings":
+                    indices = state.resolve(parts[0])
+                    return self._send(200, {index: {"settings": state.indices[index]["settings"]} for index in indices})
+                indices = state.resolve(parts[0])
+                if not indices:
+                    return self._not_found(parts[0])
+                return self._send(200, {index: {
+                    "aliases": {alias: options for alias, targets in state.aliases.items()
+                                for target, options in targets.items() if target == index},
+                    "mappings": state.indices[index]["mappings"],
+                    "settings": state.indices[index]["settings"],
+                } for index in indices})
+
+        def do_PUT(self):
+            parts = self._parts()
+            body = json.loads(self._read_body() or "{}")
+            with state._lock:
+                if parts[0] == "_index_template":
+                    state.templates[parts[1]] = body
+                    return self._send(200, {"acknowledged": True})
+                if len(parts) > 1 and parts[1] == "_settings":
+                    indices = state.resolve(parts[0])
+                    if not indices:
+                        return self._not_found(parts[0])
+                    for index in indices:
+                        state.indices[index]["settings"].update(_flatten(body))
+                    return self._send(200, {"acknowledged": True})
+                if parts[0] in state.indices or parts[0] in state.aliases:
+                    return self._send(400, {"error": {"type": "resource_already_exists_exception",
+                                                      "reason": f"index [{parts[0]}] already exists"}, "status": 400})
+                try:
+                    state.create_index(parts[0], body)
+                except ValueError as e:
+                    return self._send(400, {"error": {"type": "illegal_argument_exception", "reason": str(e)},
+                                            "status": 400})
+            self._send(200, {"acknowledged": True, "shards_acknowledged": True, "index": parts[0]})
+
+        def do_DELETE(self):
+            parts = self._parts()
+            with state._lock:
+                indices = state.resolve(parts[0])
+                if not indices or parts[0] in state.aliases:
+                    return self._not_found(parts[0])
+                for index in indices:
+                    state.delete_index(index)
+            self._send(200, {"acknowledged": True})
+
+        def do_POST(self):
+            parts = self._parts()
+            body = self._read_body()
+            if parts and parts[-1] == "_bulk":
+                return self._bulk(parts, body)
+
+            with state._lock:
+                if parts == ["_aliases"]:
+                    return self._update_aliases(json.loads(body or "{}"))
+                if len(parts) > 1 and parts[1] in ("_refresh", "_forcemerge"):
+                    if not state.resolve(parts[0]):
+                        return self._not_found(parts[0])
+                    return self._send(200, {"_shards": {"total": 1, "successful": 1, "failed": 0}})
+                if len(parts) > 1 and parts[1] in ("_count", "_search"):
+                    return self._query(parts, json.loads(body or "{}"))
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+        def _update_aliases(self, body):
+            """actions(add/remove/remove_index)를 모두 검사한 뒤 한 번에 반영 (중간 상태가 보이지 않음)"""
+            aliases = {alias: dict(targets) for alias, targets in state.aliases.items()}
+            removed = []
+            for action in body.get("actions", []):
+                op, options = next(iter(action.items()))
+                options = dict(options)
+                index = options.pop("index")
+                if index not in state.indices:
+                    return self._not_found(index)
+                if op == "add":
+                    aliases.setdefault(options.pop("alias"), {})[index] = options
+                elif op == "remove":
+                    aliases.get(options["alias"], {}).pop(index, None)
+                elif op == "remove_index":
+                    removed.append(index)
+            for index in removed:
+                state.delete_index(index)
+                for targets in aliases.values():
+                    targets.pop(index, None)
+            state.aliases = {alias: targets for alias, targets in aliases.items() if targets}
+            self._send(200, {"acknowledged": True})
+
+        def _query(self, parts, body):
+            """_count/_search: match 쿼리는 단어가 모두 제목/본문에 포함된 문서를 찾음 (분석기는 흉내내지 않음)"""
+            indices = set(state.resolve(parts[0]))
+            if not indices:
+                return self._not_found(parts[0])
+            words = []
+            for clause in _match_clauses(body.get("query", {})):
+                words.extend(str(clause).split())
+            hits = [(key, source) for key, source in state.documents.items() if key[0] in indices
+                    and all(any(word in str(value) for value in source.values()) for word in words)]
+            if parts[1] == "_count":
+                return self._send(200, {"count": len(hits)})
+            size = body.get("size", 10)
+            self._send(200, {"took": 1, "timed_out": False, "hits": {
+                "total": {"value": len(hits), "relation": "eq"},
+                "hits": [{"_index": index, "_id": doc_id, "_score": 1.0, "_source": source}
+                         for (index, doc_id), source in hits[:size]],
+            }})
+
+        def _bulk(self, parts, body):
+            lines = [line for line in body.splitlines() if line.strip()]
+            items = []
+            errors = False
+            now = time.time()
+            with state._lock:
+                state.bulk_requests += 1
+                for action_line, source_line in zip(lines[::2], lines[1::2]):
+                    op, meta = next(iter(json.loads(action_line).items()))
+                    source = json.loads(source_line)
+                    name = meta.get("_index") or parts[0]
+                    targets = state.resolve(name, write=True)
+                    if not targets:
+                        if name in state.aliases:
+                            errors = True
+                            items.append({op: {"_index": name, "_id": str(meta.get("_id")), "status": 400,
+                                               "error": {"type": "illegal_argument_exception",
+                                                         "reason": f"no write index is defined for alias [{name}]"}}})
+                            continue
+                        state.create_index(name)  # 없는 인덱스는 동적 매핑으로 생성 (OpenSearch 기본 동작)
+                        targets = [name]
+                    state.documents[(targets[0], str(meta.get("_id")))] = source
+                    state.indexed_at.setdefault(source.get("title"), now)
+                    items.append({op: {"_index": targets[0], "_id": str(meta.get("_id")),
+                                       "result": "created", "status": 201}})
+            self._send(200, {"took": 1, "errors": errors, "items": items})
+
+    return Handler
+
+
+def _match_clauses(query):
+    """쿼리 dict에서 match/multi_match의 검색어를 모두 꺼냄"""
+    if not isinstance(query, dict):
+        return
+    for key, value in query.items():
+        if key == "multi_match":
+            yield value.get("query", "")
+        elif key in ("match", "match_phrase"):
+            for field_query in value.values():
+                yield field_query.get("query", "") if isinstance(field_query, dict) else field_query
+        elif isinstance(value, dict):
+            yield from _match_clauses(value)
+        elif isinstance(value, list):
+            for item in value:
+                yield from _match_clauses(item)
+
+
+def start_server(port=0, plugins=("analysis-nori",)):
+    """백그라운드 스레드로 서버 시작, (server, state) 반환"""
+    state = FakeOpenSearchState(plugins)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 9200
+    server, _ = start_server(port)
+    print(f"[info] 가짜 OpenSearch 서버 실행 중: http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
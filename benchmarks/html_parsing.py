@@ -0,0 +1,166 @@
+# 네이버 뉴스 HTML 파싱 벤치마크: 기존 BeautifulSoup(html.parser)과 lxml 빠른 경로의 초당 처리 페이지 수와 필드별 결과 일치 여부 비교
+# 사용법: python -m benchmarks.html_parsing [--fixtures 디렉터리] [--synthetic N] [--save 디렉터리 N]
+# fixtures 디렉터리에는 article_*.html(기사)과 list_*.html(리스트) 파일을 저장해 두고 사용 (--save로 실제 페이지 저장 가능)
+import os
+import sys
+import glob
+import time
+import random
+import requests
+from news_crawler import (
+    parse_news, parse_news_bs4, parse_news_list, parse_news_list_bs4, news_list_url, get_news_list
+)
+from article import Article
+
+ARTICLE_FIELDS = ("url", "naver_url", "title", "content", "image_url", "media_name", "news_type")
+
+
+def synthetic_article(i, rng):
+    """기사 페이지 구조(제목, 본문, 대표 이미지, 언론사 로고, 기사원문 링크)와 주변 마크업을 흉내 낸 HTML"""
+    syllables = [chr(0xAC00 + n) for n in range(0, 11172, 13)]
+
+    def sentence():
+        return " ".join("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+                        for _ in range(rng.randint(6, 12))) + "다."
+
+    paragraphs = "<br><br>\n".join(" ".join(sentence() for _ in range(3)) for _ in range(rng.randint(5, 25)))
+    filler = "\n".join(
+        f'<li class="item"><a href="https://n.news.naver.com/article/{n}"><span class="title">{sentence()}</span></a>'
+        f'<!-- 관련 기사 {n} --></li>' for n in range(rng.randint(30, 80))
+    )
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>뉴스 {i}</title>
+<style>.media_end_head_title {{ font-size: 20px; }}</style>
+<script>var g_ssc = "news.article"; window.__DATA__ = {{"id": {i}, "html": "<div>기사원문</div>"}};</script>
+</head><body>
+<div id="ct" class="newsct">
+  <div class="media_end_head_top"><a href="https://media.naver.com/press/{i % 90:03d}">
+    <img class="media_end_head_top_logo_img light_type _LAZY_LOADING _LAZY_LOADING_INIT_HIDE" src="data:image/gif;base64,"
+      data-src="https://mimgnews.pstatic.net/logo/{i}.png" title="언론사{i % 90}" alt="언론사{i % 90}"></a></div>
+  <div class="media_end_head_title"><h2 id="title_area" class="media_end_head_headline"><span>[속보] {sentence()} &amp; {i}</span></h2></div>
+  <div class="media_end_head_info_datestamp"><a href="https://www.example.co.kr/news/{i}" class="media_end_head_origin_link" target="_blank">기사원문</a></div>
+  <div id="newsct_article" class="newsct_article _article_body">
+    <article id="dic_area" class="go_trans _article_content">
+      <span class="end_photo_org"><img id="img1" src="data:image/gif;base64," data-src="https://imgnews.pstatic.net/image/{i}/1.jpg" class="_LAZY_LOADING _LAZY_LOADING_INIT_HIDE">
+      <em class="img_desc">사진 설명 {i}</em></span>
+      <!-- 본문 시작 -->
+      {paragraphs}
+      <script>console.log("본문 스크립트");</script>
+      <strong>기자 이름 reporter{i}@example.co.kr</strong>
+    </article>
+  </div>
+  <ul class="related">{filler}</ul>
+</div>
+</body></html>"""
+
+
+def synthetic_list(page, rng):
+    """속보 리스트 페이지 구조(list_body newsflash_body 안의 li)를 흉내 낸 HTML"""
+    items = "\n".join(
+        f'<li><dl><dt class="photo"><a href="https://n.news.naver.com/mnews/article/{page}/{n}?sid=100">'
+        f'<img src="https://imgnews.pstatic.net/{n}.jpg"></a></dt><dt><a href="https://n.news.naver.com/mnews/article/{page}/{n}?sid=100">'
+        f'제목 {n}</a></dt><dd><span class="lede">요약 {n}</span><span class="writing">언론사</span>'
+        f'<span class="date is_new">{min(n // 5, 9)}분전</span></dd></dl></li>' for n in range(20)
+    )
+    filler = "".join(f'<div class="aside_item"><a href="#">{rng.random()}</a></div>' for _ in range(300))
+    return (f'<html><head><meta charset="utf-8"></head><body><div class="list_body newsflash_body">'
+            f'<ul class="type06_headline">{items}</ul></div>{filler}</body></html>')
+
+
+def load_fixtures(directory):
+    articles = [open(path, "rb").read() for path in sorted(glob.glob(os.path.join(directory, "article_*.html")))]
+    lists = [open(path, "rb").read() for path in sorted(glob.glob(os.path.join(directory, "list_*.html")))]
+    return articles, lists
+
+
+def save_fixtures(directory, count):
+    """실제 속보 리스트와 기사 페이지를 fixture로 저장 (응답 bytes를 UTF-8로 변환하여 저장)"""
+    os.makedirs(directory, exist_ok=True)
+    saved = 0
+    for page in range(1, 10):
+        response = requests.get(news_list_url(page))
+        with open(os.path.join(directory, f"list_{page}.html"), "wb") as file:
+            file.write(response.text.encode("utf-8"))
+        for news in get_news_list(page, fresh_only=False):
+            article = requests.get(news.naver_url)
+            with open(os.path.join(directory, f"article_{saved:04d}.html"), "wb") as file:
+                file.write(article.text.encode("utf-8"))
+            saved += 1
+            if saved >= count:
+                return saved
+    return saved
+
+
+def _list_item(news):
+    """리스트 항목 비교용 dict (파싱 시각인 listed_at 제외)"""
+    return {name: value for name, value in news.to_dict().items() if name != "listed_at"}
+
+
+def measure(func, pages):
+    start = time.perf_counter()
+    for page in pages:
+        func(page)
+    elapsed = time.perf_counter() - start
+    return len(pages) / elapsed if elapsed else float("inf")
+
+
+def run(articles, lists):
+    data = Article(naver_url="https://n.news.naver.com/mnews/article/001/0000000001", news_type="news")
+
+    # 필드별 결과 비교 (bs4는 기존처럼 디코딩된 문자열, lxml은 응답 bytes를 그대로 입력)
+    mismatches = 0
+    for index, page in enumerate(articles):
+        expected = parse_news_bs4(page.decode("utf-8"), data)
+        actual = parse_news(page, data, "utf-8")
+        if (expected is None) != (actual is None):
+            mismatches += 1
+            print(f"[error] article {index}: bs4={expected is not None}, lxml={actual is not None}")
+            continue
+        for field in ARTICLE_FIELDS if expected else ():
+            expected_value, actual_value = getattr(expected, field), getattr(actual, field)
+            if expected_value != actual_value:
+                mismatches += 1
+                print(f"[error] article {index} {field} 불일치: {expected_value!r:.80} != {actual_value!r:.80}")
+
+    for index, page in enumerate(lists):
+        for fresh_only in (True, False):
+            expected = [_list_item(news) for news in parse_news_list_bs4(page.decode("utf-8"), fresh_only)]
+            if expected != [_list_item(news) for news in parse_news_list(page, fresh_only, "utf-8")]:
+                mismatches += 1
+                print(f"[error] list {index} (fresh_only={fresh_only}) 결과 불일치")
+
+    print(f"[info] 기사 {len(articles)}개, 리스트 {len(lists)}개 비교: 불일치 {mismatches}건")
+
+    article_bs4 = measure(lambda page: parse_news_bs4(page.decode("utf-8"), data), articles)
+    article_lxml = measure(lambda page: parse_news(page, data, "utf-8"), articles)
+    print(f"[info] 기사 파싱: bs4 {article_bs4:.1f} pages/s → lxml {article_lxml:.1f} pages/s "
+          f"({article_lxml / article_bs4:.1f}배)")
+
+    if lists:
+        list_bs4 = measure(lambda page: parse_news_list_bs4(page.decode("utf-8"), False), lists)
+        list_lxml = measure(lambda page: parse_news_list(page, False, "utf-8"), lists)
+        print(f"[info] 리스트 파싱: bs4 {list_bs4:.1f} pages/s → lxml {list_lxml:.1f} pages/s "
+              f"({list_lxml / list_bs4:.1f}배)")
+    return mismatches
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--save" in args:
+        directory = args[args.index("--save") + 1]
+        print(f"[info] fixture {save_fixtures(directory, int(args[args.index('--save') + 2]))}개 저장 완료: {directory}")
+        sys.exit(0)
+
+    if "--fixtures" in args:
+        articles, lists = load_fixtures(args[args.index("--fixtures") + 1])
+    else:
+        rng = random.Random(0)
+        size = int(args[args.index("--synthetic") + 1]) if "--synthetic" in args else 200
+        articles = [synthetic_article(i, rng).encode("utf-8") for i in range(size)]
+        lists = [synthetic_list(page, rng).encode("utf-8") for page in range(max(1, size // 20))]
+
+    if not articles:
+        print("[error] 측정할 HTML이 없습니다.")
+        sys.exit(1)
+
+    sys.exit(1 if run(articles, lists) else 0)
@@ -0,0 +1,81 @@
+# 유사 기사 탐지 벤치마크: 수집된 기사 파일(news.json 등)을 순서대로 처리했을 때 절약되는 LLM 호출 수 측정
+# 사용법: python -m benchmarks.near_duplicates [기사 JSON 파일 ...] [--synthetic N]
+import sys
+import json
+import time
+import random
+from dedupe import NearDuplicateIndex
+from article import Article
+
+DEFAULT_FILES = ["./news.json", "./enter.json", "./sport.json"]
+CALLS_PER_ARTICLE = 4  # 요약, HS, FS, 판단 근거
+
+
+def load_corpus(paths):
+    corpus = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                corpus.extend(json.load(file))
+        except FileNotFoundError:
+            print(f"[warn] {path} 파일을 찾을 수 없습니다. 건너뜁니다.")
+    return corpus
+
+
+def synthetic_corpus(size, seed=0):
+    """통신사 기사를 여러 언론사가 조금씩 수정해 재게재하는 상황을 흉내 낸 기사 목록 (원문 1개당 평균 4개)"""
+    rng = random.Random(seed)
+    syllables = [chr(0xAC00 + i) for i in range(0, 11172, 7)]
+    words = ["".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(3000)]
+
+    def sentence():
+        return " ".join(rng.choice(words) for _ in range(rng.randint(8, 14)))
+
+    originals = [(" ".join(rng.sample(words, 5)), [sentence() for _ in range(15)]) for _ in range(max(1, size // 4))]
+
+    corpus = []
+    for _ in range(size):
+        title, sentences = rng.choice(originals)
+        sentences = list(sentences)
+        if rng.random() < 0.5:  # 문장 하나 수정
+            index = rng.randrange(len(sentences))
+            sentences[index] = " ".join(word for word in sentences[index].split() if rng.random() > 0.3)
+        if rng.random() < 0.3:  # 제목 변경
+            title = f"[{rng.choice(['속보', '종합', '단독'])}] " + title
+        byline = rng.choice(['연합뉴스', '뉴시스', '뉴스1'])
+        corpus.append({"title": title, "content": ". ".join(sentences) + f". ({byline})"})
+    return corpus
+
+
+def run(corpus):
+    index = NearDuplicateIndex()
+    dummy_analysis = Article()
+
+    start = time.perf_counter()
+    for news in corpus:
+        if index.find(news["title"], news["content"]) is None:
+            index.add(news["title"], news["content"], dummy_analysis)
+    elapsed = time.perf_counter() - start
+
+    stats = index.stats()
+    baseline = len(corpus) * CALLS_PER_ARTICLE
+    saved = stats["llm_calls_saved"]
+    print(f"[info] 기사 수: {len(corpus)}")
+    print(f"[info] 전체 재사용: {stats['full_reuses']}건, 부분 재사용(HS/근거만 재요청): {stats['partial_reuses']}건")
+    print(f"[info] LLM 호출: {baseline} → {baseline - saved} ({saved}회 절약, {saved / baseline * 100 if baseline else 0:.1f}%)")
+    print(f"[info] 탐지 비용: 기사당 {elapsed / max(1, len(corpus)) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if "--synthetic" in args:
+        size = int(args[args.index("--synthetic") + 1])
+        corpus = synthetic_corpus(size)
+    else:
+        corpus = load_corpus(args or DEFAULT_FILES)
+
+    if not corpus:
+        print("[error] 측정할 기사가 없습니다.")
+        sys.exit(1)
+
+    run(corpus)
@@ -0,0 +1,115 @@
+# 검색 지연 벤치마크: 같은 쿼리 집합을 인덱스별로 실행하여 클라이언트 왕복 시간/서버 처리 시간(took)의 p50/p95/p99와 평균 검색 결과 수 비교
+# --synthetic N이면 합성 한국어 기사 N개로 기본 동적 매핑 인덱스와 es_index template(한국어 분석기) 인덱스를 만들어 비교 후 삭제
+# 접속 정보는 db와 같은 ES_HOST/ES_PORT/ES_USE_SSL, --fake는 가짜 OpenSearch로 실행 (동작 확인용, 지연 수치는 의미 없음)
+# 사용법: python -m benchmarks.search_latency [--index news_index ...] [--synthetic N] [--queries 200] [--size 10] [--fake]
+import os
+import time
+import random
+import argparse
+from benchmarks.e2e import percentile
+from benchmarks.content_budget import synthetic_corpus
+
+SYNTHETIC_INDICES = {
+    "default": "search_bench_default",  # 매핑 없이 동적 매핑 (기존 news_index와 같은 방식)
+    "korean": "search_bench_korean",  # es_index template의 매핑/분석기
+}
+
+
+def create_synthetic(client, size, seed):
+    """합성 기사를 두 방식의 인덱스에 색인, 인덱스 이름 목록 반환"""
+    from opensearchpy.helpers import bulk
+    import es_index
+
+    template = es_index.index_template("search_bench")["template"]
+    corpus = synthetic_corpus(size, seed)
+    for kind, index in SYNTHETIC_INDICES.items():
+        if client.indices.exists(index=index):
+            client.indices.delete(index=index)
+        client.indices.create(index=index, body=template if kind == "korean" else {})
+        bulk(client, ({"_index": index, "_id": i, "_source": news} for i, news in enumerate(corpus)), chunk_size=500)
+        client.indices.refresh(index=index)
+    print(f"[info] 합성 기사 {size}건 색인 ({', '.join(SYNTHETIC_INDICES.values())})")
+    return list(SYNTHETIC_INDICES.values())
+
+
+def sample_queries(client, index, count, rng):
+    """인덱스에서 임의로 고른 기사의 제목/본문 앞부분 단어 1~2개로 검색어 생성"""
+    response = client.search(index=index, body={
+        "size": min(count, 500), "_source": ["title", "content"],
+        "query": {"function_score": {"query": {"match_all": {}}, "random_score": {"seed": rng.randint(0, 1 << 30)}}},
+    })
+    texts = [f"{hit['_source'].get('title', '')} {hit['_source'].get('content', '')[:200]}"
+             for hit in response["hits"]["hits"]]
+    words = [text.split() for text in texts if text.split()]
+    if not words:
+        raise RuntimeError(f"{index}에 검색어를 만들 문서가 없습니다.")
+    return [" ".join(rng.sample(choice, min(len(choice), rng.randint(1, 2)))) for choice in
+            (rng.choice(words) for _ in range(count))]
+
+
+def run(client, index, queries, size, warmup=10):
+    """쿼리별 (왕복 시간(ms), took(ms), 검색 결과 수)"""
+    def search(query):
+        return client.search(index=index, body={
+            "size": size,
+            "query": {"multi_match": {"query": query, "fields": ["title^2", "content"]}},
+        })
+
+    for query in queries[:warmup]:
+        search(query)
+
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        response = search(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        results.append((elapsed, response.get("took", 0), response["hits"]["total"]["value"]))
+    return results
+
+
+def report(index, results):
+    wall = [elapsed for elapsed, _, _ in results]
+    took = [took for _, took, _ in results]
+    hits = sum(total for _, _, total in results) / len(results)
+    print(f"[info] {index:<24} 왕복 p50={percentile(wall, 50):7.2f}ms p95={percentile(wall, 95):7.2f}ms "
+          f"p99={percentile(wall, 99):7.2f}ms | took p50={percentile(took, 50):5.1f}ms p99={percentile(took, 99):5.1f}ms "
+          f"| 평균 결과 {hits:.1f}건")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인덱스별 검색 지연 비교")
+    parser.add_argument("--index", nargs="*", help="비교할 인덱스/alias (기본 news_index와 그 버전들)")
+    parser.add_argument("--synthetic", type=int, help="합성 기사 N개로 기본 매핑/한국어 분석기 인덱스를 만들어 비교")
+    parser.add_argument("--queries", type=int, default=200, help="쿼리 수")
+    parser.add_argument("--size", type=int, default=10, help="쿼리당 반환 문서 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="합성 인덱스를 삭제하지 않음")
+    parser.add_argument("--fake", action="store_true", help="가짜 OpenSearch로 실행 (동작 확인용)")
+    args = parser.parse_args()
+
+    if args.fake:
+        from benchmarks import fake_opensearch
+        server, _ = fake_opensearch.start_server()
+        os.environ.update(ES_HOST="127.0.0.1", ES_PORT=str(server.server_port), ES_USE_SSL="false")
+        print("[warn] 가짜 OpenSearch로 실행합니다 (분석기/검색을 흉내내지 않으므로 지연 수치는 비교에 쓰지 마세요).")
+
+    import db
+    import es_index
+    client = db.es
+    rng = random.Random(args.seed)
+
+    if args.synthetic:
+        indices = create_synthetic(client, args.synthetic, args.seed)
+    else:
+        versions = [name for _, name in sorted(es_index.versions(client, db.ES_INDEX).items())]
+        indices = args.index or versions or [db.ES_INDEX]
+
+    queries = sample_queries(client, indices[0], args.queries, rng)
+    print(f"[info] 쿼리 {len(queries)}개 (예: {queries[:3]}), 인덱스 {indices}")
+    try:
+        for index in indices:
+            report(index, run(client, index, queries, args.size))
+    finally:
+        if args.synthetic and not args.keep:
+            for index in indices:
+                client.indices.delete(index=index)
@@ -0,0 +1,91 @@
+# 시작 시간 프로파일: 새 프로세스에서 `python -X importtime -c "import <모듈>"`을 반복 실행하여
+# 전체 import 시간, 패키지별 import 시간(상위 N개), import 직후 최대 RSS 측정
+# 사용법: python -m benchmarks.startup [--module app] [--runs 5] [--top 15] [--baseline <git 리비전>]
+# --baseline을 지정하면 해당 리비전의 트리를 임시 디렉터리에 풀어 같은 방식으로 측정하고 비교
+import os
+import sys
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+# 클라이언트를 import 시점에 만들던 이전 리비전도 측정할 수 있도록 더미 설정 사용 (네트워크 연결은 하지 않음)
+DUMMY_ENV = {
+    "OPENAI_API_KEY": "startup-benchmark",
+    "ES_HOST": "127.0.0.1",
+    "DATABASE_URL": f"sqlite:///{os.path.join(tempfile.gettempdir(), 'startup-benchmark.sqlite3')}",
+    "METRICS_PORT": "0",
+    "METRICS_LOG_INTERVAL": "0",
+}
+
+RSS_SNIPPET = "import resource, {module}; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력을 [(모듈, 자체 시간(us), 누적 시간(us), 깊이)]로 변환"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(module, cwd, runs):
+    """import 시간(ms), 패키지별 자체 시간 합계(ms), 최대 RSS(MB)의 중앙값"""
+    env = dict(os.environ, **DUMMY_ENV)
+    totals, rss, packages = [], [], {}
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                 cwd=cwd, env=env, capture_output=True, text=True)
+        if process.returncode != 0:
+            raise RuntimeError(f"import {module} 실패:\n{process.stderr[-2000:]}")
+        rows = parse_importtime(process.stderr)
+        totals.append(sum(self_us for _, self_us, _, _ in rows) / 1000)
+        for name, self_us, _, _ in rows:
+            packages.setdefault(name.split(".")[0], []).append(self_us / 1000)
+
+        process = subprocess.run([sys.executable, "-c", RSS_SNIPPET.format(module=module)],
+                                 cwd=cwd, env=env, capture_output=True, text=True)
+        rss.append(int(process.stdout.strip().splitlines()[-1]) / 1024)
+
+    by_package = {name: sum(values) / runs for name, values in packages.items()}
+    return statistics.median(totals), by_package, statistics.median(rss)
+
+
+def export_revision(revision, directory):
+    """git 리비전의 트리를 directory에 풀기 (nltk_data 등 데이터 포함)"""
+    archive = subprocess.run(["git", "archive", revision], capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+
+
+def report(label, total, by_package, rss, top):
+    print(f"\n[info] {label}: import {total:.1f}ms, 최대 RSS {rss:.1f}MB")
+    for name, elapsed in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"       {name:<24} {elapsed:8.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모듈 import 시간/메모리 프로파일")
+    parser.add_argument("--module", default="app", help="측정할 모듈 (기본 app)")
+    parser.add_argument("--runs", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 패키지 수")
+    parser.add_argument("--baseline", help="비교할 git 리비전 (예: HEAD~1)")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    total, by_package, rss = measure(args.module, root, args.runs)
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as directory:
+            export_revision(args.baseline, directory)
+            base_total, base_by_package, base_rss = measure(args.module, directory, args.runs)
+        report(f"{args.baseline}", base_total, base_by_package, base_rss, args.top)
+
+    report("현재 트리", total, by_package, rss, args.top)
+
+    if args.baseline:
+        print(f"\n[info] import {base_total:.1f}ms → {total:.1f}ms ({1 - total / base_total:.0%} 감소), "
+              f"최대 RSS {base_rss:.1f}MB → {rss:.1f}MB")
@@ -0,0 +1,33 @@
+# 디스크에 저장되는 체크포인트(JSON 상태 파일) 공용 유틸
+import os
+import json
+import threading
+
+_lock = threading.Lock()
+
+
+def load_state(path, default=None):
+    """JSON 상태 파일 로드, 파일이 없거나 깨져 있으면 default 반환"""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return default
+    except json.JSONDecodeError:
+        print(f"[warn] {path} 체크포인트가 손상되어 무시합니다.")
+        return default
+
+
+def save_state(path, state):
+    """임시 파일에 쓴 뒤 교체하여, 중간에 종료되어도 체크포인트가 깨지지 않도록 저장"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with _lock:
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, ensure_ascii=False, indent=2)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
@@ -0,0 +1,112 @@
+# 프롬프트 토큰 예산 단계. 본문이 예산을 넘으면 문장 경계(punkt)에서 잘라 요약/HS/FS/근거 4개 프롬프트의 입력 토큰을 줄임
+# TRIM_STRATEGY=lead: 앞부분 문장만 유지, lead_tail: 앞부분과 끝부분(결론) 문장을 함께 유지하고 사이를 "(중략)"으로 표시
+import os
+import re
+import math
+import threading
+from rate_limiter import LLM_CHARS_PER_TOKEN
+
+CONTENT_TOKEN_BUDGET = int(os.getenv("CONTENT_TOKEN_BUDGET", "1500"))  # 본문에 허용하는 토큰 수 (0이면 자르지 않음)
+TRIM_STRATEGY = os.getenv("TRIM_STRATEGY", "lead_tail")  # lead | lead_tail
+TRIM_TAIL_RATIO = float(os.getenv("TRIM_TAIL_RATIO", "0.25"))  # lead_tail에서 끝부분에 배정할 예산 비율
+
+GAP_MARKER = "(중략)"
+
+# 이미지에 포함된 nltk_data(punkt)를 우선 사용
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data")
+
+# punkt 데이터가 없을 때 사용하는 단순 문장 분리 (마침표/물음표/느낌표 뒤 공백)
+_FALLBACK_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+_stats = {"articles": 0, "trimmed": 0, "tokens_before": 0, "tokens_after": 0}
+_stats_lock = threading.Lock()
+
+
+def count_tokens(text):
+    """텍스트의 토큰 수 추정 (rate_limiter와 같은 글자 수 기준)"""
+    return math.ceil(len(text) / LLM_CHARS_PER_TOKEN)
+
+
+def _get_tokenizer():
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                import nltk  # 예산을 넘는 본문을 처음 자를 때 로드 (import 비용이 커서 시작 시 로드하지 않음)
+                if NLTK_DATA_DIR not in nltk.data.path:
+                    nltk.data.path.insert(0, NLTK_DATA_DIR)
+                try:
+                    # 한국어 모델이 없으므로 마침표 기반인 영어 punkt 모델 사용 (약어, 숫자 속 마침표 처리)
+                    _tokenizer = nltk.data.load("tokenizers/punkt/english.pickle")
+                except LookupError:
+                    print("[warn] punkt 데이터를 찾을 수 없어 단순 문장 분리를 사용합니다.")
+                    _tokenizer = False
+    return _tokenizer
+
+
+def split_sentences(text):
+    """본문을 (문장, 구분자) 리스트로 분리. 문단 끝 문장의 구분자는 줄바꿈"""
+    tokenizer = _get_tokenizer()
+    units = []
+    for paragraph in text.splitlines():
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        sentences = tokenizer.tokenize(paragraph) if tokenizer else _FALLBACK_SPLIT.split(paragraph)
+        units.extend((sentence, " ") for sentence in sentences[:-1])
+        units.append((sentences[-1], "\n"))
+    return units
+
+
+def _take(units, budget):
+    """앞에서부터 예산 안에 들어가는 문장 수"""
+    used = 0
+    for count, (sentence, separator) in enumerate(units):
+        used += count_tokens(sentence + separator)
+        if used > budget:
+            return count
+    return len(units)
+
+
+def trim_content(content, budget=CONTENT_TOKEN_BUDGET, strategy=TRIM_STRATEGY, tail_ratio=TRIM_TAIL_RATIO):
+    """본문이 budget 토큰을 넘으면 문장 단위로 잘라서 반환 (문장 중간은 자르지 않음)"""
+    if budget <= 0 or count_tokens(content) <= budget:
+        return content
+
+    units = split_sentences(content)
+    if strategy == "lead_tail":
+        tail_budget = int(budget * tail_ratio)
+        head = _take(units, budget - tail_budget - count_tokens(GAP_MARKER))
+        tail = _take(units[head:][::-1], tail_budget)
+        kept = units[:head]
+        if tail:
+            if kept:
+                kept[-1] = (kept[-1][0], "\n")
+            kept += [(GAP_MARKER, "\n")] + units[len(units) - tail:]
+    else:
+        kept = units[:_take(units, budget)]
+
+    if not kept:
+        # 첫 문장부터 예산을 넘는 경우에도 최소 한 문장은 유지
+        kept = units[:1]
+    return "".join(sentence + separator for sentence, separator in kept).strip()
+
+
+def fit_content(content):
+    """analyze_news에서 사용하는 본문 예산 적용 (절약된 토큰 수 집계)"""
+    trimmed = trim_content(content)
+    with _stats_lock:
+        _stats["articles"] += 1
+        _stats["tokens_before"] += count_tokens(content)
+        _stats["tokens_after"] += count_tokens(trimmed)
+        if trimmed is not content:
+            _stats["trimmed"] += 1
+    return trimmed
+
+
+def stats():
+    """잘라낸 기사 수와 프롬프트당 절약된 본문 토큰 수 (기사당 프롬프트 4개에 각각 적용됨)"""
+    with _stats_lock:
+        return dict(_stats, tokens_saved=_stats["tokens_before"] - _stats["tokens_after"])
@@ -2,11 +2,16 @@
 from dotenv import load_dotenv #for .env load
 import os
 import json
-import pymysql
+import time
+import threading
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, scoped_session
-from opensearchpy import OpenSearch
-from opensearchpy.helpers import bulk
+from checkpoint import load_state, save_state
+from article import Article
+from seen_index import mark_seen
+import metrics
+from score_probs import INSERT_SCORE_PROBS_SQL, score_probs_row, ensure_score_probs_table
+from news_writer import NewsBatchWriter, NEWS_INSERT_SQL, NEWS_CONTENT_INSERT_SQL, to_news_row
+from work_queue import WorkQueue
 
 load_dotenv()
 # 환경 변수 설정, 정보 없다면 local DB로 연결
@@ -16,31 +21,22 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 DB_NAME = os.getenv("DB_NAME")
 
-DATABASE_URL = (
+# DATABASE_URL을 직접 지정하면 그 DB 사용 (벤치마크의 SQLite 등)
+DATABASE_URL = os.getenv("DATABASE_URL") or (
     f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     "?ssl_verify_cert=false"
 )
 
-# scoped_session을 활용하여 각 스레드에서 독립적인 세션을 제공
-engine = create_engine(
-    DATABASE_URL,
-    echo=False, # 쿼리 출력 x
-    pool_size=5, # 현재는 thread를 5개 구성할 예정이므로 5개의 connection pool 유지
-    pool_timeout=30, #연결 시간 초과 제한
-    pool_pre_ping=True # DB 연결이 끊어졌는 지 주기적으로 확인
-)
-SessionLocal = scoped_session(sessionmaker(bind=engine, autocommit=False, autoflush=False))
-
 # Elasticsearch 설정
 ES_HOST = os.getenv("ES_HOST")
+ES_PORT = int(os.getenv("ES_PORT", "443"))
+ES_USE_SSL = os.getenv("ES_USE_SSL", "true").lower() == "true"  # 로컬 OpenSearch(벤치마크 등)는 false
 
-es = OpenSearch(
-    hosts=[{"host": ES_HOST, "port": 443}],
-    use_ssl=True,
-    verify_certs=True
-)
+ES_INDEX = "news_index"  # 버전별 인덱스(news_index_v1, ...)를 가리키는 alias, 관리는 es_index 모듈
 
-ES_INDEX = "news_index"
+# 배치 writer 설정 (배치 크기, 최대 대기 시간(초))
+WRITER_BATCH_SIZE = int(os.getenv("WRITER_BATCH_SIZE", "50"))
+WRITER_FLUSH_INTERVAL = float(os.getenv("WRITER_FLUSH_INTERVAL", "2"))
 
 
 def check_db_connection():
@@ -48,9 +44,11 @@ def check_db_connection():
     print("[info] 데이터베이스 연결 확인 중...")
 
     try:
+        engine = get_client("engine")
         with engine.connect() as connection:
             connection.execute(text("SELECT 1"))  # 간단한 쿼리 실행하여 연결 확인
             print("[info] DB 연결 성공!")
+        ensure_score_probs_table(engine)  # 점수 확률 분포 테이블 준비
     except Exception as e:
         print(f"[error] DB 연결 실패: {e}")
         exit(1)  # 연결 실패 시 프로그램 종료
@@ -61,8 +59,9 @@ def check_elasticsearch_connection():
     print("[info] Elasticsearch 연결 확인 중...")
 
     try:
-        if es.ping():
+        if get_client("es").ping():
             print("[info] Elasticsearch 연결 성공!")
+            ensure_news_index()
         else:
             print("[error] Elasticsearch 연결 실패!")
             exit(1)
@@ -74,118 +73,220 @@ def check_elasticsearch_connection():
 # 뉴스 데이터를 DB에 삽입하는 함수, sqlalchemy은 기본적으로 ORM 라이브러리이지만, 해당 모듈에서는 단순히 news 데이터를 insert하는 동작만 담당하기에, Raw SQL로 사용
 def save_news(news_data):
     """
-    뉴스 데이터를 news 및 news_content 테이블에 저장
+    뉴스 데이터를 news 및 news_content 테이블에 저장, 저장된 news_id 반환 (중복 시 None).
+    저장에 실패하면 rollback 후 예외를 그대로 올림 (호출한 쪽에서 실패한 뉴스를 다시 처리할 수 있도록)
     """
+    SessionLocal = get_client("SessionLocal")
     db = SessionLocal()
+    start = time.perf_counter()
 
     try:
         # 기존 뉴스 ID 조회 (이미 존재하면 저장 안 함)
         news_id_query = text("""
             SELECT news_id FROM news WHERE url = :url
         """)
-        result = db.execute(news_id_query, {"url": news_data["url"]}).fetchone()
+        result = db.execute(news_id_query, {"url": news_data.url}).fetchone()
 
         if result:
-            print(f"[INFO] 이미 존재하는 뉴스: {news_data['url']} - 저장하지 않음.")
-            return  # 이미 존재하면 아무 동작도 하지 않음
+            print(f"[INFO] 이미 존재하는 뉴스: {news_data.url} - 저장하지 않음.")
+            mark_seen(news_data)
+            return None  # 이미 존재하면 아무 동작도 하지 않음
 
         # news 테이블 삽입
-        news_sql = text("""
-            INSERT INTO news (
-                url, naver_url, title, summary, image_url, media_name,
-                category, headline_score, fact_score,
-                headline_score_reason, fact_score_reason,
-                like_count, hate_count, comment_count, view_count,
-                rating_count, total_rating_sum
-            ) VALUES (
-                :url, :naver_url, :title, :summary, :image_url, :media_name,
-                :category, :headline_score, :fact_score,
-                :headline_score_reason, :fact_score_reason,
-                :like_count, :hate_count, :comment_count, :view_count,
-                :rating_count, :total_rating_sum
-            )
-        """)
-
-        # news 테이블 데이터
-        news_values = {
-            "url": news_data["url"],
-            "naver_url": news_data["naverUrl"],
-            "title": news_data["title"],
-            "summary": news_data["summary"],
-            "image_url": news_data["image_url"],
-            "media_name": news_data["mediaName"],
-            "category": news_data["category"],
-            "headline_score": news_data["headline_score"],
-            "fact_score": news_data["fact_score"],
-            "headline_score_reason": news_data["hs_reason"],
-            "fact_score_reason": news_data["fs_reason"],
-            "like_count": news_data.get("like_count", 0),
-            "hate_count": news_data.get("hate_count", 0),
-            "comment_count": news_data.get("comment_count", 0),
-            "view_count": news_data.get("view_count", 0),
-            "rating_count": news_data.get("rating_count", 0),
-            "total_rating_sum": news_data.get("total_rating_sum", 0)
-        }
-
-        # SQL 실행
-        result = db.execute(news_sql, news_values)
+        result = db.execute(NEWS_INSERT_SQL, to_news_row(news_data))
         news_id = result.lastrowid  # 삽입된 news_id 가져오기
 
         # news_content 테이블 삽입
-        news_content_sql = text("""
-            INSERT INTO news_content (news_id, content) 
-            VALUES (:news_id, :content)
-        """)
-
-        news_content_values = {
-            "news_id": news_id,
-            "content": news_data["content"]
-        }
+        db.execute(NEWS_CONTENT_INSERT_SQL, {"news_id": news_id, "content": news_data.content})
 
-        # SQL 실행
-        db.execute(news_content_sql, news_content_values)
+        # news_score_probs 테이블 삽입 (점수 공식 변경 시 LLM 호출 없이 재채점하기 위함)
+        db.execute(INSERT_SCORE_PROBS_SQL, score_probs_row(news_id, news_data))
         db.commit()
+        metrics.db_write_seconds.observe(time.perf_counter() - start, mode="single")
 
         print(f"[info] 뉴스 저장 완료 (news_id={news_id})")
+        mark_seen(news_data)  # 이후 재등장 시 본문 수집/분석을 건너뛰도록 기록
 
-        # Elasticsearch에 저장
-        es.index(index=ES_INDEX, id=news_id, body={
-            "title": news_data["title"],
-            "content": news_data["content"]
+        # Elasticsearch 색인 버퍼에 추가 (bulk로 색인)
+        get_client("es_indexer").add(news_id, {
+            "title": news_data.title,
+            "content": news_data.content
         })
 
-        print(f"[info] Elasticsearch에 저장 완료 (news_id={news_id})")
+        return news_id
     except Exception as e:
         db.rollback()
+        metrics.db_write_errors.inc(mode="single")
         print(f"[error] 데이터 삽입 오류: {e}")
+        raise
     finally:
         db.close()
         SessionLocal.remove()
 
+
+def on_news_saved(news_id, news_data):
+    """배치 writer가 뉴스를 저장한 뒤 호출하는 후처리 (seen 인덱스 기록, Elasticsearch 색인 버퍼에 추가)"""
+    mark_seen(news_data)
+
+    get_client("es_indexer").add(news_id, {
+        "title": news_data.title,
+        "content": news_data.content
+    })
+
+
+# 여러 replica가 공유하는 작업 큐의 DB (지정하지 않으면 뉴스 DB 사용, 테스트용 SQLite 등)
+WORK_QUEUE_URL = os.getenv("WORK_QUEUE_URL")
+
+
+def _create_engine():
+    # scoped_session을 활용하여 각 스레드에서 독립적인 세션을 제공
+    return create_engine(
+        DATABASE_URL,
+        echo=False, # 쿼리 출력 x
+        pool_size=5, # 현재는 thread를 5개 구성할 예정이므로 5개의 connection pool 유지
+        pool_timeout=30, #연결 시간 초과 제한
+        pool_pre_ping=True # DB 연결이 끊어졌는 지 주기적으로 확인
+    )
+
+
+def _create_session_factory():
+    from sqlalchemy.orm import sessionmaker, scoped_session
+    return scoped_session(sessionmaker(bind=get_client("engine"), autocommit=False, autoflush=False))
+
+
+def _create_es():
+    from opensearchpy import OpenSearch
+    return OpenSearch(
+        hosts=[{"host": ES_HOST, "port": ES_PORT}],
+        use_ssl=ES_USE_SSL,
+        verify_certs=ES_USE_SSL
+    )
+
+
+def _create_es_indexer():
+    # worker가 색인 응답을 기다리지 않도록 문서를 모아서 bulk 색인
+    from es_indexer import BulkIndexer
+    return BulkIndexer(
+        get_client("es"), ES_INDEX,
+        batch_size=int(os.getenv("ES_BULK_SIZE", "200")),
+        flush_interval=float(os.getenv("ES_FLUSH_INTERVAL", "1"))
+    )
+
+
+def _create_news_writer():
+    # 분석이 끝난 뉴스를 모아서 저장하는 배치 writer (app에서 start() 후 사용)
+    return NewsBatchWriter(get_client("engine"), WRITER_BATCH_SIZE, WRITER_FLUSH_INTERVAL, on_saved=on_news_saved)
+
+
+def _create_work_queue():
+    # 여러 replica가 공유하는 작업 큐 (CRAWL_MODE=shared에서 start() 후 사용)
+    return WorkQueue(create_engine(WORK_QUEUE_URL, pool_pre_ping=True) if WORK_QUEUE_URL else get_client("engine"))
+
+
+# 클라이언트는 처음 사용할 때 생성 (import만 하는 스크립트나 일부 클라이언트만 쓰는 모드의 시작 시간 단축)
+_CLIENT_FACTORIES = {
+    "engine": _create_engine,
+    "SessionLocal": _create_session_factory,
+    "es": _create_es,
+    "es_indexer": _create_es_indexer,
+    "news_writer": _create_news_writer,
+    "work_queue": _create_work_queue,
+}
+_clients_lock = threading.RLock()
+
+
+def get_client(name):
+    """이름에 해당하는 클라이언트 반환 (없으면 생성하여 모듈 속성으로 저장)"""
+    client = globals().get(name)
+    if client is None:
+        with _clients_lock:
+            client = globals().get(name)
+            if client is None:
+                client = globals()[name] = _CLIENT_FACTORIES[name]()
+    return client
+
+
+def close_clients():
+    """생성된 writer/indexer만 종료 (배치 writer에 남은 뉴스를 저장한 뒤 남은 문서 색인, 종료 시 새로 만들지 않음)"""
+    for name in ("news_writer", "es_indexer"):
+        client = globals().get(name)
+        if client is not None:
+            client.close()
+
+
+def __getattr__(name):
+    """db.engine, from db import es_indexer 등 모듈 속성으로 접근하면 그때 생성"""
+    if name in _CLIENT_FACTORIES:
+        return get_client(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def iter_saved_urls(after_id=0, batch_size=10000):
+    """
+    저장된 뉴스의 (news_id, url, naver_url)을 news_id 순으로 조회 (seen 인덱스 워밍용)
+    """
+    query = text("""
+        SELECT news_id, url, naver_url FROM news
+        WHERE news_id > :after_id
+        ORDER BY news_id
+        LIMIT :limit
+    """)
+
+    with get_client("engine").connect() as connection:
+        while True:
+            rows = connection.execute(query, {"after_id": after_id, "limit": batch_size}).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                yield row[0], row[1], row[2]
+            after_id = rows[-1][0]
+
 # mysql의 data들을 엘라스틱 서치로 동기화
-def sync_mysql_to_elasticsearch():
+SYNC_CHECKPOINT_PATH = os.getenv("SYNC_CHECKPOINT_PATH", "./checkpoints/es_sync.json")
+
+SYNC_PAGE_SQL = text("""
+    SELECT n.news_id, n.title, nc.content
+    FROM news n
+    JOIN news_content nc ON n.news_id = nc.news_id
+    WHERE n.news_id > :last_id
+    ORDER BY n.news_id
+    LIMIT :limit
+""")
+
+
+def iter_news_pages(last_id=0, page_size=500):
+    """news_id 기준 keyset pagination으로 뉴스 본문을 페이지 단위로 조회 (전체를 메모리에 올리지 않음)"""
+    while True:
+        with get_client("engine").connect() as connection:
+            rows = connection.execute(SYNC_PAGE_SQL, {"last_id": last_id, "limit": page_size}).mappings().all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]["news_id"]
+
+
+def sync_mysql_to_elasticsearch(incremental=False, page_size=500):
     """
-    MySQL에 저장된 뉴스 데이터를 Elasticsearch와 동기화
+    MySQL에 저장된 뉴스 데이터를 Elasticsearch와 동기화.
+    페이지 단위로 streaming_bulk에 전달하고 체크포인트를 저장하여, 실패 시 마지막 위치부터 재개.
+    incremental=True면 마지막으로 동기화한 news_id 이후의 뉴스만 동기화.
     """
-    db = SessionLocal()
+    from opensearchpy.helpers import streaming_bulk
 
-    try:
-        # MySQL에서 뉴스 데이터 조회
-        query = text("""
-            SELECT n.news_id, n.title, nc.content
-            FROM news n
-            JOIN news_content nc ON n.news_id = nc.news_id
-        """)
-        result = db.execute(query)
-        news_data = [dict(row) for row in result.mappings().all()]
+    state = load_state(SYNC_CHECKPOINT_PATH, {"last_id": 0, "completed": True})
 
-        if not news_data:
-            print("[info] 동기화할 데이터가 없습니다.")
-            return
-        
-        # Elasticsearch에 배치 삽입 (Bulk API 사용)
-        def generate_bulk_data():
-            for row in news_data:
+    # 이전 전체 동기화가 중간에 실패했다면 이어서 진행, 아니면 처음부터
+    if not incremental and state["completed"]:
+        state = {"last_id": 0, "completed": False}
+    start_id = state["last_id"]
+    print(f"[info] MySQL → Elasticsearch 동기화 시작 (news_id > {start_id})")
+
+    synced_count = 0
+    failed = False
+
+    def generate_bulk_data():
+        for rows in iter_news_pages(start_id, page_size):
+            for row in rows:
                 yield {
                     "_index": ES_INDEX,
                     "_id": row["news_id"],
@@ -195,17 +296,50 @@ def sync_mysql_to_elasticsearch():
                     }
                 }
 
-        bulk(es, generate_bulk_data())
+    try:
+        # 결과는 요청 순서대로 반환되므로, 실패가 없는 구간까지만 체크포인트를 전진
+        for ok, item in streaming_bulk(get_client("es"), generate_bulk_data(), chunk_size=page_size,
+                                       max_retries=3, raise_on_error=False):
+            result = next(iter(item.values()))
+            if not ok:
+                failed = True
+                print(f"[error] Elasticsearch 색인 실패 (news_id={result.get('_id')}): {result.get('error')}")
+                continue
+            if failed:
+                continue
+
+            state["last_id"] = int(result["_id"])
+            synced_count += 1
+            if synced_count % page_size == 0:
+                save_state(SYNC_CHECKPOINT_PATH, state)
+
+        state["completed"] = not failed
+        save_state(SYNC_CHECKPOINT_PATH, state)
+
+        if synced_count == 0 and not failed:
+            print("[info] 동기화할 데이터가 없습니다.")
+            return
+        
+        if failed:
+            print(f"[warn] 일부 뉴스 색인 실패, 다음 실행 시 news_id={state['last_id']} 이후부터 재개합니다.")
+            return
 
-        print(f"[info] MySQL → Elasticsearch 동기화 완료! ({len(news_data)}건)")
+        print(f"[info] MySQL → Elasticsearch 동기화 완료! ({synced_count}건, 마지막 news_id={state['last_id']})")
     except Exception as e:
-        print(f"[error] Elasticsearch 동기화 오류: {e}")
-    finally:
-        db.close()
-        SessionLocal.remove()
+        save_state(SYNC_CHECKPOINT_PATH, state)
+        print(f"[error] Elasticsearch 동기화 오류: {e} (news_id={state['last_id']}부터 재개 가능)")
+
 
+def ensure_news_index():
+    """뉴스 인덱스 template 등록, alias가 없으면 첫 버전 인덱스 생성"""
+    import es_index
+    return es_index.ensure_index(get_client("es"), ES_INDEX)
 
 
+def reindex_news_index(page_size=500):
+    """MySQL의 뉴스로 새 버전 인덱스를 만들고 alias 교체 (매핑/분석기 변경 후 실행)"""
+    import es_index
+    return es_index.reindex(get_client("es"), ES_INDEX, lambda after_id: iter_news_pages(after_id, page_size), page_size)
 
 
 # 테스트
@@ -224,7 +358,7 @@ if __name__ == "__main__":
                 print("[error] 분석된 뉴스 데이터가 없습니다.")
                 exit(1)  # 프로그램 종료
 
-            news = news_list[0]  # 테스트를 위해 첫 번째 뉴스만 삽입
+            news = Article.from_dict(news_list[0])  # 테스트를 위해 첫 번째 뉴스만 삽입
     except FileNotFoundError:
         print(f"[error] {input_file} 파일을 찾을 수 없습니다. 건너뜁니다.")
         exit(1)
@@ -234,5 +368,5 @@ if __name__ == "__main__":
 
     save_news(news)  # 뉴스 저장 실행
 
-    # 3. MySQL → Elasticsearch 전체 동기화 실행
-    # sync_mysql_to_elasticsearch()
+    # 3. MySQL → Elasticsearch 동기화 실행 (incremental=True면 마지막 동기화 이후 뉴스만)
+    # sync_mysql_to_elasticsearch(incremental=True)
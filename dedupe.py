@@ -0,0 +1,137 @@
+# 유사 기사(near-duplicate) 탐지. 통신사 기사가 여러 언론사에서 조금씩 수정되어 재게재되는 경우,
+# 이미 분석한 대표 기사의 결과를 재사용하여 LLM 호출을 줄임 (SimHash + band 인덱스)
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+
+NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "true").lower() == "true"
+NEAR_DUP_THRESHOLD = int(os.getenv("NEAR_DUP_THRESHOLD", "6"))  # 같은 기사로 볼 최대 해밍 거리 (64비트 중)
+NEAR_DUP_WINDOW = int(os.getenv("NEAR_DUP_WINDOW", "5000"))  # 최근 몇 개의 기사 서명을 유지할지
+
+SHINGLE_SIZE = 3  # 글자 단위 3-gram
+MIN_CONTENT_LENGTH = 200  # 너무 짧은 본문은 서명이 불안정하므로 제외
+BANDS = 8  # 64비트를 8비트 8개 구간으로 나눔 (해밍 거리 7 이하면 최소 한 구간은 일치)
+BAND_BITS = 64 // BANDS
+
+# 본문 기반 결과 (제목이 달라도 재사용)
+CONTENT_FIELDS = ("summary", "category", "fact_score", "fact_score_origin", "fact_score_probs")
+# 제목 기반 결과 (제목까지 같은 경우에만 재사용)
+TITLE_FIELDS = ("headline_score", "headline_score_origin", "headline_score_probs", "hs_reason", "fs_reason")
+
+_normalize_pattern = re.compile(r"[\s\W_]+", re.UNICODE)
+
+
+def normalize(text):
+    """공백/기호 제거"""
+    return _normalize_pattern.sub("", text)
+
+
+def _hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text):
+    """공백/기호를 제거한 글자 3-gram으로 64비트 SimHash 계산"""
+    text = normalize(text)
+    weights = [0] * 64
+
+    shingles = {}
+    for i in range(max(1, len(text) - SHINGLE_SIZE + 1)):
+        shingle = text[i:i + SHINGLE_SIZE]
+        shingles[shingle] = shingles.get(shingle, 0) + 1
+
+    for shingle, count in shingles.items():
+        hashed = _hash64(shingle)
+        for bit in range(64):
+            weights[bit] += count if hashed >> bit & 1 else -count
+
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _bands(signature):
+    return [(i, signature >> (i * BAND_BITS) & ((1 << BAND_BITS) - 1)) for i in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """최근 기사 본문 서명을 유지하며, 유사한 대표 기사의 분석 결과를 찾아주는 인덱스"""
+
+    def __init__(self, threshold=NEAR_DUP_THRESHOLD, window=NEAR_DUP_WINDOW):
+        if threshold >= BANDS:
+            raise ValueError(f"threshold는 {BANDS}보다 작아야 합니다.")
+        self.threshold = threshold
+        self.window = window
+        self._entries = OrderedDict()  # signature -> (정규화된 제목, 분석 결과), 오래된 순
+        self._buckets = {}  # (band 번호, band 값) -> signature 집합
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.full_reuses = 0
+        self.partial_reuses = 0
+
+    def find(self, title, content):
+        """유사한 대표 기사가 있으면 (분석 결과, 제목도 같은지) 반환, 없으면 None"""
+        if len(content) < MIN_CONTENT_LENGTH:
+            return None
+
+        signature = simhash(content)
+        with self._lock:
+            self.lookups += 1
+            candidates = set()
+            for band in _bands(signature):
+                candidates |= self._buckets.get(band, set())
+
+            best = min(candidates, key=lambda candidate: hamming(candidate, signature), default=None)
+            if best is None or hamming(best, signature) > self.threshold:
+                return None
+
+            normalized_title, analysis = self._entries[best]
+            self._entries.move_to_end(best)
+            # 제목 점수는 제목 표현에 따라 달라지므로, 제목은 기호/공백 외에 같을 때만 같은 것으로 봄
+            same_title = normalized_title == normalize(title)
+            if same_title:
+                self.full_reuses += 1
+            else:
+                self.partial_reuses += 1
+            return analysis, same_title
+
+    def add(self, title, content, news_data):
+        """분석이 끝난 기사를 대표 기사로 등록"""
+        if len(content) < MIN_CONTENT_LENGTH:
+            return
+
+        signature = simhash(content)
+        analysis = {field: getattr(news_data, field) for field in CONTENT_FIELDS + TITLE_FIELDS}
+        with self._lock:
+            if signature not in self._entries:
+                for band in _bands(signature):
+                    self._buckets.setdefault(band, set()).add(signature)
+            self._entries[signature] = (normalize(title), analysis)
+            self._entries.move_to_end(signature)
+
+            # 오래된 서명부터 제거
+            while len(self._entries) > self.window:
+                old_signature, _ = self._entries.popitem(last=False)
+                for band in _bands(old_signature):
+                    bucket = self._buckets.get(band)
+                    if bucket is not None:
+                        bucket.discard(old_signature)
+                        if not bucket:
+                            del self._buckets[band]
+
+    def stats(self):
+        """재사용 통계 (전체 재사용은 LLM 호출 4번, 부분 재사용은 2번 절약)"""
+        return {
+            "lookups": self.lookups,
+            "full_reuses": self.full_reuses,
+            "partial_reuses": self.partial_reuses,
+            "llm_calls_saved": self.full_reuses * 4 + self.partial_reuses * 2,
+            "signatures": len(self._entries),
+        }
+
+
+near_duplicates = NearDuplicateIndex()
@@ -0,0 +1,173 @@
+# 디스크에 기록되는 뉴스 처리 큐 (SQLite WAL). 큐에 들어온 뉴스와 단계별 결과(본문 수집, 분석)를 저장하여
+# pod 재시작/OOM 후에도 마지막으로 끝난 단계부터 이어서 처리 (이미 수집/분석한 기사를 다시 수집/분석하지 않음)
+import os
+import json
+import time
+import queue
+import sqlite3
+import threading
+import metrics
+from article import Article
+
+DURABLE_QUEUE_ENABLED = os.getenv("DURABLE_QUEUE_ENABLED", "false").lower() == "true"
+DURABLE_QUEUE_PATH = os.getenv("DURABLE_QUEUE_PATH", "./checkpoints/news_queue.sqlite3")
+DURABLE_QUEUE_RETENTION = int(os.getenv("DURABLE_QUEUE_RETENTION", "3600"))  # 초, 끝난 항목을 compaction 전까지 보관
+DURABLE_QUEUE_MAX_ATTEMPTS = int(os.getenv("DURABLE_QUEUE_MAX_ATTEMPTS", "3"))  # 재시작 후 이어서 처리할 최대 횟수
+
+COMPACT_EVERY = 1000  # 항목 N개가 끝날 때마다 compaction
+
+# 단계: listed(큐에 들어옴) → fetched(본문 수집) → analyzed(분석) → saved(저장)
+# 처리하지 않고 끝난 항목은 dropped(이미 저장됨, 수집 실패), 재시도 횟수를 넘긴 항목은 failed
+PENDING_STAGES = ("listed", "fetched", "analyzed")
+FINISHED_STAGES = ("saved", "dropped", "failed")
+
+
+class StageJournal:
+    """기사(네이버 URL)별로 마지막으로 끝난 단계와 그 단계의 결과를 저장하는 SQLite 테이블"""
+
+    def __init__(self, path, retention=DURABLE_QUEUE_RETENTION, max_attempts=DURABLE_QUEUE_MAX_ATTEMPTS):
+        self.path = path
+        self.retention = retention
+        self.max_attempts = max_attempts
+        self._finished = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")  # 프로세스 종료에는 안전, 커밋마다 fsync하지 않음
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS stage_items (
+                    item_key TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    payload TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_stage_items_stage ON stage_items (stage, updated_at)")
+        return self._conn
+
+    def record(self, news):
+        """큐에 들어온 뉴스 기록. 이미 처리 중이거나 저장된 뉴스면 False (수집 실패 등으로 끝난 뉴스는 다시 기록)"""
+        with self._lock:
+            cursor = self._connect().execute("""
+                INSERT INTO stage_items (item_key, stage, payload, attempts, updated_at) VALUES (?, 'listed', ?, 0, ?)
+                ON CONFLICT (item_key) DO UPDATE SET
+                    stage = 'listed', payload = excluded.payload, attempts = 0, updated_at = excluded.updated_at
+                WHERE stage IN ('dropped', 'failed')
+            """, (news.naver_url, json.dumps(news.to_dict(), ensure_ascii=False), time.time()))
+            return cursor.rowcount == 1
+
+    def checkpoint(self, news_data, stage):
+        """단계 결과 저장 (재시작 시 이 결과로 다음 단계부터 처리)"""
+        with self._lock:
+            self._connect().execute(
+                "UPDATE stage_items SET stage = ?, payload = ?, updated_at = ? WHERE item_key = ?",
+                (stage, json.dumps(news_data.to_dict(), ensure_ascii=False), time.time(), news_data.naver_url)
+            )
+
+    def finish(self, naver_url, stage="saved"):
+        """처리가 끝난 항목은 결과를 지우고 단계만 남김 (compaction 때 삭제)"""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE stage_items SET stage = ?, payload = NULL, updated_at = ? WHERE item_key = ?",
+                         (stage, time.time(), naver_url))
+            self._finished += 1
+            if self._finished % COMPACT_EVERY == 0:
+                self._compact(conn)
+
+    def stage_of(self, news):
+        """뉴스의 현재 단계 (기록이 없으면 None)"""
+        with self._lock:
+            row = self._connect().execute("SELECT stage FROM stage_items WHERE item_key = ?",
+                                          (news.naver_url,)).fetchone()
+        return row[0] if row else None
+
+    def recover(self):
+        """
+        이전 실행에서 끝나지 않은 항목을 [(단계, 기사)]로 반환 (이미 비용을 들인 analyzed, fetched, listed 순).
+        재시작할 때마다 시도 횟수를 늘리고, max_attempts를 넘긴 항목은 failed 처리.
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"""
+                    UPDATE stage_items SET stage = 'failed', payload = NULL, updated_at = ?
+                    WHERE stage IN {PENDING_STAGES} AND attempts >= ?
+                """, (time.time(), self.max_attempts))
+                conn.execute(f"UPDATE stage_items SET attempts = attempts + 1 WHERE stage IN {PENDING_STAGES}")
+                rows = conn.execute(f"""
+                    SELECT stage, payload FROM stage_items WHERE stage IN {PENDING_STAGES} ORDER BY updated_at
+                """).fetchall()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        order = {stage: index for index, stage in enumerate(reversed(PENDING_STAGES))}
+        return sorted(((stage, Article.from_dict(json.loads(payload))) for stage, payload in rows), key=lambda row: order[row[0]])
+
+    def _compact(self, conn):
+        """보관 기간이 지난 끝난 항목을 삭제하고 WAL 파일을 비움"""
+        deleted = conn.execute(f"DELETE FROM stage_items WHERE stage IN {FINISHED_STAGES} AND updated_at < ?",
+                               (time.time() - self.retention,)).rowcount
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    def compact(self):
+        """끝난 항목 정리, 삭제한 항목 수 반환"""
+        with self._lock:
+            deleted = self._compact(self._connect())
+            self._connect().execute("VACUUM")
+        return deleted
+
+    def depths(self):
+        """단계별 항목 수"""
+        with self._lock:
+            rows = self._connect().execute("SELECT stage, COUNT(*) FROM stage_items GROUP BY stage").fetchall()
+        counts = dict.fromkeys(PENDING_STAGES + FINISHED_STAGES, 0)
+        counts.update(rows)
+        return counts
+
+
+class DurableQueue:
+    """
+    queue.Queue처럼 사용하는 처리 큐. put()한 뉴스는 journal에 기록한 뒤 메모리 큐(inner)에 전달.
+    뉴스가 아닌 항목(종료 신호 등)은 기록하지 않고 그대로 전달.
+    """
+
+    def __init__(self, journal, inner=None):
+        self.journal = journal
+        self.inner = inner if inner is not None else queue.Queue()
+
+    def put(self, item):
+        if isinstance(item, Article) and not self.journal.record(item):
+            return  # 이미 큐에 있거나 처리가 끝난 뉴스
+        self.inner.put(item)
+
+    def get(self):
+        return self.inner.get()
+
+    def task_done(self):
+        self.inner.task_done()
+
+    def join(self):
+        self.inner.join()
+
+    def qsize(self):
+        return self.inner.qsize()
+
+
+stage_journal = StageJournal(DURABLE_QUEUE_PATH)
+
+durable_queue_depth = metrics.Gauge("durable_queue_depth", "디스크 큐의 단계별 항목 수", ["stage"])
+if DURABLE_QUEUE_ENABLED:
+    for _stage in PENDING_STAGES:
+        durable_queue_depth.set_function(lambda stage=_stage: stage_journal.depths()[stage], stage=_stage)
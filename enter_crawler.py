@@ -1,8 +1,9 @@
 # 네이버 엔터 크롤러
+import os
 import requests
-from bs4 import BeautifulSoup
 import datetime, json, random
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from article import Article
 
 useragent_list = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -18,50 +19,72 @@ header = {
   "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
 }
 
-# 네이버 엔터 기사사 리스트 가져오기
-def get_enter_list(page):
+# 벤치마크 등에서 로컬 재현 서버로 바꿀 수 있도록 API 호스트를 환경 변수로 지정
+ENTER_API_BASE = os.getenv("NAVER_ENTER_API_BASE", "https://api-gw.entertain.naver.com")
+ENTER_LIST_URL = ENTER_API_BASE + '/news/articles?date={date}&page={page}&pageSize=50'
+ENTER_ARTICLE_PREFIX = 'https://m.entertain.naver.com/now/article/'
+ENTER_API_ARTICLE_PREFIX = ENTER_API_BASE + '/news/article/'
+
+# 네이버 엔터 기사 리스트 URL 생성
+def enter_list_url(page):
   today = datetime.datetime.now().strftime("%Y%m%d")
+  return ENTER_LIST_URL.format(date=today, page=page)
 
-  url = f'https://api-gw.entertain.naver.com/news/articles?date={today}&page={page}&pageSize=50'
-  response = requests.get(url, headers=header)
-  json_data = response.json()
+# 네이버 엔터 기사 API URL 생성
+def enter_article_url(data):
+  return data.naver_url.replace(ENTER_ARTICLE_PREFIX, ENTER_API_ARTICLE_PREFIX)
+
+# 네이버 엔터 기사 리스트 JSON 파싱 (동기/비동기 크롤러 공용), fresh_only=False면 시간 조건 없이 페이지 전체 반환
+def parse_enter_list(json_data, fresh_only=True):
   enter_list = json_data['result']['newsList']
   
   result = []
   for enter in enter_list:
-    if enter['articleTime'] == '방금전':
+    if not fresh_only or enter['articleTime'] == '방금전':
       pass
     else:
       time = int(enter['articleTime'].replace('"', '').replace('분전', ''))
       if time >= 2: # 2분 이상 지난 뉴스는 크롤링하지 않음
         break
-    result.append({
-      'naverUrl': enter['url'],
-      "image_url": enter['image'],
-      "mediaName": enter['officeName'],
-      "news_type": "enter",
-    })
+    result.append(Article.listed(
+      naver_url=enter['url'],
+      image_url=enter['image'],
+      media_name=enter['officeName'],
+      news_type="enter",
+    ))
   return result
 
+# 네이버 엔터 기사사 리스트 가져오기
+def get_enter_list(page, fresh_only=True):
+  response = requests.get(enter_list_url(page), headers=header)
+  return parse_enter_list(response.json(), fresh_only)
+
+# 네이버 엔터 기사 JSON 파싱 (동기/비동기 크롤러 공용)
+def parse_enter(json_data, data):
+  try:
+    article = json_data['result']['articleInfo']['article']
+    
+    return Article(
+      url=article['orgUrl']['pc']['url'],
+      naver_url=data.naver_url,
+      title=article['title'],
+      content=article['refinedContent'],
+      image_url=data.image_url,
+      media_name=data.media_name,
+      news_type=data.news_type,
+      listed_at=data.listed_at
+    )
+  except:
+    return None
+
 # 네이버 엔터 기사 가져오기
 def get_enter(data):
-  url = data['naverUrl'].replace('https://m.entertain.naver.com/now/article/','https://api-gw.entertain.naver.com/news/article/')
   try:
-    response = requests.get(url, headers=header)
+    response = requests.get(enter_article_url(data), headers=header)
     json_data = response.json()
-    article = json_data['result']['articleInfo']['article']
-    
-    return {
-      'url': article['orgUrl']['pc']['url'],
-      'naverUrl': data['naverUrl'],
-      "title": article['title'],
-      "content": article['refinedContent'],
-      "image_url": data['image_url'],
-      "mediaName": data['mediaName'],
-      "news_type": data["news_type"]
-    }
   except:
     return None
+  return parse_enter(json_data, data)
   
 if __name__ == "__main__":
   result = []
@@ -80,7 +103,7 @@ if __name__ == "__main__":
       for future in as_completed(futures):
         data = future.result()
         if data:
-          result.append(data)
+          result.append(data.to_dict())
 
   with open('enter.json', 'w', encoding='utf-8') as f:
     json.dump(result, f, ensure_ascii=False, indent=2)
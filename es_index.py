@@ -0,0 +1,269 @@
+# Elasticsearch(OpenSearch) 뉴스 인덱스 관리. 버전이 붙은 인덱스(news_index_v1, news_index_v2, ...)를 명시적 매핑과
+# 한국어 분석기(nori)를 담은 index template으로 만들고, 색인/검색은 alias(news_index)로만 접근.
+# 매핑/분석기가 바뀌면 새 버전을 MySQL에서 다시 색인한 뒤 alias를 한 번에 교체 (검색 중단 없음)
+# 사용법: python es_index.py status | ensure | reindex [--page-size 500]
+import os
+import re
+import argparse
+
+# 매핑/분석기를 바꾸면 올림 (클러스터의 template 버전이 이보다 낮으면 갱신, 기존 인덱스에는 reindex 후 반영)
+ES_TEMPLATE_VERSION = 1
+
+ES_ANALYZER = os.getenv("ES_ANALYZER", "nori")  # nori(analysis-nori 플러그인), 플러그인이 없는 클러스터는 cjk로 대체
+ES_SHARDS = int(os.getenv("ES_SHARDS", "1"))
+ES_REPLICAS = int(os.getenv("ES_REPLICAS", "1"))
+ES_REFRESH_INTERVAL = os.getenv("ES_REFRESH_INTERVAL", "1s")
+ES_KEEP_VERSIONS = int(os.getenv("ES_KEEP_VERSIONS", "1"))  # alias 교체 후 롤백용으로 남겨둘 이전 버전 수
+
+# 대량 색인 중에는 refresh와 replica 복제를 끄고, 끝난 뒤 ES_REFRESH_INTERVAL/ES_REPLICAS로 되돌림
+BULK_LOAD_SETTINGS = {"index": {"refresh_interval": "-1", "number_of_replicas": 0}}
+
+ANALYSIS = {
+    # 형태소 분석 후 조사/어미 등 검색에 쓰이지 않는 품사 제거(nori_part_of_speech 기본 stoptags), 한자는 한글 독음으로
+    "nori": {
+        "tokenizer": {
+            "korean_tokenizer": {"type": "nori_tokenizer", "decompound_mode": "mixed", "discard_punctuation": True},
+        },
+        "analyzer": {
+            "korean": {"type": "custom", "tokenizer": "korean_tokenizer",
+                       "filter": ["nori_part_of_speech", "nori_readingform", "lowercase"]},
+        },
+    },
+    # 플러그인 없이 쓸 수 있는 대안: 한글을 2글자 단위(bigram)로 색인
+    "cjk": {
+        "analyzer": {
+            "korean": {"type": "custom", "tokenizer": "standard", "filter": ["cjk_width", "lowercase", "cjk_bigram"]},
+        },
+    },
+}
+
+MAPPINGS = {
+    "dynamic": False,  # 매핑에 없는 필드는 저장만 하고 색인하지 않음 (필드 추가는 template 버전을 올려서)
+    "properties": {
+        "title": {"type": "text", "analyzer": "korean",
+                  "fields": {"keyword": {"type": "keyword", "ignore_above": 256}}},
+        "content": {"type": "text", "analyzer": "korean"},
+    },
+}
+
+
+def template_name(alias):
+    return f"{alias}_template"
+
+
+def version_index(alias, version):
+    return f"{alias}_v{version}"
+
+
+def index_template(alias, analyzer=ES_ANALYZER):
+    """alias_v* 인덱스에 적용되는 index template (_meta에 분석기 기록)"""
+    return {
+        "index_patterns": [f"{alias}_v*"],
+        "version": ES_TEMPLATE_VERSION,
+        "_meta": {"analyzer": analyzer},
+        "template": {
+            "settings": {
+                "index": {
+                    "number_of_shards": ES_SHARDS,
+                    "number_of_replicas": ES_REPLICAS,
+                    "refresh_interval": ES_REFRESH_INTERVAL,
+                },
+                "analysis": ANALYSIS[analyzer],
+            },
+            "mappings": MAPPINGS,
+        },
+    }
+
+
+def cluster_analyzer(client, analyzer=ES_ANALYZER):
+    """
+    클러스터에서 쓸 수 있는 분석기. nori인데 analysis-nori 플러그인이 없으면 경고 후 cjk로 대체
+    (_cat/plugins를 조회할 수 없으면 설정한 분석기 그대로 사용)
+    """
+    if analyzer != "nori":
+        return analyzer
+    try:
+        plugins = {plugin.get("component") for plugin in client.cat.plugins(format="json")}
+    except Exception as e:
+        print(f"[warn] Elasticsearch 플러그인 목록 조회 실패, nori 분석기를 그대로 사용합니다: {e}")
+        return analyzer
+    if "analysis-nori" in plugins:
+        return analyzer
+    print("[warn] Elasticsearch에 analysis-nori 플러그인이 없어 cjk 분석기(bigram)로 대체합니다. "
+          "플러그인 설치 후 `python es_index.py reindex`로 nori 인덱스로 옮길 수 있습니다.")
+    return "cjk"
+
+
+def _template(client, alias):
+    """등록된 template (없으면 None)"""
+    from opensearchpy.exceptions import NotFoundError
+
+    try:
+        templates = client.indices.get_index_template(name=template_name(alias))["index_templates"]
+    except NotFoundError:
+        return None
+    return templates[0]["index_template"] if templates else None
+
+
+def ensure_template(client, alias):
+    """template이 없거나 버전이 낮거나 분석기가 다르면 등록, 갱신했으면 True"""
+    analyzer = cluster_analyzer(client)
+    template = _template(client, alias) or {}
+    if (template.get("version", 0) >= ES_TEMPLATE_VERSION
+            and template.get("_meta", {}).get("analyzer", ES_ANALYZER) == analyzer):
+        return False
+
+    client.indices.put_index_template(name=template_name(alias), body=index_template(alias, analyzer))
+    print(f"[info] Elasticsearch index template 등록 ({template_name(alias)} v{ES_TEMPLATE_VERSION}, 분석기 {analyzer})")
+    return True
+
+
+def alias_indices(client, alias):
+    """alias가 가리키는 인덱스 목록 (alias가 없으면 빈 리스트)"""
+    from opensearchpy.exceptions import NotFoundError
+
+    try:
+        return sorted(client.indices.get_alias(name=alias))
+    except NotFoundError:
+        return []
+
+
+def versions(client, alias):
+    """클러스터에 있는 alias_v* 인덱스의 {버전: 인덱스 이름}"""
+    from opensearchpy.exceptions import NotFoundError
+
+    try:
+        names = client.indices.get(index=f"{alias}_v*")
+    except NotFoundError:
+        return {}
+    pattern = re.compile(rf"^{re.escape(alias)}_v(\d+)$")
+    return {int(match.group(1)): name for name in names if (match := pattern.match(name))}
+
+
+def ensure_index(client, alias):
+    """
+    template을 등록하고, alias가 없으면 첫 버전 인덱스를 만들어 연결.
+    alias 이름의 인덱스가 이미 있으면(동적 매핑으로 만들어진 기존 인덱스) 그대로 두고 reindex를 안내.
+    """
+    ensure_template(client, alias)
+    indices = alias_indices(client, alias)
+    if indices:
+        return indices[0]
+
+    if client.indices.exists(index=alias):
+        print(f"[warn] {alias}는 template이 적용되지 않은 기존 인덱스입니다. "
+              f"`python es_index.py reindex`로 {version_index(alias, 1)}로 옮기세요.")
+        return alias
+
+    from opensearchpy.exceptions import RequestError
+
+    index = version_index(alias, max(versions(client, alias), default=0) + 1)
+    try:
+        client.indices.create(index=index, body={"aliases": {alias: {"is_write_index": True}}})
+    except RequestError as e:
+        # 여러 replica가 동시에 시작하면 다른 replica가 먼저 만들 수 있음
+        if e.error != "resource_already_exists_exception":
+            raise
+        return index
+    print(f"[info] Elasticsearch 인덱스 생성 ({index} ← {alias})")
+    return index
+
+
+def _bulk_load(client, index, iter_pages, after_id, page_size):
+    """iter_pages(after_id)의 뉴스를 index에 색인, (색인 건수, 실패 건수, 마지막 news_id) 반환"""
+    from opensearchpy.helpers import streaming_bulk
+
+    last_id = after_id
+
+    def generate_actions():
+        nonlocal last_id
+        for rows in iter_pages(after_id):
+            for row in rows:
+                yield {"_index": index, "_id": row["news_id"],
+                       "_source": {"title": row["title"], "content": row["content"]}}
+            last_id = rows[-1]["news_id"]
+
+    loaded = failed = 0
+    for ok, item in streaming_bulk(client, generate_actions(), chunk_size=page_size,
+                                   max_retries=3, raise_on_error=False):
+        if ok:
+            loaded += 1
+            continue
+        failed += 1
+        result = next(iter(item.values()))
+        print(f"[error] Elasticsearch 색인 실패 (news_id={result.get('_id')}): {result.get('error')}")
+    return loaded, failed, last_id
+
+
+def reindex(client, alias, iter_pages, page_size=500):
+    """
+    MySQL의 뉴스로 새 버전 인덱스를 만든 뒤 alias를 원자적으로 교체.
+    1) 새 버전을 refresh/replica를 끈 상태로 대량 색인  2) 설정 복원, refresh 후 건수 확인
+    3) alias 교체 (기존 인덱스가 alias 이름을 쓰고 있었다면 같은 요청에서 삭제)
+    4) 색인하는 동안 저장되어 이전 인덱스로 들어간 뉴스를 새 버전에 추가 색인  5) 오래된 버전 삭제
+    iter_pages(after_id)는 news_id > after_id인 뉴스 행 목록을 news_id 순으로 페이지 단위로 반환.
+    성공하면 새 인덱스 이름, 실패하면 None 반환 (alias는 그대로)
+    """
+    ensure_template(client, alias)
+    previous = alias_indices(client, alias)
+    legacy = not previous and client.indices.exists(index=alias)
+    index = version_index(alias, max(versions(client, alias), default=0) + 1)
+
+    print(f"[info] {index} 색인 시작 (현재 {alias} → {previous or ([alias] if legacy else [])})")
+    client.indices.create(index=index, body={"settings": BULK_LOAD_SETTINGS})
+    loaded, failed, last_id = _bulk_load(client, index, iter_pages, 0, page_size)
+
+    client.indices.put_settings(index=index, body={
+        "index": {"refresh_interval": ES_REFRESH_INTERVAL, "number_of_replicas": ES_REPLICAS},
+    })
+    client.indices.refresh(index=index)
+    count = client.count(index=index)["count"]
+    if failed or count != loaded:
+        print(f"[error] {index} 색인 실패 ({failed}건 실패, 색인 {loaded}건 / 조회 {count}건) - alias를 교체하지 않고 삭제합니다.")
+        client.indices.delete(index=index)
+        return None
+    client.cluster.health(index=index, wait_for_status="yellow")  # primary shard 할당까지 대기
+
+    actions = [{"remove": {"index": old, "alias": alias}} for old in previous]
+    if legacy:
+        actions.append({"remove_index": {"index": alias}})  # alias와 이름이 같은 기존 인덱스는 교체와 동시에 삭제
+    actions.append({"add": {"index": index, "alias": alias, "is_write_index": True}})
+    client.indices.update_aliases(body={"actions": actions})
+    print(f"[info] {alias} → {index} 교체 완료 ({loaded}건)")
+
+    caught_up, failed, _ = _bulk_load(client, index, iter_pages, last_id, page_size)
+    if caught_up or failed:
+        print(f"[info] 색인 중 저장된 뉴스 {caught_up}건 추가 색인 ({failed}건 실패)")
+
+    older = [name for _, name in sorted(versions(client, alias).items()) if name != index]
+    for name in older[:max(0, len(older) - ES_KEEP_VERSIONS)]:
+        client.indices.delete(index=name)
+        print(f"[info] 이전 버전 인덱스 삭제 ({name})")
+    return index
+
+
+def status(client, alias):
+    """alias가 가리키는 인덱스, 버전별 문서 수, template 버전과 분석기"""
+    template = _template(client, alias) or {}
+    return {
+        "alias": alias_indices(client, alias),
+        "versions": {name: client.count(index=name)["count"] for _, name in sorted(versions(client, alias).items())},
+        "template_version": template.get("version"),
+        "analyzer": template.get("_meta", {}).get("analyzer"),
+        "expected_template_version": ES_TEMPLATE_VERSION,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Elasticsearch 뉴스 인덱스 관리")
+    parser.add_argument("command", choices=["status", "ensure", "reindex"],
+                        help="status: 현재 상태, ensure: template/인덱스 준비, reindex: 새 버전으로 재색인 후 alias 교체")
+    parser.add_argument("--page-size", type=int, default=500, help="MySQL 조회/bulk 색인 단위")
+    args = parser.parse_args()
+
+    import db
+    if args.command == "ensure":
+        db.ensure_news_index()
+    elif args.command == "reindex":
+        db.reindex_news_index(args.page_size)
+    print(f"[info] {status(db.es, db.ES_INDEX)}")
@@ -0,0 +1,109 @@
+# Elasticsearch(OpenSearch) 색인 버퍼. 문서를 모아서 bulk API로 전송하여 worker가 색인 응답을 기다리지 않도록 함
+import time
+import queue
+import atexit
+import threading
+from opensearchpy.helpers import bulk
+import metrics
+
+# 재시도할 bulk 실패 상태 코드 (요청 과다, 일시적인 서버 오류)
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+_STOP = object()
+
+
+class BulkIndexer:
+    """add()로 받은 문서를 batch_size개 또는 flush_interval초마다 bulk로 색인"""
+
+    def __init__(self, client, index, batch_size=200, flush_interval=1.0, max_retries=3, retry_backoff=1.0):
+        self.client = client
+        self.index = index
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)  # 종료 시 남은 문서 색인 (스레드가 없으면 아무것도 하지 않음)
+
+    def add(self, doc_id, body):
+        """색인할 문서 추가 (즉시 반환)"""
+        self._start()
+        self._queue.put({"_index": self.index, "_id": doc_id, "_source": body})
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="es-indexer", daemon=True)
+                self._thread.start()
+
+    def close(self):
+        """남은 문서를 모두 색인한 뒤 색인 스레드 종료"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _run(self):
+        actions = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                action = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                action = None
+
+            if action is _STOP:
+                self.flush(actions)
+                return
+
+            if action is not None:
+                actions.append(action)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if actions and (len(actions) >= self.batch_size or time.monotonic() >= deadline):
+                self.flush(actions)
+                actions = []
+                deadline = None
+
+    def flush(self, actions):
+        """bulk 색인 후, 일시적으로 실패한 문서만 backoff 후 재시도"""
+        for attempt in range(self.max_retries + 1):
+            if not actions:
+                return
+
+            try:
+                with metrics.es_bulk_seconds.time():
+                    # 문서별 실패는 errors로 받고, 연결 오류/타임아웃은 예외로 받아 전체 재시도
+                    success, errors = bulk(self.client, actions, raise_on_error=False)
+            except Exception as e:
+                # 연결 오류 등으로 요청 자체가 실패하면 전체 재시도
+                print(f"[warn] Elasticsearch bulk 요청 실패 ({attempt + 1}회): {e}")
+                time.sleep(self.retry_backoff * 2 ** attempt)
+                continue
+
+            retry_ids = set()
+            for error in errors:
+                item = next(iter(error.values()))
+                if item.get("status") in RETRYABLE_STATUS:
+                    retry_ids.add(str(item.get("_id")))
+                else:
+                    metrics.es_documents.inc(result="failed")
+                    print(f"[error] Elasticsearch 색인 실패 (news_id={item.get('_id')}): {item.get('error')}")
+
+            metrics.es_documents.inc(success, result="ok")
+            if success:
+                print(f"[info] Elasticsearch bulk 색인 완료 ({success}건)")
+            if not retry_ids:
+                return
+
+            actions = [action for action in actions if str(action["_id"]) in retry_ids]
+            time.sleep(self.retry_backoff * 2 ** attempt)
+
+        metrics.es_documents.inc(len(actions), result="failed")
+        print(f"[error] Elasticsearch 색인 재시도 초과: {len(actions)}건 실패")
@@ -0,0 +1,111 @@
+# LLM 분석 결과 캐시. 요청 내용(프롬프트 템플릿, 모델, 파라미터, 제목, 본문)의 해시를 키로 SQLite에 저장
+# 같은 기사가 다른 URL로 재등장하거나 저장 실패 후 재시도될 때 LLM 호출 없이 결과를 재사용
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "./checkpoints/llm_cache.sqlite3")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # 초
+
+EVICT_EVERY = 500  # 저장 N번마다 만료/초과 항목 정리
+
+
+def make_key(kind, request):
+    """요청 종류와 요청 파라미터(모델, 파라미터, 렌더링된 프롬프트)로 캐시 키 생성"""
+    payload = json.dumps({"kind": kind, "request": request}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """TTL과 최대 개수 기준으로 LRU 정리하는 SQLite 캐시"""
+
+    def __init__(self, path, max_entries=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+        return self._conn
+
+    def get(self, key):
+        """캐시된 결과 반환 (없거나 만료되었으면 None)"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value, created_at FROM llm_cache WHERE cache_key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE cache_key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key, value):
+        """결과 저장"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (cache_key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._writes += 1
+            if self._writes % EVICT_EVERY == 0:
+                self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        """만료된 항목 삭제 후, 최대 개수를 넘으면 가장 오래 사용하지 않은 항목부터 삭제"""
+        conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute("""
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache ORDER BY accessed_at LIMIT ?
+                )
+            """, (count - self.max_entries,))
+
+    def evict(self):
+        """만료/초과 항목 정리"""
+        with self._lock:
+            self._evict(self._connect(), time.time())
+
+    def stats(self):
+        """hit/miss 통계"""
+        with self._lock:
+            entries = self._connect().execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": entries,
+        }
+
+
+llm_cache = LLMCache(LLM_CACHE_PATH)
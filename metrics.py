@@ -0,0 +1,229 @@
+# 파이프라인 계측 모듈. 단계/소스별 카운터와 지연 히스토그램, 큐 길이 게이지를 수집
+# METRICS_PORT로 /metrics (Prometheus text 형식) HTTP 엔드포인트를 열고, METRICS_LOG_INTERVAL초마다 JSON 한 줄로도 출력
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))  # 0이면 HTTP 엔드포인트 사용 안 함
+METRICS_LOG_INTERVAL = int(os.getenv("METRICS_LOG_INTERVAL", "60"))  # 초, 0이면 로그 출력 안 함
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_registry = []
+
+
+def _label_key(label_names, labels):
+    return tuple(str(labels.get(name, "")) for name in label_names)
+
+
+def _format_labels(label_names, key, extra=None):
+    pairs = list(zip(label_names, key)) + (extra or [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    """라벨별로 증가만 하는 값"""
+
+    type = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(self.label_names, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, None, value) for key, value in self._values.items()]
+
+
+class Gauge:
+    """현재 값. set()으로 지정하거나 set_function()으로 수집 시점에 함수를 호출하여 조회"""
+
+    type = "gauge"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._functions = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(self.label_names, labels)] = value
+
+    def set_function(self, func, **labels):
+        with self._lock:
+            self._functions[_label_key(self.label_names, labels)] = func
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, func in functions.items():
+            try:
+                values[key] = func()
+            except Exception:
+                continue
+        return [(self.name, key, None, value) for key, value in values.items()]
+
+
+class Histogram:
+    """라벨별 지연 분포 (누적 버킷, 합계, 개수)"""
+
+    type = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}  # 라벨 → [버킷별 개수..., +Inf 개수, 합계]
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value, **labels):
+        key = _label_key(self.label_names, labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            state[bisect.bisect_left(self.buckets, value)] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간을 기록 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+
+        samples = []
+        for key, state in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                samples.append((self.name + "_bucket", key, ("le", le), cumulative))
+            samples.append((self.name + "_sum", key, None, state[-1]))
+            samples.append((self.name + "_count", key, None, cumulative))
+        return samples
+
+
+def render():
+    """등록된 모든 지표를 Prometheus text exposition 형식으로 반환"""
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, key, extra, value in metric.samples():
+            lines.append(f"{name}{_format_labels(metric.label_names, key, [extra] if extra else None)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def snapshot():
+    """로그 출력용 요약 (카운터/게이지 값, 히스토그램은 합계와 개수)"""
+    result = {}
+    for metric in _registry:
+        for name, key, extra, value in metric.samples():
+            if extra is not None:
+                continue
+            label = ",".join(f"{label_name}={part}" for label_name, part in zip(metric.label_names, key))
+            result[f"{name}{{{label}}}" if label else name] = round(value, 4) if isinstance(value, float) else value
+    return result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_http_server(port=METRICS_PORT):
+    """/metrics 엔드포인트를 백그라운드 스레드로 실행"""
+    server = ThreadingHTTPServer(("0.0.0.0", port), _Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def start_log_reporter(interval=METRICS_LOG_INTERVAL):
+    """interval초마다 지표 요약을 JSON 한 줄로 출력 (엔드포인트를 수집하지 못하는 환경용)"""
+    def run():
+        while True:
+            time.sleep(interval)
+            print("[metrics] " + json.dumps(snapshot(), ensure_ascii=False))
+
+    threading.Thread(target=run, name="metrics-log", daemon=True).start()
+
+
+def start():
+    """환경 변수 설정에 따라 엔드포인트와 로그 출력 시작 (엔드포인트를 열지 못하면 로그로 대체)"""
+    if METRICS_PORT:
+        try:
+            start_http_server(METRICS_PORT)
+            print(f"[info] 지표 엔드포인트 실행 중: http://0.0.0.0:{METRICS_PORT}/metrics")
+        except OSError as e:
+            print(f"[warn] 지표 엔드포인트 실행 실패, 로그로 출력합니다: {e}")
+            start_log_reporter(METRICS_LOG_INTERVAL or 60)
+            return
+    if METRICS_LOG_INTERVAL:
+        start_log_reporter(METRICS_LOG_INTERVAL)
+
+
+# 파이프라인 지표
+news_queue_depth = Gauge("news_queue_depth", "처리 대기 중인 뉴스 수")
+list_fetch_seconds = Histogram("crawl_list_fetch_seconds", "리스트 페이지 수집 시간", ["source"])
+article_fetch_seconds = Histogram("crawl_article_fetch_seconds", "기사 본문 수집 시간", ["source"])
+news_processed = Counter("news_processed_total", "처리한 뉴스 수 (결과별)", ["source", "result"])
+analyze_seconds = Histogram("analyze_seconds", "기사 1건 분석 시간", ["source"])
+llm_request_seconds = Histogram("llm_request_seconds", "LLM 요청 시간 (프롬프트 종류별)", ["kind"])
+llm_requests = Counter("llm_requests_total", "LLM 요청 수 (프롬프트 종류, 결과별)", ["kind", "result"])
+llm_retries = Counter("llm_retries_total", "LLM 요청 재시도 수 (429, 일시적 오류)", ["reason"])
+llm_tokens = Counter("llm_tokens_total", "LLM 토큰 사용량 (응답 usage 기준)", ["kind", "type"])
+db_write_seconds = Histogram("db_write_seconds", "DB 저장 시간", ["mode"])
+db_write_errors = Counter("db_write_errors_total", "DB 저장 실패 수", ["mode"])
+es_bulk_seconds = Histogram("es_bulk_seconds", "Elasticsearch bulk 요청 시간")
+es_documents = Counter("es_documents_total", "Elasticsearch 색인 문서 수 (결과별)", ["result"])
+
+
+def record_llm_usage(kind, usage):
+    """OpenAI 응답의 usage를 토큰 사용량 지표에 반영"""
+    if usage is None:
+        return
+    llm_tokens.inc(getattr(usage, "prompt_tokens", 0) or 0, kind=kind, type="prompt")
+    llm_tokens.inc(getattr(usage, "completion_tokens", 0) or 0, kind=kind, type="completion")
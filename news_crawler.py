@@ -1,55 +1,170 @@
 # 네이버 뉴스 크롤러
+import os
 import requests
-from bs4 import BeautifulSoup
+import lxml.html
 import datetime, json
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from article import Article
 
-# 네이버 뉴스 리스트 가져오기
-def get_news_list(page):
+# 벤치마크 등에서 로컬 재현 서버로 바꿀 수 있도록 호스트를 환경 변수로 지정
+NAVER_NEWS_BASE = os.getenv("NAVER_NEWS_BASE", "https://news.naver.com")
+NEWS_LIST_URL = NAVER_NEWS_BASE + "/main/list.naver?mode=LSD&mid=sec&sid1=001&date={date}&page={page}"
+
+# HTML 파서 (lxml: 응답 bytes를 바로 파싱하는 빠른 경로, bs4: 기존 BeautifulSoup html.parser)
+NEWS_HTML_PARSER = os.getenv("NEWS_HTML_PARSER", "lxml")
+
+# bs4 get_text()와 같게 스크립트/스타일 텍스트는 제외
+_SKIP_TEXT_TAGS = {"script", "style", "template"}
+
+# 네이버 뉴스 리스트 URL 생성
+def news_list_url(page):
     today = datetime.datetime.now().strftime("%Y%m%d")
+    return NEWS_LIST_URL.format(date=today, page=page)
+
+# bs4는 공백만 있는 텍스트 노드를 줄바꿈 1개(줄바꿈 포함 시) 또는 공백 1개로 줄임
+def _bs4_string(text):
+    if text.strip(" \n\t\f\r"):
+        return text
+    return "\n" if "\n" in text else " "
+
+# lxml 요소의 텍스트 (bs4 get_text()와 동일하게 주석/스크립트 제외)
+def _text(element):
+    parts = []
+
+    def walk(node):
+        if node.text and node.tag not in _SKIP_TEXT_TAGS:
+            parts.append(_bs4_string(node.text))
+        for child in node:
+            if isinstance(child.tag, str):  # 주석/처리 명령은 tag가 함수
+                walk(child)
+            if child.tail:
+                parts.append(_bs4_string(child.tail))
+
+    walk(element)
+    return "".join(parts)
+
+# str 또는 응답 bytes를 lxml 문서로 파싱 (bytes면 응답 인코딩, 없으면 meta charset 사용)
+def _parse_document(html, encoding=None):
+    parser = lxml.html.HTMLParser(encoding=encoding) if isinstance(html, bytes) and encoding else None
+    return lxml.html.document_fromstring(html, parser=parser)
+
+# 클래스 중 하나가 name인 요소 (bs4 class_="name"과 동일)
+def _has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+# 네이버 뉴스 리스트 HTML 파싱 (동기/비동기 크롤러 공용), fresh_only=False면 시간 조건 없이 페이지 전체 반환
+def parse_news_list(html, fresh_only=True, encoding=None):
+    if NEWS_HTML_PARSER == "bs4":
+        if isinstance(html, bytes):
+            html = html.decode(encoding or "utf-8", errors="replace")
+        return parse_news_list_bs4(html, fresh_only)
+
+    root = _parse_document(html, encoding)
+    list_body = root.xpath('//div[@class="list_body newsflash_body"]')
+    if not list_body:
+        raise ValueError("뉴스 리스트 영역을 찾을 수 없습니다.")
+    news_list = list_body[0].xpath(".//li")
+
+    result = []
+    for news in news_list:
+        naverUrl = news.xpath(".//a")[0].get("href")
+        if not fresh_only:
+            result.append(Article.listed(naver_url=naverUrl, news_type="news"))
+            continue
+
+        time = int(_text(news.xpath('.//span[@class="date is_new"]')[0]).replace("\"", "").replace("분전", ""))
+        if time >= 2: # 2분 이상 지난 뉴스는 크롤링하지 않음
+            break
+
+        result.append(Article.listed(naver_url=naverUrl, news_type="news"))
 
-    url = f"https://news.naver.com/main/list.naver?mode=LSD&mid=sec&sid1=001&date={today}&page={page}"
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    return result
+
+# 기존 BeautifulSoup 기반 리스트 파싱 (NEWS_HTML_PARSER=bs4, 결과 비교용)
+def parse_news_list_bs4(html, fresh_only=True):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
     news_list = soup.find("div", class_="list_body newsflash_body").find_all("li")
 
     result = []
     for news in news_list:
         naverUrl = news.find("a")["href"]
+        if not fresh_only:
+            result.append(Article.listed(naver_url=naverUrl, news_type="news"))
+            continue
+
         time = int(news.find("span", class_="date is_new").get_text().replace("\"", "").replace("분전", ""))
         if time >= 2: # 2분 이상 지난 뉴스는 크롤링하지 않음
             break
 
-        result.append({
-            "naverUrl": naverUrl,
-            "news_type": "news"
-        })
+        result.append(Article.listed(naver_url=naverUrl, news_type="news"))
 
     return result
 
-# 네이버 뉴스 가져오기
-def get_news(data):
+# 네이버 뉴스 리스트 가져오기
+def get_news_list(page, fresh_only=True):
+    response = requests.get(news_list_url(page))
+    return parse_news_list(response.content, fresh_only, response.encoding)
+
+# 네이버 뉴스 기사 HTML 파싱 (동기/비동기 크롤러 공용)
+def parse_news(html, data, encoding=None):
+    if NEWS_HTML_PARSER == "bs4":
+        if isinstance(html, bytes):
+            html = html.decode(encoding or "utf-8", errors="replace")
+        return parse_news_bs4(html, data)
+
     try:
-        url = data["naverUrl"]
-        response = requests.get(url)
-        soup = BeautifulSoup(response.text, "html.parser")
+        root = _parse_document(html, encoding)
+        title = _text(root.xpath('//h2[@id="title_area"]')[0])
+        content = _text(root.xpath('//article[@id="dic_area"]')[0]).strip()
+        image_url = root.xpath('//img[@class="_LAZY_LOADING _LAZY_LOADING_INIT_HIDE"]')[0].attrib["data-src"]
+        mediaName = root.xpath(f'//img[{_has_class("media_end_head_top_logo_img")}]')[0].attrib["title"]
+        real_url = root.xpath('//a[count(node()) = 1 and string() = "기사원문"]')[0].attrib["href"]
+
+        return Article(
+            url=real_url,
+            naver_url=data.naver_url,
+            title=title,
+            content=content,
+            image_url=image_url,
+            media_name=mediaName,
+            news_type=data.news_type,
+            listed_at=data.listed_at
+        )
+    except:
+        return None
+
+# 기존 BeautifulSoup 기반 기사 파싱 (NEWS_HTML_PARSER=bs4, 결과 비교용)
+def parse_news_bs4(html, data):
+    from bs4 import BeautifulSoup
+    try:
+        soup = BeautifulSoup(html, "html.parser")
         title = soup.find("h2", id="title_area").get_text()
         content = soup.find("article", id="dic_area").get_text().strip()
         image_url = soup.find("img", class_="_LAZY_LOADING _LAZY_LOADING_INIT_HIDE")["data-src"]
         mediaName = soup.find("img", class_="media_end_head_top_logo_img")["title"]
         real_url = soup.find('a', string='기사원문')['href']
 
-        return {
-        'url': real_url,
-        'naverUrl': url,
-        "title": title,
-        "content": content,
-        "image_url": image_url,
-        "mediaName": mediaName,
-        "news_type": data["news_type"]
-        }
+        return Article(
+            url=real_url,
+            naver_url=data.naver_url,
+            title=title,
+            content=content,
+            image_url=image_url,
+            media_name=mediaName,
+            news_type=data.news_type,
+            listed_at=data.listed_at
+        )
+    except:
+        return None
+
+# 네이버 뉴스 가져오기
+def get_news(data):
+    try:
+        response = requests.get(data.naver_url)
     except:
         return None
+    return parse_news(response.content, data, response.encoding)
     
 
     
@@ -71,7 +186,7 @@ if __name__ == "__main__":
             for future in as_completed(futures):
                 news = future.result()
                 if news: # 뉴스 결과 값이 있으면 추가
-                    result.append(news)
+                    result.append(news.to_dict())
 
     # json 파일로 저장
     with open("news.json", "w", encoding='utf-8') as f:
@@ -0,0 +1,189 @@
+# 분석된 뉴스를 모아서 한 번에 저장하는 배치 writer
+# 기사마다 SELECT/INSERT/INSERT/COMMIT을 하는 대신, 배치 단위로 중복 조회 1번, multi-row INSERT, 커밋 1번만 수행
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from sqlalchemy import text, bindparam
+from score_probs import INSERT_SCORE_PROBS_SQL, score_probs_row
+import metrics
+
+# news 테이블 INSERT (db.save_news와 공용)
+NEWS_INSERT_SQL = text("""
+    INSERT INTO news (
+        url, naver_url, title, summary, image_url, media_name,
+        category, headline_score, fact_score,
+        headline_score_reason, fact_score_reason,
+        like_count, hate_count, comment_count, view_count,
+        rating_count, total_rating_sum
+    ) VALUES (
+        :url, :naver_url, :title, :summary, :image_url, :media_name,
+        :category, :headline_score, :fact_score,
+        :headline_score_reason, :fact_score_reason,
+        :like_count, :hate_count, :comment_count, :view_count,
+        :rating_count, :total_rating_sum
+    )
+""")
+
+# news_content 테이블 INSERT (db.save_news와 공용)
+NEWS_CONTENT_INSERT_SQL = text("""
+    INSERT INTO news_content (news_id, content)
+    VALUES (:news_id, :content)
+""")
+
+EXISTING_URLS_SQL = text("""
+    SELECT news_id, url FROM news WHERE url IN :urls
+""").bindparams(bindparam("urls", expanding=True))
+
+_STOP = object()
+
+
+def to_news_row(news_data):
+    """분석된 뉴스 데이터를 news 테이블 컬럼으로 변환"""
+    return {
+        "url": news_data.url,
+        "naver_url": news_data.naver_url,
+        "title": news_data.title,
+        "summary": news_data.summary,
+        "image_url": news_data.image_url,
+        "media_name": news_data.media_name,
+        "category": news_data.category,
+        "headline_score": news_data.headline_score,
+        "fact_score": news_data.fact_score,
+        "headline_score_reason": news_data.hs_reason,
+        "fact_score_reason": news_data.fs_reason,
+        # 반응 수는 저장 시점에 항상 0 (크롤링한 기사에는 없는 값)
+        "like_count": 0,
+        "hate_count": 0,
+        "comment_count": 0,
+        "view_count": 0,
+        "rating_count": 0,
+        "total_rating_sum": 0
+    }
+
+
+class NewsBatchWriter:
+    """
+    submit()으로 받은 뉴스를 batch_size개 또는 flush_interval초마다 한 트랜잭션으로 저장.
+    각 뉴스의 결과는 Future로 전달 (저장된 news_id, 중복이면 None).
+    """
+
+    def __init__(self, engine, batch_size=50, flush_interval=2.0, on_saved=None):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_saved = on_saved  # 저장 후 호출할 콜백 (news_id, news_data)
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        """writer 스레드 시작"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="news-writer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, news_data):
+        """저장할 뉴스 추가, 저장 결과를 담을 Future 반환"""
+        future = Future()
+        self._queue.put((news_data, future))
+        return future
+
+    def close(self):
+        """남은 뉴스를 모두 저장한 뒤 writer 스레드 종료"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        batch = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(batch)
+                return
+
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            # 크기 또는 시간 조건을 만족하면 저장
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._flush(batch)
+                batch = []
+                deadline = None
+
+    def _flush(self, batch):
+        if not batch:
+            return
+
+        try:
+            with metrics.db_write_seconds.time(mode="batch"):
+                results = self.write_batch([news_data for news_data, _ in batch])
+        except Exception as e:
+            metrics.db_write_errors.inc(mode="batch")
+            # 배치 전체가 실패하면 뉴스별로 다시 저장하여 문제 있는 뉴스만 실패 처리
+            print(f"[warn] 배치 저장 실패, 개별 저장으로 재시도: {e}")
+            results = []
+            for news_data, _ in batch:
+                try:
+                    results.append(self.write_batch([news_data])[0])
+                except Exception as item_error:
+                    metrics.db_write_errors.inc(mode="single")
+                    results.append(item_error)
+
+        for (news_data, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+                continue
+
+            if result is not None and self.on_saved:
+                try:
+                    self.on_saved(result, news_data)
+                except Exception as e:
+                    print(f"[error] 저장 후처리 실패 (news_id={result}): {e}")
+            future.set_result(result)
+
+    def write_batch(self, news_list):
+        """뉴스 리스트를 한 트랜잭션으로 저장하고 뉴스별 news_id(중복이면 None) 리스트 반환"""
+        urls = list({news_data.url for news_data in news_list})
+
+        with self.engine.begin() as connection:
+            existing = {row[1] for row in connection.execute(EXISTING_URLS_SQL, {"urls": urls})}
+
+            # DB에 이미 있거나 배치 안에서 중복된 뉴스는 제외
+            new_news = []
+            for news_data in news_list:
+                if news_data.url in existing:
+                    continue
+                existing.add(news_data.url)
+                new_news.append(news_data)
+
+            news_ids = {}
+            if new_news:
+                connection.execute(NEWS_INSERT_SQL, [to_news_row(news_data) for news_data in new_news])
+
+                new_urls = [news_data.url for news_data in new_news]
+                news_ids = {row[1]: row[0] for row in connection.execute(EXISTING_URLS_SQL, {"urls": new_urls})}
+
+                connection.execute(NEWS_CONTENT_INSERT_SQL, [
+                    {"news_id": news_ids[news_data.url], "content": news_data.content}
+                    for news_data in new_news
+                ])
+
+                # 재채점을 위해 HS/FS 확률 분포도 함께 저장
+                connection.execute(INSERT_SCORE_PROBS_SQL, [
+                    score_probs_row(news_ids[news_data.url], news_data) for news_data in new_news
+                ])
+
+        saved = {id(news_data): news_ids[news_data.url] for news_data in new_news}
+        return [saved.get(id(news_data)) for news_data in news_list]
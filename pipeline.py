@@ -0,0 +1,106 @@
+# 단계 분리 파이프라인. 본문 수집 → 분석 → 저장을 크기가 제한된 큐로 연결하고 단계마다 스레드 수를 따로 지정
+# 다음 단계 큐가 가득 차면 앞 단계 worker가 put에서 대기하므로, 느린 단계의 압력이 리스트 수집까지 거슬러 올라감 (backpressure)
+import time
+import queue
+import threading
+import metrics
+
+_STOP = object()
+
+stage_queue_depth = metrics.Gauge("pipeline_stage_queue_depth", "단계별 입력 큐에 대기 중인 항목 수", ["stage"])
+stage_utilization = metrics.Gauge("pipeline_stage_utilization", "단계별 worker 사용률 (0~1, 처리 중인 시간 비율)", ["stage"])
+stage_items = metrics.Counter("pipeline_stage_items_total", "단계별 처리 항목 수 (결과별)", ["stage", "result"])
+
+
+class Stage:
+    """
+    입력 큐에서 항목을 꺼내 func(item)을 실행하고, 결과가 None이 아니면 다음 단계 입력 큐에 넣는 worker 묶음.
+    input_queue는 maxsize로 크기가 제한되어 있어 가득 차면 앞 단계가 대기함.
+    """
+
+    def __init__(self, name, func, workers, queue_size):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.input = queue.Queue(maxsize=queue_size)
+        self.next = None  # 다음 단계 (마지막 단계면 None)
+        self._threads = []
+        self._busy = 0.0  # worker들이 func를 실행한 시간 합계(초)
+        self._lock = threading.Lock()
+        self._started_at = None
+
+        stage_queue_depth.set_function(self.input.qsize, stage=name)
+        stage_utilization.set_function(self.utilization, stage=name)
+
+    def start(self):
+        self._started_at = time.monotonic()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"{self.name}-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self):
+        """남은 항목을 모두 처리한 뒤 worker 종료"""
+        for _ in self._threads:
+            self.input.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def utilization(self):
+        """시작 이후 worker들이 실제로 일한 시간 비율"""
+        if self._started_at is None:
+            return 0.0
+        elapsed = (time.monotonic() - self._started_at) * self.workers
+        with self._lock:
+            return min(1.0, self._busy / elapsed) if elapsed else 0.0
+
+    def _run(self):
+        while True:
+            item = self.input.get()
+            if item is _STOP:
+                return
+
+            start = time.monotonic()
+            try:
+                result = self.func(item)
+            except Exception as e:
+                stage_items.inc(stage=self.name, result="error")
+                print(f"[error] {self.name} 단계 처리 실패: {e}")
+                result = None
+            else:
+                stage_items.inc(stage=self.name, result="ok" if result is not None else "dropped")
+            finally:
+                with self._lock:
+                    self._busy += time.monotonic() - start
+
+            # 다음 단계 큐가 가득 차 있으면 여기서 대기 (backpressure)
+            if result is not None and self.next is not None:
+                self.next.input.put(result)
+
+
+class Pipeline:
+    """Stage들을 순서대로 연결한 파이프라인. put()으로 첫 단계에 항목을 넣음 (가득 차면 대기)"""
+
+    def __init__(self, stages):
+        self.stages = stages
+        for stage, next_stage in zip(stages, stages[1:]):
+            stage.next = next_stage
+
+    def start(self):
+        for stage in self.stages:
+            stage.start()
+        return self
+
+    def put(self, item):
+        self.stages[0].input.put(item)
+
+    def close(self):
+        """앞 단계부터 차례로 비우고 종료 (앞 단계가 끝나야 뒤 단계에 더 이상 항목이 들어오지 않음)"""
+        for stage in self.stages:
+            stage.close()
+
+    def report(self):
+        """단계별 worker 수, 사용률, 대기 중인 항목 수"""
+        return {stage.name: {"workers": stage.workers, "utilization": round(stage.utilization(), 2),
+                             "queued": stage.input.qsize()} for stage in self.stages}
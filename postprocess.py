@@ -2,15 +2,66 @@
 # 후처리 모듈. GPT로 요약 생성, 카테고리 분류, 제목과 본문 유사도 측정 및 분석
 #현재는 위의 3가지 작업 모두 GPT를 활용, 추후 각 task마다 적합한 AI model을 활용하도록 리팩토링 가능
 import os
+import sys
 import json
 import time
 import math
-from openai import OpenAI
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from prompt_registry import registry as prompt_registry, render_prompt
+from llm_cache import llm_cache, make_key, LLM_CACHE_ENABLED
+from dedupe import near_duplicates, NEAR_DUP_ENABLED
+from content_budget import fit_content, stats as content_budget_stats
+from article import Article, ANALYSIS_FIELDS
+from score_probs import pack_probs, unpack_probs
+import metrics
+from rate_limiter import rate_limiter, estimate_tokens, retry_after_seconds, LLM_MAX_RETRIES
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
+
+
+def _create_client(name):
+    from openai import OpenAI, AsyncOpenAI
+    if name == "client":
+        return OpenAI(api_key=OPENAI_API_KEY)
+    if name == "async_client":
+        return AsyncOpenAI(api_key=OPENAI_API_KEY)
+    # 재시도는 rate_limiter가 담당하므로 chat completion 호출에서는 SDK 자체 재시도를 끔
+    base = get_client("client" if name == "chat_client" else "async_client")
+    return base.with_options(max_retries=0)
+
+
+# OpenAI 클라이언트는 처음 호출할 때 생성 (openai 패키지 import 비용을 시작 시 내지 않음)
+_CLIENT_NAMES = ("client", "async_client", "chat_client", "async_chat_client")
+_clients_lock = threading.RLock()
+
+
+def get_client(name):
+    """이름에 해당하는 OpenAI 클라이언트 반환 (없으면 생성하여 모듈 속성으로 저장)"""
+    client = globals().get(name)
+    if client is None:
+        with _clients_lock:
+            client = globals().get(name)
+            if client is None:
+                client = globals()[name] = _create_client(name)
+    return client
+
+
+def __getattr__(name):
+    """postprocess.client, from postprocess import client 등 모듈 속성으로 접근하면 그때 생성"""
+    if name in _CLIENT_NAMES:
+        return get_client(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "당신은 뉴스 분석 전문가입니다."
+
+# 요약, HS, FS 요청을 동시에 보내기 위한 공용 스레드 풀 (app worker 수 x 3)
+LLM_MAX_WORKERS = int(os.getenv("LLM_MAX_WORKERS", "15"))
+llm_executor = ThreadPoolExecutor(LLM_MAX_WORKERS, thread_name_prefix="llm")
 
 def load_prompt(file_path):
     """지정된 파일에서 프롬프트를 로드"""
@@ -48,119 +99,331 @@ def calculate_score(logprobs, token_range=(1, 5)):
     
     return score, token_probs
 
-def evaluate_score(title, content, prompt):
-    """GEval 방식을 사용하여 점수 계산"""
-    # 하나의 프롬프트에 대해 처리
-    cur_prompt = prompt.replace("{{제목}}", title).replace("{{본문}}", content)
-
-    # GPT API 호출
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        max_tokens=5,
-        messages=[
-            {
-                "role": "system",
-                "content": "당신은 뉴스 분석 전문가입니다."
-            },
-            {
-                "role": "user",
-                "content": cur_prompt
-            }
-        ],
-        temperature=0,
-        logprobs=True,
-        top_logprobs=10,
-    )
 
-    logprobs_content = completion.choices[0].logprobs.content  # 각 토큰별 로그 확률 데이터
-    score, token_probs = calculate_score(logprobs_content)
+def build_messages(prompt):
+    """시스템 프롬프트와 사용자 프롬프트로 메시지 구성"""
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
 
-    return score, token_probs
 
+def summary_request(title, content, prompt):
+    """요약 생성 및 카테고리 분류 요청 파라미터"""
+    cur_prompt = render_prompt(prompt, {"제목": title, "본문": content})
+    return dict(model=MODEL, messages=build_messages(cur_prompt), max_tokens=500, temperature=0.2, top_p=0.9)
 
-def get_reasoning(title, content, hs_score, fs_score, prompt):
-    """HS 및 FS 점수에 대한 판단 근거를 제공"""
-    cur_prompt = (prompt.replace("{{제목}}", title)
-                         .replace("{{본문}}", content)
-                         .replace("{{hs}}", str(hs_score))
-                         .replace("{{fs}}", str(fs_score)))
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": "당신은 뉴스 분석 전문가입니다."},
-            {"role": "user", "content": cur_prompt}
-        ],
-        max_tokens=500,
-        temperature=0.2,
-        top_p=0.9
-    )
+def score_request(title, content, prompt):
+    """GEval 점수 요청 파라미터 (logprobs 포함)"""
+    cur_prompt = render_prompt(prompt, {"제목": title, "본문": content})
+    return dict(model=MODEL, messages=build_messages(cur_prompt), max_tokens=5, temperature=0,
+                logprobs=True, top_logprobs=10)
 
-    return json.loads(response.choices[0].message.content)  
 
+def reasoning_request(title, content, hs_score, fs_score, prompt):
+    """HS/FS 판단 근거 요청 파라미터"""
+    cur_prompt = render_prompt(prompt, {"제목": title, "본문": content, "hs": hs_score, "fs": fs_score})
+    return dict(model=MODEL, messages=build_messages(cur_prompt), max_tokens=500, temperature=0.2, top_p=0.9)
 
-def analyze_news(news_data):
+
+def article_priority(news_data):
     """
-    단일 뉴스 데이터를 분석하여 요약 생성, 카테고리 분류, HS/FS 점수 계산 후 반환.
+    LLM 호출 우선순위. 리스트에서 받은 시각(listed_at)이 늦은 기사일수록 먼저 호출.
+    모든 소스에 같은 기준을 쓰므로 소스 간 순서가 시각만으로 정해짐 (listed_at이 없는 파일 입력 등은 분석 시작 시각)
     """
-    title = news_data["title"]
-    content = news_data["content"]
-    
-    # 프롬프트 로드
-    prompt_summary = load_prompt("./prompts/prompt_summary.txt")
-    prompt_hs = load_prompt("./prompts/prompt_hs.txt")
-    prompt_fs = load_prompt("./prompts/prompt_fs.txt")
-    prompt_reason = load_prompt("./prompts/prompt_reason.txt")
-
-
-    # 요약 생성 및 카테고리 분류
-    prompt = prompt_summary.replace("{{제목}}", title).replace("{{본문}}", content)
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {
-                "role": "system",
-                "content": "당신은 뉴스 분석 전문가입니다."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        max_tokens=500,
-        temperature=0.2,
-        top_p=0.9
-    )
-
-        
-    result = json.loads(response.choices[0].message.content)
-        
+    return news_data.listed_at or time.time()
+
+
+def create_completion(priority=None, **kwargs):
+    """
+    모든 LLM 호출이 거쳐가는 공용 호출 함수.
+    rate_limiter로 RPM/TPM 한도 안에서 호출하고, 429나 일시적 오류는 대기 후 재시도.
+    """
+    from openai import RateLimitError, APIConnectionError, InternalServerError
+
+    chat_client = get_client("chat_client")
+    estimated = estimate_tokens(kwargs)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        rate_limiter.acquire(estimated, priority)
+        try:
+            response = chat_client.chat.completions.create(**kwargs)
+        except RateLimitError as e:
+            if attempt == LLM_MAX_RETRIES:
+                raise
+            wait = retry_after_seconds(e.response.headers, attempt)
+            print(f"[warn] LLM 호출 한도 초과(429), {wait:.1f}초 후 재시도 ({attempt + 1}/{LLM_MAX_RETRIES})")
+            metrics.llm_retries.inc(reason="rate_limited")
+            rate_limiter.on_rate_limited(wait)
+        except (APIConnectionError, InternalServerError) as e:
+            if attempt == LLM_MAX_RETRIES:
+                raise
+            wait = retry_after_seconds(None, attempt)
+            print(f"[warn] LLM 호출 실패, {wait:.1f}초 후 재시도 ({attempt + 1}/{LLM_MAX_RETRIES}): {e}")
+            metrics.llm_retries.inc(reason="error")
+            time.sleep(wait)
+        else:
+            rate_limiter.on_success(estimated, response.usage)
+            return response
+
+
+async def acreate_completion(priority=None, **kwargs):
+    """모든 비동기 LLM 호출이 거쳐가는 공용 호출 함수 (create_completion과 같은 속도 제한/재시도)"""
+    from openai import RateLimitError, APIConnectionError, InternalServerError
+
+    async_chat_client = get_client("async_chat_client")
+    estimated = estimate_tokens(kwargs)
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        await rate_limiter.acquire_async(estimated, priority)
+        try:
+            response = await async_chat_client.chat.completions.create(**kwargs)
+        except RateLimitError as e:
+            if attempt == LLM_MAX_RETRIES:
+                raise
+            wait = retry_after_seconds(e.response.headers, attempt)
+            print(f"[warn] LLM 호출 한도 초과(429), {wait:.1f}초 후 재시도 ({attempt + 1}/{LLM_MAX_RETRIES})")
+            metrics.llm_retries.inc(reason="rate_limited")
+            rate_limiter.on_rate_limited(wait)
+        except (APIConnectionError, InternalServerError) as e:
+            if attempt == LLM_MAX_RETRIES:
+                raise
+            wait = retry_after_seconds(None, attempt)
+            print(f"[warn] LLM 호출 실패, {wait:.1f}초 후 재시도 ({attempt + 1}/{LLM_MAX_RETRIES}): {e}")
+            metrics.llm_retries.inc(reason="error")
+            await asyncio.sleep(wait)
+        else:
+            rate_limiter.on_success(estimated, response.usage)
+            return response
+
+
+def parse_json_response(response):
+    """JSON 형식 응답 파싱"""
+    return json.loads(response.choices[0].message.content)
+
+
+def parse_score_response(completion):
+    """logprobs 응답으로 점수 계산"""
+    logprobs_content = completion.choices[0].logprobs.content  # 각 토큰별 로그 확률 데이터
+    return calculate_score(logprobs_content)
+
+
+def measured_completion(kind, request, parse, priority=None):
+    """LLM 호출 후 파싱 결과 반환 (프롬프트 종류별 지연, 결과, 토큰 사용량 기록)"""
+    try:
+        with metrics.llm_request_seconds.time(kind=kind):
+            response = create_completion(priority, **request)
+    except Exception:
+        metrics.llm_requests.inc(kind=kind, result="error")
+        raise
+    metrics.llm_requests.inc(kind=kind, result="ok")
+    metrics.record_llm_usage(kind, response.usage)
+    return parse(response)
+
+
+async def ameasured_completion(kind, request, parse, priority=None):
+    """measured_completion의 비동기 버전"""
+    try:
+        with metrics.llm_request_seconds.time(kind=kind):
+            response = await acreate_completion(priority, **request)
+    except Exception:
+        metrics.llm_requests.inc(kind=kind, result="error")
+        raise
+    metrics.llm_requests.inc(kind=kind, result="ok")
+    metrics.record_llm_usage(kind, response.usage)
+    return parse(response)
+
+
+def cached_completion(kind, request, parse, priority=None):
+    """캐시에 결과가 있으면 LLM 호출 없이 반환, 없으면 호출 후 파싱 결과를 캐시에 저장"""
+    if not LLM_CACHE_ENABLED:
+        return measured_completion(kind, request, parse, priority)
+
+    key = make_key(kind, request)
+    result = llm_cache.get(key)
+    if result is None:
+        result = measured_completion(kind, request, parse, priority)
+        llm_cache.set(key, result)
+    else:
+        metrics.llm_requests.inc(kind=kind, result="cached")
+    return result
+
+
+async def acached_completion(kind, request, parse, priority=None):
+    """cached_completion의 비동기 버전"""
+    if not LLM_CACHE_ENABLED:
+        return await ameasured_completion(kind, request, parse, priority)
+
+    key = make_key(kind, request)
+    result = llm_cache.get(key)
+    if result is None:
+        result = await ameasured_completion(kind, request, parse, priority)
+        llm_cache.set(key, result)
+    else:
+        metrics.llm_requests.inc(kind=kind, result="cached")
+    return result
+
+
+def get_summary(title, content, prompt, priority=None):
+    """요약 생성 및 카테고리 분류"""
+    return cached_completion("summary", summary_request(title, content, prompt), parse_json_response, priority)
+
+
+def evaluate_score(title, content, prompt, priority=None):
+    """GEval 방식을 사용하여 점수 계산"""
+    score, token_probs = cached_completion("score", score_request(title, content, prompt), parse_score_response,
+                                           priority)
+    return score, token_probs
+
+
+def get_reasoning(title, content, hs_score, fs_score, prompt, priority=None):
+    """HS 및 FS 점수에 대한 판단 근거를 제공"""
+    request = reasoning_request(title, content, hs_score, fs_score, prompt)
+    return cached_completion("reason", request, parse_json_response, priority)
+
+
+def load_prompts():
+    """분석에 사용하는 컴파일된 프롬프트 템플릿 (레지스트리에서 한 번만 로드)"""
+    return {name: prompt_registry.get(name) for name in ("summary", "hs", "fs", "reason")}
+
+
+def apply_analysis(news_data, summary_result, hs_result, fs_result):
+    """요약/점수 결과를 뉴스 데이터에 반영하고, 정규화된 (HS, FS) 점수 반환"""
     # 요약과 카테고리 결과 추출
-    news_data["summary"] = result["summary"]
-    news_data["category"] = result["category"]
-        
+    news_data.summary = summary_result["summary"]
+    news_data.category = summary_result["category"]
+
     # HS 점수 계산
-    hs_score, hs_token_probs = evaluate_score(title, content, prompt_hs)
+    hs_score, hs_token_probs = hs_result
     normalized_hs_score = normalize_score(hs_score)
 
-    news_data["headline_score"] = normalized_hs_score
-    news_data["headline_score_origin"] = hs_score
-    news_data["headline_score_probs"] = hs_token_probs
-        
+    news_data.headline_score = normalized_hs_score
+    news_data.headline_score_origin = hs_score
+    news_data.headline_score_probs = pack_probs(hs_token_probs)
+
     # FS 점수 계산
-    fs_score, fs_token_probs = evaluate_score(title, content, prompt_fs)
+    fs_score, fs_token_probs = fs_result
     normalized_fs_score = normalize_score(fs_score)
 
-    news_data["fact_score"] = normalized_fs_score
-    news_data["fact_score_origin"] = fs_score
-    news_data["fact_score_probs"] = fs_token_probs  
+    news_data.fact_score = normalized_fs_score
+    news_data.fact_score_origin = fs_score
+    news_data.fact_score_probs = pack_probs(fs_token_probs)
+
+    return normalized_hs_score, normalized_fs_score
+
+
+def find_near_duplicate(news_data):
+    """
+    유사 기사의 분석 결과 조회. 제목까지 유사하면 결과 전체를 복사하고 True,
+    본문만 유사하면 (요약 결과, FS 결과)를 반환 (HS와 판단 근거만 새로 요청), 없으면 None.
+    """
+    if not NEAR_DUP_ENABLED:
+        return None
+
+    duplicate = near_duplicates.find(news_data.title, news_data.content)
+    if duplicate is None:
+        return None
+
+    analysis, same_title = duplicate
+    if same_title:
+        for field in ANALYSIS_FIELDS:
+            setattr(news_data, field, analysis[field])
+        print(f"[info] 유사 기사 분석 결과 재사용: {news_data.title}")
+        return True
+
+    print(f"[info] 유사 기사 본문 분석 결과 재사용 (제목 점수만 새로 계산): {news_data.title}")
+    summary_result = {"summary": analysis["summary"], "category": analysis["category"]}
+    fs_result = (analysis["fact_score_origin"], unpack_probs(analysis["fact_score_probs"]))
+    return summary_result, fs_result
+
+
+def analyze_news(news_data):
+    """
+    단일 뉴스 데이터를 분석하여 요약 생성, 카테고리 분류, HS/FS 점수 계산 후 반환.
+    서로 독립적인 요약/HS/FS 요청은 동시에 보내고, 판단 근거 요청만 점수가 나온 뒤에 보냄.
+    """
+    title = news_data.title
+
+    # 유사 기사 결과를 그대로 쓰면 LLM에 보내지 않으므로 본문 예산(통계 포함)보다 먼저 확인
+    duplicate = find_near_duplicate(news_data)
+    if duplicate is True:
+        return news_data
+
+    content = fit_content(news_data.content)  # 토큰 예산을 넘는 본문은 문장 단위로 잘라서 프롬프트에 사용
+
+    # 프롬프트 로드
+    prompts = load_prompts()
+
+    priority = article_priority(news_data)
+    if duplicate:
+        summary_result, fs_result = duplicate
+        hs_result = evaluate_score(title, content, prompts["hs"], priority)
+    else:
+        # 요약/카테고리, HS, FS 동시 요청
+        summary_future = llm_executor.submit(get_summary, title, content, prompts["summary"], priority)
+        hs_future = llm_executor.submit(evaluate_score, title, content, prompts["hs"], priority)
+        fs_future = llm_executor.submit(evaluate_score, title, content, prompts["fs"], priority)
+        summary_result, hs_result, fs_result = summary_future.result(), hs_future.result(), fs_future.result()
+
+    hs_score, fs_score = apply_analysis(news_data, summary_result, hs_result, fs_result)
 
     # 판단 근거 요청
-    reasoning_result = get_reasoning(title, content, normalized_hs_score, normalized_fs_score, prompt_reason)
-    news_data["hs_reason"] = reasoning_result["hs_reason"]
-    news_data["fs_reason"] = reasoning_result["fs_reason"]      
+    reasoning_result = get_reasoning(title, content, hs_score, fs_score, prompts["reason"], priority)
+    news_data.hs_reason = reasoning_result["hs_reason"]
+    news_data.fs_reason = reasoning_result["fs_reason"]      
+
+    # 새로 분석한 기사는 이후 유사 기사의 대표 기사로 등록
+    if NEAR_DUP_ENABLED and not duplicate:
+        near_duplicates.add(title, news_data.content, news_data)
+
+    print(f"[info] 분석 완료: {news_data.title}")
+
+    return news_data
+
+
+async def analyze_news_async(news_data):
+    """analyze_news의 비동기 버전 (AsyncOpenAI 사용, 결과 형식 동일)"""
+    title = news_data.title
+
+    duplicate = find_near_duplicate(news_data)
+    if duplicate is True:
+        return news_data
+
+    content = fit_content(news_data.content)
+    prompts = load_prompts()
+
+    priority = article_priority(news_data)
+    if duplicate:
+        summary_result, fs_result = duplicate
+        hs_result = await acached_completion("score", score_request(title, content, prompts["hs"]),
+                                             parse_score_response, priority)
+    else:
+        # 요약/카테고리, HS, FS 동시 요청
+        summary_result, hs_result, fs_result = await asyncio.gather(
+            acached_completion("summary", summary_request(title, content, prompts["summary"]), parse_json_response,
+                               priority),
+            acached_completion("score", score_request(title, content, prompts["hs"]), parse_score_response, priority),
+            acached_completion("score", score_request(title, content, prompts["fs"]), parse_score_response, priority),
+        )
+
+    hs_score, fs_score = apply_analysis(news_data, summary_result, tuple(hs_result), tuple(fs_result))
+
+    # 판단 근거 요청
+    reasoning_result = await acached_completion(
+        "reason", reasoning_request(title, content, hs_score, fs_score, prompts["reason"]), parse_json_response,
+        priority)
+    news_data.hs_reason = reasoning_result["hs_reason"]
+    news_data.fs_reason = reasoning_result["fs_reason"]
+
+    if NEAR_DUP_ENABLED and not duplicate:
+        near_duplicates.add(title, news_data.content, news_data)
 
-    print(f"[info] 분석 완료: {news_data['title']}")
+    print(f"[info] 분석 완료: {news_data.title}")
 
     return news_data
 
@@ -178,7 +441,7 @@ if __name__ == "__main__":
         try:
             with open(file_path, "r", encoding="utf-8") as file:
                 data = json.load(file)
-                news_list.extend(data)  # 리스트에 추가
+                news_list.extend(Article.from_dict(news) for news in data)  # 리스트에 추가
             print(f"[info] {file_path}에서 {len(data)}개의 뉴스 로드 완료")
         except FileNotFoundError:
             print(f"[error] {file_path} 파일을 찾을 수 없습니다. 건너뜁니다.")
@@ -189,17 +452,26 @@ if __name__ == "__main__":
 
     start_time = time.time()  # 시작 시간 측정
 
-    # 뉴스 데이터 하나씩 분석
-    for news in news_list:
-        analyzed_news.append(analyze_news(news))
+    if "--batch" in sys.argv:
+        # OpenAI Batch API로 일괄 분석 (백필/재분석용)
+        from batch_analysis import analyze_news_batch
+        analyzed_news = analyze_news_batch(news_list)
+    else:
+        # 뉴스 데이터 하나씩 분석
+        for news in news_list:
+            analyzed_news.append(analyze_news(news))
 
     elapsed_time = time.time() - start_time  # 걸린 시간 계산
     print(f"\n[info] 분석 완료: {len(analyzed_news)}개의 뉴스 기사 수집 완료")
     print(f"⏱ 분석에 걸린 시간: {elapsed_time:.2f}초")
+    print(f"[info] LLM 캐시: {llm_cache.stats()}")
+    print(f"[info] 유사 기사 재사용: {near_duplicates.stats()}")
+    print(f"[info] LLM 속도 제한: {rate_limiter.stats()}")
+    print(f"[info] 본문 토큰 예산: {content_budget_stats()}")
 
     # 분석 결과 저장
     with open(output_file, "w", encoding="utf-8") as file:
-        json.dump(analyzed_news, file, ensure_ascii=False, indent=4)
+        json.dump([news.to_dict() for news in analyzed_news], file, ensure_ascii=False, indent=4)
     
     print(f"분석 완료! 결과가 {output_file}에 저장되었습니다.")
 
@@ -0,0 +1,179 @@
+# 프롬프트 템플릿 레지스트리. 템플릿을 한 번만 읽어 컴파일하고, 기사 제목/본문을 고정된 지침(prefix) 뒤에 배치
+# 모든 요청의 앞부분이 바이트 단위로 동일해지므로 OpenAI prompt caching(cached prefix)의 대상이 됨
+# 단, prompt caching은 요청 간 공통 앞부분이 PROMPT_CACHE_MIN_TOKENS(1024토큰) 이상일 때만 적중하는데, 현재 템플릿의
+# 고정 지침은 약 390~690토큰(글자 수 기준 추정, `python prompt_registry.py`로 확인)이라 지침이 늘어나기 전까지는 적중하지 않음
+import os
+import re
+import threading
+
+PROMPT_DIR = os.getenv("PROMPT_DIR", "./prompts")
+
+PROMPT_FILES = {
+    "summary": "prompt_summary.txt",
+    "hs": "prompt_hs.txt",
+    "fs": "prompt_fs.txt",
+    "reason": "prompt_reason.txt",
+}
+
+# cached: 고정 지침 뒤에 기사 배치 (기본값), legacy: 기존 템플릿 순서 그대로
+PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", "cached")
+
+# true면 템플릿 파일이 바뀌었을 때 다시 로드
+PROMPT_HOT_RELOAD = os.getenv("PROMPT_HOT_RELOAD", "false").lower() == "true"
+
+PLACEHOLDER = re.compile(r"\{\{(.+?)\}\}")
+
+# OpenAI prompt caching이 적용되는 최소 프롬프트 길이(토큰)
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+
+def _is_cue(line):
+    """출력 신호 문단의 첫 줄인지 ("출력 형식:", "- HS:"처럼 ':'로 끝남)"""
+    return line.rstrip().endswith(":")
+
+
+class PromptTemplate:
+    """
+    템플릿을 고정 지침(static_prefix), 기사 정보 블록(placeholder가 있는 줄), 출력 신호(cue)로 나누어 컴파일.
+    cue는 "출력 형식:"처럼 첫 줄이 ':'로 끝나는 마지막 문단(뒤에 "- HS:"나 JSON 형식이 이어짐)으로,
+    모델이 바로 답하도록 기존 템플릿처럼 항상 맨 마지막에 둠.
+    """
+
+    def __init__(self, name, source, mtime=None):
+        self.name = name
+        self.source = source
+        self.mtime = mtime
+
+        lines = source.split("\n")
+        dynamic_idx = [i for i, line in enumerate(lines) if PLACEHOLDER.search(line)]
+        if not dynamic_idx:
+            raise ValueError(f"{name} 프롬프트에 치환할 항목({{{{...}}}})이 없습니다.")
+
+        first, last = dynamic_idx[0], dynamic_idx[-1]
+        head = lines[:first]
+        block = lines[first:last + 1]
+        tail = lines[last + 1:]
+
+        # 마지막 문단의 첫 줄이 ':'로 끝나면 (예: "출력 형식(오직 점수만 출력):\n- HS:", "출력 형식:\n{...}") 출력 신호로 분리
+        cue = None
+        while tail and not tail[-1].strip():
+            tail = tail[:-1]
+        start = len(tail)
+        while start > 0 and tail[start - 1].strip():
+            start -= 1
+        if start < len(tail) and _is_cue(tail[start]):
+            cue = "\n".join(tail[start:])
+            tail = tail[:start]
+
+        self.static_prefix = "\n".join(head + tail).rstrip("\n") + "\n\n"
+        self.cue = cue
+        self._head, self._tail = "\n".join(head), "\n".join(tail)  # 검증(is_equivalent)용 원래 위치의 지침
+        # 기사 정보 블록은 [문자열, placeholder 이름, 문자열, ...] 형태로 미리 분리
+        self._segments = PLACEHOLDER.split("\n".join(block))
+        self.placeholders = set(self._segments[1::2])
+
+    def render_block(self, values):
+        """기사 정보 블록만 렌더링"""
+        return "".join(str(values[segment]) if i % 2 else segment for i, segment in enumerate(self._segments))
+
+    def render(self, values):
+        """고정 지침 뒤에 기사 정보를 배치하여 렌더링"""
+        prompt = self.static_prefix + self.render_block(values)
+        if self.cue:
+            prompt += "\n\n" + self.cue
+        return prompt
+
+    def prefix_tokens(self):
+        """고정 지침(시스템 프롬프트 제외)의 토큰 수 추정"""
+        from content_budget import count_tokens
+        return count_tokens(self.static_prefix)
+
+    def render_legacy(self, values):
+        """기존 방식(템플릿 순서 그대로 str.replace)으로 렌더링"""
+        prompt = self.source
+        for key, value in values.items():
+            prompt = prompt.replace("{{" + key + "}}", str(value))
+        return prompt
+
+
+def _content_lines(*prompts):
+    """빈 줄을 제외한 줄 목록 (순서 유지)"""
+    return [line.strip() for prompt in prompts if prompt for line in prompt.split("\n") if line.strip()]
+
+
+def is_equivalent(template, values):
+    """
+    캐시용 렌더링이 기존 렌더링의 구간을 순서를 지켜 옮긴 것인지 확인.
+    기존: 앞 지침 + 기사 정보 블록 + 뒤 지침 + cue → 캐시용: 앞 지침 + 뒤 지침 + 기사 정보 블록 + cue
+    (구간 안의 줄 순서와 내용이 같아야 하고, cue는 첫 줄이 ':'로 끝나는 맨 마지막 문단이어야 함)
+    """
+    head, block, tail, cue = template._head, template.render_block(values), template._tail, template.cue
+    if _content_lines(template.render_legacy(values)) != _content_lines(head, block, tail, cue):
+        return False
+    rendered = template.render(values)
+    if _content_lines(rendered) != _content_lines(head, tail, block, cue):
+        return False
+    return cue is None or (rendered.endswith(cue) and _is_cue(cue.split("\n")[0]))
+
+
+class PromptRegistry:
+    """프롬프트 템플릿을 한 번만 로드/컴파일하여 재사용"""
+
+    def __init__(self, prompt_dir=PROMPT_DIR, files=PROMPT_FILES, hot_reload=PROMPT_HOT_RELOAD):
+        self.prompt_dir = prompt_dir
+        self.files = files
+        self.hot_reload = hot_reload
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name):
+        return os.path.join(self.prompt_dir, self.files[name])
+
+    def _load(self, name):
+        path = self._path(name)
+        with open(path, "r", encoding="utf-8") as file:
+            source = file.read()
+        return PromptTemplate(name, source, os.path.getmtime(path))
+
+    def get(self, name):
+        """컴파일된 템플릿 반환 (hot_reload면 파일 변경 시 다시 로드)"""
+        template = self._templates.get(name)
+        if template is not None and not (self.hot_reload and os.path.getmtime(self._path(name)) != template.mtime):
+            return template
+
+        with self._lock:
+            template = self._load(name)
+            self._templates[name] = template
+            if self.hot_reload:
+                print(f"[info] 프롬프트 로드: {name}")
+        return template
+
+
+registry = PromptRegistry()
+
+
+def render_prompt(prompt, values):
+    """템플릿(PromptTemplate 또는 템플릿 문자열)에 값을 채워 렌더링"""
+    if isinstance(prompt, str):
+        prompt = PromptTemplate("inline", prompt)
+    if PROMPT_LAYOUT == "legacy":
+        return prompt.render_legacy(values)
+    return prompt.render(values)
+
+
+# 렌더링 결과 검증: 모든 템플릿에 대해 기존 렌더링과 내용이 같은지, prefix가 기사와 무관하게 동일한지 확인
+if __name__ == "__main__":
+    samples = [
+        {"제목": "테스트 제목", "본문": "첫 번째 문장입니다.\n두 번째 문장입니다.", "hs": 75.0, "fs": 50.0},
+        {"제목": "다른 기사", "본문": "완전히 다른 본문.", "hs": 10.0, "fs": 90.0},
+    ]
+
+    for name in PROMPT_FILES:
+        template = registry.get(name)
+        equivalent = all(is_equivalent(template, values) for values in samples)
+        prefixes = {template.render(values)[:len(template.static_prefix)] for values in samples}
+        tokens = template.prefix_tokens()
+        print(f"[info] {name}: 내용 동일={equivalent}, prefix 고정={len(prefixes) == 1}, "
+              f"prefix 길이={len(template.static_prefix)}자(약 {tokens}토큰, 캐시 최소 {PROMPT_CACHE_MIN_TOKENS}토큰 "
+              f"{'이상' if tokens >= PROMPT_CACHE_MIN_TOKENS else '미달'}), "
+              f"기사 뒤 지침 {len(_content_lines(template._tail))}줄 이동, cue={template.cue!r}")
@@ -0,0 +1,161 @@
+# OpenAI 호출용 클라이언트 측 속도 제한기. 요청 수(RPM)와 토큰 수(TPM)를 토큰 버킷으로 관리
+# 대기 중인 요청은 우선순위(신선한 기사 우선) 순서로 처리하고, 429 응답을 받으면 retry-after만큼 멈춘 뒤 속도를 줄였다가 서서히 회복
+import os
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import threading
+
+LLM_RPM = int(os.getenv("LLM_RPM", "5000"))  # 분당 요청 수 한도
+LLM_TPM = int(os.getenv("LLM_TPM", "2000000"))  # 분당 토큰 수 한도
+LLM_CHARS_PER_TOKEN = float(os.getenv("LLM_CHARS_PER_TOKEN", "1.5"))  # 한국어 기준 토큰당 글자 수 추정치
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+
+MIN_RATE_FACTOR = 0.1  # 429가 반복되어도 한도의 10% 밑으로는 줄이지 않음
+RATE_DECREASE = 0.5  # 429마다 속도를 절반으로
+RATE_INCREASE = 0.02  # 성공할 때마다 한도의 2%씩 회복
+MAX_BACKOFF = 60  # 초
+
+
+class TokenBucket:
+    """capacity만큼 쌓이고 초당 rate만큼 채워지는 버킷 (잔량이 음수가 되면 빚으로 처리)"""
+
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.level = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now, factor=1.0):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate * factor)
+        self.updated = now
+
+    def wait_time(self, amount, factor=1.0):
+        """amount만큼 꺼내려면 기다려야 하는 시간(초)"""
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0
+        return (amount - self.level) / (self.rate * factor)
+
+    def consume(self, amount):
+        self.level -= amount
+
+
+def estimate_tokens(request, chars_per_token=LLM_CHARS_PER_TOKEN):
+    """요청 파라미터로 사용할 토큰 수 추정 (프롬프트 글자 수 기반 + 최대 출력 토큰)"""
+    chars = sum(len(message["content"]) for message in request.get("messages", []))
+    return int(chars / chars_per_token) + request.get("max_tokens", 0)
+
+
+def retry_after_seconds(headers, attempt):
+    """429 응답의 retry-after 헤더(없으면 지수 백오프) 기준 대기 시간"""
+    if headers is not None:
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except ValueError:
+            pass
+    return min(MAX_BACKOFF, 2 ** attempt) * (0.5 + random.random() / 2)
+
+
+class RateLimiter:
+    """요청/토큰 버킷을 공유하는 우선순위 기반 속도 제한기 (스레드와 asyncio 양쪽에서 사용)"""
+
+    def __init__(self, rpm=LLM_RPM, tpm=LLM_TPM):
+        self.requests = TokenBucket(rpm, rpm / 60)
+        self.tokens = TokenBucket(tpm, tpm / 60)
+        self.rate_factor = 1.0
+        self.paused_until = 0
+        self.rate_limited = 0
+        self._cond = threading.Condition()
+        self._waiting = []  # (우선순위, 순번) heap
+        self._seq = itertools.count()
+
+    def _try_acquire(self, ticket, tokens):
+        """ticket 차례이고 버킷에 여유가 있으면 차감 후 0, 아니면 기다릴 시간(차례가 아니면 None)"""
+        if self._waiting[0] is not ticket:
+            return None
+
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+
+        self.requests.refill(now, self.rate_factor)
+        self.tokens.refill(now, self.rate_factor)
+        wait = max(self.requests.wait_time(1, self.rate_factor), self.tokens.wait_time(tokens, self.rate_factor))
+        if wait > 0:
+            return wait
+
+        self.requests.consume(1)
+        self.tokens.consume(min(tokens, self.tokens.capacity))
+        heapq.heappop(self._waiting)
+        self._cond.notify_all()
+        return 0
+
+    def _enter(self, priority):
+        ticket = (-priority if priority is not None else 0, next(self._seq))
+        heapq.heappush(self._waiting, ticket)
+        return ticket
+
+    def _leave(self, ticket):
+        """대기 중 예외/취소된 ticket 제거"""
+        if ticket in self._waiting:
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            self._cond.notify_all()
+
+    def acquire(self, tokens, priority=None):
+        """요청 1개와 tokens만큼의 여유가 생길 때까지 대기 (priority가 클수록 먼저 처리)"""
+        with self._cond:
+            ticket = self._enter(priority)
+            try:
+                while True:
+                    wait = self._try_acquire(ticket, tokens)
+                    if wait == 0:
+                        return
+                    self._cond.wait(wait)
+            except BaseException:
+                self._leave(ticket)
+                raise
+
+    async def acquire_async(self, tokens, priority=None):
+        """acquire의 비동기 버전 (이벤트 루프를 막지 않고 대기)"""
+        with self._cond:
+            ticket = self._enter(priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_acquire(ticket, tokens)
+                if wait == 0:
+                    return
+                await asyncio.sleep(wait if wait is not None else 0.01)
+        except BaseException:
+            with self._cond:
+                self._leave(ticket)
+            raise
+
+    def on_success(self, estimated, usage=None):
+        """실제 사용 토큰으로 추정치를 보정하고 속도를 조금씩 회복"""
+        with self._cond:
+            if usage is not None and usage.total_tokens:
+                self.tokens.consume(usage.total_tokens - estimated)
+            self.rate_factor = min(1.0, self.rate_factor + RATE_INCREASE)
+
+    def on_rate_limited(self, wait):
+        """429 응답을 받으면 모든 요청을 wait초 동안 멈추고 속도를 낮춤"""
+        with self._cond:
+            self.rate_limited += 1
+            self.paused_until = max(self.paused_until, time.monotonic() + wait)
+            self.rate_factor = max(MIN_RATE_FACTOR, self.rate_factor * RATE_DECREASE)
+            self._cond.notify_all()
+
+    def stats(self):
+        return {"rate_limited": self.rate_limited, "rate_factor": round(self.rate_factor, 2),
+                "waiting": len(self._waiting)}
+
+
+rate_limiter = RateLimiter()
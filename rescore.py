@@ -0,0 +1,81 @@
+# 저장된 HS/FS 확률 분포로 전체 뉴스의 점수를 다시 계산 (LLM 재호출 없음)
+# 점수 공식/범위가 바뀌었을 때 news 테이블 전체를 한 번의 행렬 연산으로 재채점한 뒤 일괄 UPDATE
+# 사용법: python rescore.py [--old-range 1 5] [--new-range 0 100] [--dry-run]
+import argparse
+import time
+import numpy as np
+from sqlalchemy import text
+from score_probs import SCORE_TOKENS, ensure_score_probs_table
+
+UPDATE_SCORES_SQL = text("""
+    UPDATE news SET headline_score = :headline_score, fact_score = :fact_score
+    WHERE news_id = :news_id
+""")
+
+
+def load_probs(engine):
+    """news_score_probs 전체를 (news_id 배열, HS 분포 행렬, FS 분포 행렬)로 로드"""
+    with engine.connect() as connection:
+        rows = connection.execute(text(
+            "SELECT news_id, headline_probs, fact_probs FROM news_score_probs ORDER BY news_id"
+        )).fetchall()
+
+    news_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    width = len(SCORE_TOKENS)
+    headline = np.frombuffer(b"".join(bytes(row[1]) for row in rows), dtype="<u2").reshape(-1, width) / 65535
+    fact = np.frombuffer(b"".join(bytes(row[2]) for row in rows), dtype="<u2").reshape(-1, width) / 65535
+    return news_ids, headline, fact
+
+
+def compute_scores(probs, token_values=None, old_range=(1, 5), new_range=(0, 100)):
+    """calculate_score + normalize_score를 (N, 5) 확률 행렬에 대해 한 번에 계산"""
+    if token_values is None:
+        token_values = np.array([int(token) for token in SCORE_TOKENS], dtype=np.float64)
+
+    raw = probs @ token_values
+    old_min, old_max = old_range
+    new_min, new_max = new_range
+    normalized = (raw - old_min) / (old_max - old_min) * (new_max - new_min) + new_min
+    return np.clip(np.round(normalized, 2), new_min, new_max)
+
+
+def rescore(engine, old_range=(1, 5), new_range=(0, 100), chunk_size=1000, dry_run=False):
+    """전체 뉴스 점수를 재계산하여 news 테이블에 일괄 반영, 재채점한 뉴스 수 반환"""
+    ensure_score_probs_table(engine)
+
+    start = time.perf_counter()
+    news_ids, headline, fact = load_probs(engine)
+    if len(news_ids) == 0:
+        print("[info] 재채점할 데이터가 없습니다.")
+        return 0
+
+    headline_scores = compute_scores(headline, old_range=old_range, new_range=new_range)
+    fact_scores = compute_scores(fact, old_range=old_range, new_range=new_range)
+    print(f"[info] {len(news_ids)}건 점수 계산 완료 ({time.perf_counter() - start:.2f}초)")
+
+    if dry_run:
+        print(f"[info] dry-run: HS 평균 {headline_scores.mean():.2f}, FS 평균 {fact_scores.mean():.2f}")
+        return len(news_ids)
+
+    rows = [
+        {"news_id": int(news_id), "headline_score": float(hs), "fact_score": float(fs)}
+        for news_id, hs, fs in zip(news_ids, headline_scores, fact_scores)
+    ]
+    for offset in range(0, len(rows), chunk_size):
+        with engine.begin() as connection:
+            connection.execute(UPDATE_SCORES_SQL, rows[offset:offset + chunk_size])
+
+    print(f"[info] 재채점 완료: {len(rows)}건 ({time.perf_counter() - start:.2f}초)")
+    return len(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 확률 분포로 HS/FS 점수 재계산")
+    parser.add_argument("--old-range", nargs=2, type=float, default=(1, 5), help="원점수 범위")
+    parser.add_argument("--new-range", nargs=2, type=float, default=(0, 100), help="정규화 점수 범위")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="UPDATE 한 번에 반영할 행 수")
+    parser.add_argument("--dry-run", action="store_true", help="DB에 반영하지 않고 계산만 수행")
+    args = parser.parse_args()
+
+    from db import engine
+    rescore(engine, tuple(args.old_range), tuple(args.new_range), args.chunk_size, args.dry_run)
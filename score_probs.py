@@ -0,0 +1,48 @@
+# HS/FS 점수 토큰(1~5)의 확률 분포를 압축 저장하기 위한 유틸
+# 확률을 uint16으로 양자화하여 분포 하나를 10바이트로 저장 (오차 1/65535 이하)
+import struct
+from sqlalchemy import text
+
+SCORE_TOKENS = ("1", "2", "3", "4", "5")
+_PACK_FORMAT = "<5H"
+_SCALE = 65535
+
+# 뉴스별 HS/FS 확률 분포 테이블
+CREATE_SCORE_PROBS_SQL = text("""
+    CREATE TABLE IF NOT EXISTS news_score_probs (
+        news_id BIGINT PRIMARY KEY,
+        headline_probs VARBINARY(10) NOT NULL,
+        fact_probs VARBINARY(10) NOT NULL
+    )
+""")
+
+INSERT_SCORE_PROBS_SQL = text("""
+    INSERT INTO news_score_probs (news_id, headline_probs, fact_probs)
+    VALUES (:news_id, :headline_probs, :fact_probs)
+""")
+
+
+def pack_probs(token_probs):
+    """{"1": p1, ..., "5": p5} 형태의 확률 분포를 10바이트로 압축"""
+    return struct.pack(_PACK_FORMAT, *(round(min(1.0, max(0.0, token_probs.get(token, 0))) * _SCALE)
+                                       for token in SCORE_TOKENS))
+
+
+def unpack_probs(data):
+    """압축된 확률 분포를 {"1": p1, ..., "5": p5} 형태로 복원"""
+    return {token: value / _SCALE for token, value in zip(SCORE_TOKENS, struct.unpack(_PACK_FORMAT, data))}
+
+
+def score_probs_row(news_id, news_data):
+    """news_score_probs 테이블에 저장할 행 (Article은 이미 압축된 확률 분포를 가지고 있음)"""
+    return {
+        "news_id": news_id,
+        "headline_probs": news_data.headline_score_probs,
+        "fact_probs": news_data.fact_score_probs,
+    }
+
+
+def ensure_score_probs_table(engine):
+    """news_score_probs 테이블이 없으면 생성"""
+    with engine.begin() as connection:
+        connection.execute(CREATE_SCORE_PROBS_SQL)
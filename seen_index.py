@@ -0,0 +1,101 @@
+# 이미 저장된 기사 URL의 영구 인덱스. 본문 수집/LLM 분석 전에 확인하여 재등장한 기사에 비용을 쓰지 않도록 함
+import os
+import hashlib
+import threading
+from checkpoint import load_state, save_state
+
+SEEN_INDEX_PATH = os.getenv("SEEN_INDEX_PATH", "./checkpoints/seen_urls.bin")
+
+HASH_SIZE = 8  # URL당 8바이트 해시만 저장
+
+
+def url_hash(url):
+    """URL을 8바이트 정수 해시로 변환"""
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=HASH_SIZE).digest()
+    return int.from_bytes(digest, "big")
+
+
+class SeenIndex:
+    """URL 해시를 append-only 파일에 기록하는 디스크 기반 해시 집합"""
+
+    def __init__(self, path):
+        self.path = path
+        self.state_path = f"{path}.json"  # DB에서 워밍한 마지막 news_id 기록
+        self._hashes = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """파일에 저장된 해시를 메모리로 로드"""
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return
+
+        # 중간에 종료되어 잘린 마지막 레코드는 무시
+        end = len(data) - len(data) % HASH_SIZE
+        for offset in range(0, end, HASH_SIZE):
+            self._hashes.add(int.from_bytes(data[offset:offset + HASH_SIZE], "big"))
+
+    def __contains__(self, url):
+        return bool(url) and url_hash(url) in self._hashes
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add(self, *urls):
+        """URL을 인덱스에 추가하고 파일에 기록"""
+        with self._lock:
+            new_hashes = []
+            for url in urls:
+                if not url:
+                    continue
+                hashed = url_hash(url)
+                if hashed not in self._hashes:
+                    self._hashes.add(hashed)
+                    new_hashes.append(hashed)
+
+            if not new_hashes:
+                return
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "ab") as file:
+                file.write(b"".join(hashed.to_bytes(HASH_SIZE, "big") for hashed in new_hashes))
+
+    def warm(self, rows):
+        """(news_id, url, naver_url) 행으로 인덱스를 채우고 마지막 news_id 기록"""
+        state = load_state(self.state_path, {"last_news_id": 0})
+        count = 0
+        urls = []
+
+        for news_id, url, naver_url in rows:
+            urls.extend((url, naver_url))
+            state["last_news_id"] = max(state["last_news_id"], news_id)
+            count += 1
+            if len(urls) >= 10000:
+                self.add(*urls)
+                urls = []
+
+        self.add(*urls)
+        save_state(self.state_path, state)
+        return count
+
+    def last_warmed_id(self):
+        """DB에서 워밍한 마지막 news_id"""
+        return load_state(self.state_path, {"last_news_id": 0})["last_news_id"]
+
+
+seen_index = SeenIndex(SEEN_INDEX_PATH)
+
+
+def is_seen(news):
+    """뉴스의 네이버 URL 또는 원문 URL이 이미 저장된 적이 있는지 확인"""
+    return news.naver_url in seen_index or news.url in seen_index
+
+
+def mark_seen(news):
+    """저장된 뉴스의 URL을 인덱스에 기록"""
+    seen_index.add(news.url, news.naver_url)
@@ -1,9 +1,10 @@
 # 네이버 스포츠 크롤러
+import os
 import requests
-from bs4 import BeautifulSoup
 import datetime, json, random, time, re
 from datetime import datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from article import Article
 
 #https://api-gw.sports.naver.com/news/scs/series?contentSort=contentId%3ADESC&size=18&page=2&contentSize=3&hasTotalCount=true&publishingType=SPORTS&serviceExposure=SE999
 
@@ -23,14 +24,22 @@ header = {
   'Referer': 'https://m.sports.naver.com/column/press/columnist?categoryId=ALL',
 }
 
-# 네이버 스포츠 리스트 가져오기
-def get_sports_list(page):
+# 벤치마크 등에서 로컬 재현 서버로 바꿀 수 있도록 API 호스트를 환경 변수로 지정
+SPORTS_API_BASE = os.getenv("NAVER_SPORTS_API_BASE", "https://api-gw.sports.naver.com")
+SPORTS_LIST_URL = SPORTS_API_BASE + '/news/scs/series?page={page}&sort=lastModifiedContentDate%3ADESC&contentSort=contentId%3ADESC&contentSize=3&hasTotalCount=true&publishingType=SPORTS&serviceExposure=SE001&size=18&nocache={timestamp}'
+SPORTS_API_ARTICLE_PREFIX = SPORTS_API_BASE + '/news/article/'
+
+# 네이버 스포츠 리스트 URL 생성
+def sports_list_url(page):
     timestamp = int(time.time())
-    today = datetime.now().strftime("%Y%m%d")
-    
-    url = f'https://api-gw.sports.naver.com/news/scs/series?page={page}&sort=lastModifiedContentDate%3ADESC&contentSort=contentId%3ADESC&contentSize=3&hasTotalCount=true&publishingType=SPORTS&serviceExposure=SE001&size=18&nocache={timestamp}'
-    response = requests.get(url, headers=header)
-    json_data = response.json()
+    return SPORTS_LIST_URL.format(page=page, timestamp=timestamp)
+
+# 네이버 스포츠 기사 API URL 생성
+def sports_article_url(data):
+    return re.sub(r'https://m.sports.naver.com/[^/]+/article/', SPORTS_API_ARTICLE_PREFIX, data.naver_url).replace('?type=series&cid=', '?cid=')
+
+# 네이버 스포츠 리스트 JSON 파싱 (동기/비동기 크롤러 공용), fresh_only=False면 시간 조건 없이 페이지 전체 반환
+def parse_sports_list(json_data, fresh_only=True):
     sports_list = json_data['result']['contents']
 
     result = []
@@ -38,35 +47,49 @@ def get_sports_list(page):
         for item in sports['packItemContents']:
             # 2분 이상 지난 기사면 크롤링하지 않음
             _time = datetime.now(timezone.utc) - datetime.fromisoformat(item['createdDate'].rstrip('Z')).replace(tzinfo=timezone.utc)
-            if _time >= timedelta(minutes=2):
+            if fresh_only and _time >= timedelta(minutes=2):
                 continue
-            result.append({
-                'url': item['orgUrl']['pc'],
-                'naverUrl': item['linkUrl'],
-                'image_url': item['imageUrl'],
-                'news_type': "sport",
-            })
+            result.append(Article.listed(
+                url=item['orgUrl']['pc'],
+                naver_url=item['linkUrl'],
+                image_url=item['imageUrl'],
+                news_type="sport",
+                created_date=item['createdDate'],
+            ))
     return result
 
+# 네이버 스포츠 리스트 가져오기
+def get_sports_list(page, fresh_only=True):
+    response = requests.get(sports_list_url(page), headers=header)
+    return parse_sports_list(response.json(), fresh_only)
+
+# 네이버 스포츠 기사 JSON 파싱 (동기/비동기 크롤러 공용)
+def parse_sports(json_data, data):
+    try:
+        article = json_data['result']['articleInfo']['article']
+
+        return Article(
+            url=data.url,
+            naver_url=data.naver_url,
+            title=article['title'],
+            content=article['refinedContent'],
+            image_url=data.image_url,
+            media_name=json_data['result']['officeInfo']['hname'],
+            news_type=data.news_type,
+            created_date=data.created_date,
+            listed_at=data.listed_at
+        )
+    except:
+        return None
+
 # 네이버 스포츠 기사 가져오기
 def get_sports(data):
-    url = re.sub(r'https://m.sports.naver.com/[^/]+/article/', 'https://api-gw.sports.naver.com/news/article/', data['naverUrl']).replace('?type=series&cid=', '?cid=')
     try:
-        response = requests.get(url, headers=header)
+        response = requests.get(sports_article_url(data), headers=header)
         json_data = response.json()
-        article = json_data['result']['articleInfo']['article']
-
-        return {
-            'url': data['url'],
-            'naverUrl': data['naverUrl'],
-            'title': article['title'],
-            'content': article['refinedContent'],
-            'image_url': data['image_url'],
-            'mediaName': json_data['result']['officeInfo']['hname'],
-            "news_type": data["news_type"]
-        }
     except:
         return None
+    return parse_sports(json_data, data)
     
 
 if __name__ == "__main__":
@@ -84,7 +107,7 @@ if __name__ == "__main__":
         for future in as_completed(futures):
           data = future.result()
           if data:
-              result.append(data)
+              result.append(data.to_dict())
 
     with open('sport.json', 'w', encoding='utf-8') as f:
       json.dump(result, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,91 @@
+# 저장소 루트의 모듈(watermark, db 등)을 테스트에서 바로 import할 수 있도록 경로 추가
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine, text  # noqa: E402
+import seen_index  # noqa: E402
+from article import Article  # noqa: E402
+from score_probs import ensure_score_probs_table, pack_probs  # noqa: E402
+
+# 운영 MySQL의 news, news_content 테이블과 같은 컬럼 (본문은 NOT NULL로 두어 개별 저장 실패를 만들 수 있게 함)
+SCHEMA = [
+    """CREATE TABLE news (
+        news_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT UNIQUE, naver_url TEXT, title TEXT, summary TEXT, image_url TEXT, media_name TEXT,
+        category TEXT, headline_score REAL, fact_score REAL,
+        headline_score_reason TEXT, fact_score_reason TEXT,
+        like_count INTEGER, hate_count INTEGER, comment_count INTEGER, view_count INTEGER,
+        rating_count INTEGER, total_rating_sum INTEGER
+    )""",
+    "CREATE TABLE news_content (news_id INTEGER PRIMARY KEY, content TEXT NOT NULL)",
+]
+
+
+@pytest.fixture(autouse=True)
+def seen_urls(tmp_path, monkeypatch):
+    """저장 경로가 기록하는 seen 인덱스를 테스트마다 임시 파일로 (./checkpoints의 중복 제거 상태를 건드리지 않음)"""
+    index = seen_index.SeenIndex(str(tmp_path / "seen_urls.bin"))
+    monkeypatch.setattr(seen_index, "seen_index", index)
+    return index
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'news.sqlite3'}")
+    with engine.begin() as connection:
+        for statement in SCHEMA:
+            connection.execute(text(statement))
+    ensure_score_probs_table(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def rows(engine):
+    """engine에서 SQL을 실행하여 모든 행 반환"""
+    def query(sql):
+        with engine.connect() as connection:
+            return connection.execute(text(sql)).fetchall()
+    return query
+
+
+@pytest.fixture
+def analyzed():
+    """분석까지 끝난 뉴스 (index별로 URL이 다름)"""
+    def make(index, content="본문"):
+        return Article(
+            url=f"https://www.example.co.kr/{index}", naver_url=f"https://n.news.naver.com/{index}",
+            news_type="news", title=f"제목 {index}", content=content, media_name="연합뉴스",
+            summary="요약", category="사회", headline_score=50.0, fact_score=75.0,
+            headline_score_probs=pack_probs({"3": 1.0}), fact_score_probs=pack_probs({"4": 0.5, "5": 0.5}),
+            hs_reason="제목 근거", fs_reason="본문 근거",
+        )
+    return make
+
+
+class FakeList:
+    """페이지별 기사 목록을 돌려주는 리스트 함수 (fresh_only=True면 fresh 목록 사용, 요청 수 집계)"""
+
+    def __init__(self, pages, fresh=None):
+        self.pages = pages
+        self.fresh = fresh or {}
+        self.calls = []
+
+    def __call__(self, page, fresh_only=True):
+        self.calls.append((page, fresh_only))
+        source = self.fresh if fresh_only else self.pages
+        return list(source.get(page, []))
+
+
+@pytest.fixture
+def fake_list():
+    return FakeList
+
+
+@pytest.fixture
+def news():
+    """리스트에서 받은 뉴스 (index별로 네이버 URL이 다름)"""
+    return lambda index: Article(naver_url=f"https://n.news.naver.com/list/{index}", news_type="news")
@@ -0,0 +1,98 @@
+import json
+import pytest
+from adaptive_poll import AdaptivePoller
+
+
+def poller(path=None):
+    # 고정 정책: 60초마다 3페이지
+    return AdaptivePoller({"news": 3}, base_interval=60, min_interval=30, max_interval=300, max_pages=20,
+                          alpha=0.3, target_pages=0.5, headroom=2, path=path)
+
+
+def test_first_poll_keeps_base_plan():
+    adaptive = poller()
+
+    assert adaptive.observe("news", 20, 1, True, 20, now=0) == 60
+    assert adaptive.plan("news") == (60, 3)
+    assert adaptive.sources["news"]["rate"] is None
+
+
+def test_rate_is_ewma_of_observed_publish_rate():
+    adaptive = poller()
+    adaptive.observe("news", 0, 1, True, 20, now=0)
+
+    adaptive.observe("news", 10, 1, True, 20, now=60)  # 첫 관측은 그대로 사용
+    assert adaptive.sources["news"]["rate"] == pytest.approx(10)
+    assert adaptive.plan("news") == pytest.approx((60, 3))  # 0.5페이지(10건) 모이는 시간, 깊이는 기본 이상
+
+    adaptive.observe("news", 20, 1, True, 20, now=90)  # 30초에 20건 = 40건/분
+    assert adaptive.sources["news"]["rate"] == pytest.approx(0.3 * 40 + 0.7 * 10)
+    assert adaptive.plan("news")[0] == pytest.approx(10 / (19 / 60))
+
+
+def test_page_size_is_ewma_of_observed_page_size():
+    adaptive = poller()
+    adaptive.observe("news", 0, 1, True, 10, now=0)
+    adaptive.observe("news", 0, 1, True, None, now=60)  # 페이지를 관측하지 못하면 유지
+
+    assert adaptive.sources["news"]["page_size"] == pytest.approx(0.3 * 10 + 0.7 * 20)
+
+
+def poll_until_overflow(adaptive):
+    adaptive.observe("news", 0, 1, True, 20, now=0)
+    adaptive.observe("news", 20, 1, True, 20, now=60)  # 20건/분
+    # 깊이를 다 써도 워터마크에 닿지 못함
+    adaptive.observe("news", 40, 3, False, 20, now=120)
+
+
+def test_overflow_polls_again_at_max_depth():
+    adaptive = poller()
+    poll_until_overflow(adaptive)
+
+    state = adaptive.sources["news"]
+    assert adaptive.plan("news") == (30, 20)
+    assert state["overflows"] == 1 and state["gap"] == (60, 40)
+    assert state["rate"] == pytest.approx(0.3 * 40 + 0.7 * 20)  # 관측은 하한, 기존 게시량보다 낮추지 않음
+
+
+def test_missed_articles_estimated_when_watermark_reached_again():
+    adaptive = poller()
+    poll_until_overflow(adaptive)
+
+    adaptive.observe("news", 30, 2, True, 20, now=150)  # 30초에 30건 = 60건/분
+
+    state = adaptive.sources["news"]
+    assert state["gap"] is None
+    assert state["missed"] == pytest.approx(60 * 60 / 60 - 40)  # 60초 동안 60건 중 40건만 수집
+    assert adaptive.stats()["news"]["missed_rate"] == pytest.approx(20 / (90 + 20), abs=1e-4)
+
+
+def test_interval_and_depth_are_clamped():
+    busy = poller()
+    busy.observe("news", 0, 1, True, 20, now=0)
+    busy.observe("news", 1000, 20, True, 20, now=60)
+    assert busy.plan("news") == (30, 20)
+
+    idle = poller()
+    idle.observe("news", 0, 1, True, 20, now=0)
+    idle.observe("news", 0, 1, True, 20, now=60)
+    assert idle.plan("news") == (300, 3)  # 기본 깊이보다 얕아지지 않음
+
+
+def test_state_survives_restart(tmp_path):
+    path = str(tmp_path / "adaptive_poll.json")
+    poll_until_overflow(poller(path))
+
+    with open(path, encoding="utf-8") as file:
+        assert json.load(file)["news"]["gap"] == [60, 40]  # JSON에는 리스트로 저장
+
+    restarted = poller(path)
+    assert restarted.plan("news") == (30, 20)
+    restarted.observe("news", 30, 2, True, 20, now=150)
+
+    uninterrupted = poller()
+    poll_until_overflow(uninterrupted)
+    uninterrupted.observe("news", 30, 2, True, 20, now=150)
+
+    assert restarted.stats() == uninterrupted.stats()
+    assert restarted.sources["news"]["missed"] == pytest.approx(20)
@@ -0,0 +1,71 @@
+import json
+import pytest
+from article import FIELDS, Article
+from score_probs import pack_probs, unpack_probs
+
+
+def full_article():
+    return Article(
+        naver_url="https://n.news.naver.com/mnews/article/001/0000000001", news_type="news",
+        url="https://www.example.co.kr/1", image_url="https://imgnews.pstatic.net/1.jpg", media_name="연합뉴스",
+        created_date="2024-05-01 12:00:00", listed_at=1714532400.5, title="제목", content="본문",
+        summary="요약", category="사회",
+        headline_score=62.5, headline_score_origin=3.5, headline_score_probs=pack_probs({"3": 0.5, "4": 0.5}),
+        fact_score=80.12, fact_score_origin=4.2048,
+        fact_score_probs=pack_probs({"1": 0.0123, "4": 0.7, "5": 0.2877}),
+        hs_reason="제목 근거", fs_reason="본문 근거",
+    )
+
+
+def fields(article):
+    return {name: getattr(article, name) for name in FIELDS}
+
+
+def test_round_trip_through_json():
+    article = full_article()
+
+    data = json.loads(json.dumps(article.to_dict(), ensure_ascii=False))
+    restored = Article.from_dict(data)
+
+    assert fields(restored) == fields(article)
+    assert data["headline_score_probs"] == pytest.approx({"1": 0, "2": 0, "3": 0.5, "4": 0.5, "5": 0}, abs=1e-4)
+
+
+def test_to_dict_skips_missing_fields():
+    article = Article(naver_url="https://n.news.naver.com/1", news_type="sport", title="제목")
+
+    assert article.to_dict() == {"naver_url": "https://n.news.naver.com/1", "news_type": "sport", "title": "제목"}
+    assert fields(Article.from_dict(article.to_dict())) == fields(article)
+
+
+def test_from_dict_reads_legacy_keys():
+    article = Article.from_dict({
+        "naverUrl": "https://n.news.naver.com/1", "news_type": "enter", "mediaName": "스포츠신문",
+        "createdDate": "2024-05-01", "title": "제목", "views": 10,  # 모르는 키는 무시
+    })
+
+    assert (article.naver_url, article.media_name, article.created_date) == (
+        "https://n.news.naver.com/1", "스포츠신문", "2024-05-01")
+    assert "naverUrl" not in article.to_dict()
+
+
+def test_from_dict_packs_probs():
+    packed = pack_probs({"2": 0.25, "5": 0.75})
+
+    from_probs = Article.from_dict({"fact_score_probs": {"2": 0.25, "5": 0.75}})
+    from_packed = Article.from_dict({"fact_score_probs": packed})  # 이미 압축된 값은 그대로
+
+    assert from_probs.fact_score_probs == from_packed.fact_score_probs == packed
+    assert unpack_probs(from_probs.fact_score_probs)["5"] == pytest.approx(0.75, abs=1e-5)
+
+
+def test_categorical_fields_are_interned():
+    first = Article(media_name="".join(["연합", "뉴스"]), category="".join(["사", "회"]))
+    second = Article.from_dict({"mediaName": "".join(["연합", "뉴스"]), "category": "".join(["사", "회"])})
+
+    assert first.media_name is second.media_name and first.category is second.category
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(TypeError):
+        Article(naverUrl="https://n.news.naver.com/1")
@@ -0,0 +1,28 @@
+import asyncio
+import async_crawler
+from article import Article
+
+
+def listed(news_type, index):
+    return Article(naver_url=f"https://n.news.naver.com/{news_type}/{index}", news_type=news_type)
+
+
+def test_seen_articles_are_not_fetched(monkeypatch):
+    saved = {listed("news", 1).naver_url, listed("sport", 2).naver_url}
+    fetched = []
+
+    async def crawl_list(session, news_type, max_pages=None):
+        return [listed(news_type, index) for index in range(3)] + [listed("news", 0)]  # 소스 간 중복 포함
+
+    async def fetch_detail(session, news):
+        fetched.append(news.naver_url)
+        return news
+
+    monkeypatch.setattr(async_crawler, "crawl_list", crawl_list)
+    monkeypatch.setattr(async_crawler, "fetch_detail", fetch_detail)
+    monkeypatch.setattr(async_crawler, "is_seen", lambda news: news.naver_url in saved)
+
+    results = asyncio.run(async_crawler.crawl_all(("news", "sport")))
+
+    assert sorted(fetched) == sorted(news.naver_url for news in results)
+    assert len(fetched) == 4 and not saved & set(fetched)
@@ -0,0 +1,71 @@
+import pytest
+import postprocess
+import batch_analysis
+from article import Article
+from benchmarks import fake_openai
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    server, state = fake_openai.start_server()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(postprocess, "OPENAI_API_KEY", "test-key")
+    monkeypatch.delitem(vars(postprocess), "client", raising=False)  # 가짜 서버 주소로 새로 생성
+    monkeypatch.setattr(batch_analysis, "LLM_CACHE_ENABLED", False)
+    yield state
+    monkeypatch.delitem(vars(postprocess), "client", raising=False)
+    server.shutdown()
+
+
+def test_import_does_not_create_client():
+    assert "client" not in vars(batch_analysis)
+
+
+def test_analyze_news_batch_against_fake_batch_api(fake_client):
+    news_list = [Article(naver_url=f"https://n.news.naver.com/{i}", news_type="news", title=f"제목 {i}",
+                         content=f"{i}번째 기사 본문입니다. 배치 분석 경로를 확인합니다.") for i in range(3)]
+
+    analyzed = batch_analysis.analyze_news_batch(news_list, poll_interval=0)
+
+    assert analyzed == news_list
+    for news in analyzed:
+        assert news.summary == "가짜 요약입니다." and news.category
+        assert 1 <= news.headline_score_origin <= 5 and 1 <= news.fact_score_origin <= 5
+        assert len(news.headline_score_probs) == 10 and len(news.fact_score_probs) == 10
+        assert news.hs_reason and news.fs_reason
+    # 1차(요약/HS/FS)와 2차(판단 근거) batch 두 개
+    assert len(fake_client.batches) == 2
+
+
+def test_all_chunks_submitted_before_polling(fake_client, monkeypatch):
+    events = []
+    submit, wait = batch_analysis.submit_batch, batch_analysis.wait_for_batch
+    monkeypatch.setattr(batch_analysis, "BATCH_MAX_REQUESTS", 2)
+    monkeypatch.setattr(batch_analysis, "submit_batch",
+                        lambda *args: events.append("submit") or submit(*args))
+    monkeypatch.setattr(batch_analysis, "wait_for_batch",
+                        lambda *args: events.append("wait") or wait(*args))
+    tasks = {f"{i}:summary": ("summary", postprocess.summary_request(f"제목 {i}", "본문", "{{본문}}"),
+                              postprocess.parse_json_response) for i in range(5)}
+
+    parsed = batch_analysis.run_batch(tasks, "analysis", poll_interval=0)
+
+    assert set(parsed) == set(tasks)
+    assert events == ["submit"] * 3 + ["wait"] * 3
+
+
+def test_both_rounds_use_the_same_trimmed_content(fake_client, monkeypatch):
+    trimmed = []
+    monkeypatch.setattr(batch_analysis, "fit_content",
+                        lambda content: trimmed.append(content) or f"잘린 본문 {len(trimmed)}")
+    news_list = [Article(naver_url=f"https://n.news.naver.com/{i}", news_type="news", title=f"제목 {i}",
+                         content=f"원문 본문 {i}") for i in range(2)]
+
+    batch_analysis.analyze_news_batch(news_list, poll_interval=0)
+
+    assert trimmed == ["원문 본문 0", "원문 본문 1"]  # 기사당 한 번만 자름
+    inputs = {batch["metadata"]["description"]: fake_client.files[batch["input_file_id"]].decode("utf-8")
+              for batch, _ in fake_client.batches.values()}
+    for uploaded in inputs.values():
+        assert "원문 본문" not in uploaded
+        assert "잘린 본문 1" in uploaded and "잘린 본문 2" in uploaded
@@ -0,0 +1,80 @@
+import nltk
+import pytest
+import content_budget
+from content_budget import GAP_MARKER, count_tokens, fit_content, split_sentences, trim_content
+
+# 문단 10개, 문단마다 문장 3개 (문장마다 번호가 달라 위치를 확인할 수 있음)
+SENTENCES = [[f"{p}-{s}번째 문장은 본문 예산을 확인하기 위한 문장이다." for s in range(3)] for p in range(10)]
+CONTENT = "\n".join(" ".join(paragraph) for paragraph in SENTENCES)
+FLAT = [sentence for paragraph in SENTENCES for sentence in paragraph]
+
+
+def kept_sentences(text):
+    return [sentence for sentence, _ in split_sentences(text) if sentence != GAP_MARKER]
+
+
+def test_content_within_budget_is_unchanged():
+    assert trim_content(CONTENT, budget=count_tokens(CONTENT)) is CONTENT
+    assert trim_content(CONTENT, budget=0) is CONTENT
+
+
+def test_lead_keeps_leading_sentences_within_budget():
+    trimmed = trim_content(CONTENT, budget=200, strategy="lead")
+
+    kept = kept_sentences(trimmed)
+    assert count_tokens(trimmed) <= 200
+    assert kept == FLAT[:len(kept)] and 0 < len(kept) < len(FLAT)
+    assert GAP_MARKER not in trimmed
+    assert trimmed.split("\n")[0] == " ".join(SENTENCES[0])  # 문단 구분 유지
+
+
+def test_lead_tail_keeps_conclusion_after_gap_marker():
+    trimmed = trim_content(CONTENT, budget=200, strategy="lead_tail", tail_ratio=0.25)
+
+    head, tail = trimmed.split(f"\n{GAP_MARKER}\n")
+    head_sentences, tail_sentences = kept_sentences(head), kept_sentences(tail)
+    assert head_sentences == FLAT[:len(head_sentences)]
+    assert tail_sentences == FLAT[len(FLAT) - len(tail_sentences):]
+    assert tail_sentences and tail.endswith(FLAT[-1])
+    assert count_tokens(tail) <= 50
+    assert count_tokens(trimmed) <= 200 + 1  # 표시 뒤 줄바꿈만큼
+
+
+def test_lead_tail_without_tail_budget_is_lead():
+    assert (trim_content(CONTENT, budget=200, strategy="lead_tail", tail_ratio=0)
+            == trim_content(CONTENT, budget=200, strategy="lead"))
+
+
+def test_keeps_first_sentence_even_if_over_budget():
+    assert trim_content(CONTENT, budget=5, strategy="lead") == FLAT[0]
+
+
+def test_regex_fallback_when_punkt_is_missing(monkeypatch):
+    def missing(*args, **kwargs):
+        raise LookupError("punkt")
+
+    monkeypatch.setattr(content_budget, "_tokenizer", None)
+    monkeypatch.setattr(nltk.data, "load", missing)
+
+    trimmed = trim_content(CONTENT, budget=200, strategy="lead_tail")
+
+    assert content_budget._tokenizer is False
+    assert split_sentences("첫 문장이다.  둘째 문장인가? 3.5%다.\n다음 문단!") == [
+        ("첫 문장이다.", " "), ("둘째 문장인가?", " "), ("3.5%다.", "\n"), ("다음 문단!", "\n")]
+    assert kept_sentences(trimmed)[0] == FLAT[0] and trimmed.endswith(FLAT[-1])
+
+
+def test_fit_content_counts_saved_tokens(monkeypatch):
+    monkeypatch.setattr(content_budget, "_stats", dict.fromkeys(content_budget._stats, 0))
+    monkeypatch.setattr(content_budget, "trim_content",
+                        lambda content: trim_content(content, budget=200, strategy="lead"))
+
+    fit_content("짧은 본문")
+    trimmed = fit_content(CONTENT)
+
+    assert content_budget.stats() == {
+        "articles": 2, "trimmed": 1,
+        "tokens_before": count_tokens("짧은 본문") + count_tokens(CONTENT),
+        "tokens_after": count_tokens("짧은 본문") + count_tokens(trimmed),
+        "tokens_saved": count_tokens(CONTENT) - count_tokens(trimmed),
+    }
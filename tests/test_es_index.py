@@ -0,0 +1,105 @@
+import pytest
+from opensearchpy import OpenSearch
+import es_index
+from benchmarks import fake_opensearch
+
+ALIAS = "news_index"
+
+
+@pytest.fixture
+def cluster(request):
+    plugins = getattr(request, "param", ("analysis-nori",))
+    server, state = fake_opensearch.start_server(plugins=plugins)
+    client = OpenSearch(hosts=[{"host": "127.0.0.1", "port": server.server_port}], use_ssl=False)
+    yield client, state
+    server.shutdown()
+
+
+class NewsTable:
+    """news_id 순 페이지를 돌려주는 MySQL 대용. on_loaded는 첫 전체 조회가 끝난 뒤 한 번 호출 (색인 중 저장 흉내)"""
+
+    def __init__(self, count, on_loaded=None):
+        self.rows = [self.row(news_id) for news_id in range(1, count + 1)]
+        self.on_loaded = on_loaded
+
+    @staticmethod
+    def row(news_id):
+        return {"news_id": news_id, "title": f"제목 {news_id}", "content": f"본문 {news_id}"}
+
+    def __call__(self, after_id, page_size=2):
+        rows = [row for row in self.rows if row["news_id"] > after_id]
+        for start in range(0, len(rows), page_size):
+            yield rows[start:start + page_size]
+        if self.on_loaded:
+            self.on_loaded, on_loaded = None, self.on_loaded
+            on_loaded(self)
+
+
+def tokenizer(state, index):
+    return state.indices[index]["settings"]["index.analysis"]["analyzer"]["korean"]["tokenizer"]
+
+
+def test_ensure_index_creates_first_version_from_template(cluster):
+    client, state = cluster
+
+    assert es_index.ensure_index(client, ALIAS) == "news_index_v1"
+    assert es_index.alias_indices(client, ALIAS) == ["news_index_v1"]
+    assert tokenizer(state, "news_index_v1") == "korean_tokenizer"  # nori
+    assert es_index.ensure_index(client, ALIAS) == "news_index_v1"  # 다시 실행해도 그대로
+    assert es_index.status(client, ALIAS)["analyzer"] == "nori"
+
+
+@pytest.mark.parametrize("cluster", [()], indirect=True)
+def test_falls_back_to_cjk_without_nori_plugin(cluster, capsys):
+    client, state = cluster
+
+    assert es_index.ensure_index(client, ALIAS) == "news_index_v1"
+    assert tokenizer(state, "news_index_v1") == "standard"
+    assert es_index.status(client, ALIAS)["analyzer"] == "cjk"
+    assert "analysis-nori 플러그인이 없어 cjk" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("cluster", [()], indirect=True)
+def test_nori_template_is_replaced_when_plugin_is_missing(cluster):
+    client, state = cluster
+    client.indices.put_index_template(name=es_index.template_name(ALIAS), body=es_index.index_template(ALIAS, "nori"))
+
+    assert es_index.ensure_index(client, ALIAS) == "news_index_v1"
+    assert tokenizer(state, "news_index_v1") == "standard"
+
+
+def test_reindex_swaps_alias_and_catches_up(cluster):
+    client, state = cluster
+    es_index.ensure_index(client, ALIAS)
+    table = NewsTable(5, on_loaded=lambda table: table.rows.append(NewsTable.row(6)))
+
+    index = es_index.reindex(client, ALIAS, table, page_size=2)
+
+    assert index == "news_index_v2"
+    assert es_index.alias_indices(client, ALIAS) == ["news_index_v2"]
+    assert state.aliases[ALIAS]["news_index_v2"]["is_write_index"]
+    assert client.count(index=ALIAS)["count"] == 6  # 전체 색인 후 저장된 6번도 추가 색인
+    assert state.indices[index]["settings"]["index.refresh_interval"] == es_index.ES_REFRESH_INTERVAL
+
+
+def test_reindex_keeps_one_previous_version(cluster, monkeypatch):
+    client, _ = cluster
+    monkeypatch.setattr(es_index, "ES_KEEP_VERSIONS", 1)
+    es_index.ensure_index(client, ALIAS)
+
+    es_index.reindex(client, ALIAS, NewsTable(3))
+    assert sorted(es_index.versions(client, ALIAS)) == [1, 2]  # 롤백용으로 v1 유지
+
+    es_index.reindex(client, ALIAS, NewsTable(3))
+    assert sorted(es_index.versions(client, ALIAS)) == [2, 3]
+    assert es_index.alias_indices(client, ALIAS) == ["news_index_v3"]
+
+
+def test_reindex_replaces_legacy_index(cluster):
+    client, _ = cluster
+    client.indices.create(index=ALIAS)  # template 없이 동적 매핑으로 만들어진 기존 인덱스
+
+    assert es_index.ensure_index(client, ALIAS) == ALIAS
+    assert es_index.reindex(client, ALIAS, NewsTable(2)) == "news_index_v1"
+    assert es_index.alias_indices(client, ALIAS) == ["news_index_v1"]
+    assert client.count(index=ALIAS)["count"] == 2
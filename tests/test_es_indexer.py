@@ -0,0 +1,78 @@
+import socket
+import pytest
+from opensearchpy import OpenSearch, ConnectionError as OpenSearchConnectionError
+from es_indexer import BulkIndexer
+from benchmarks import fake_opensearch
+
+INDEX = "news_index"
+
+
+@pytest.fixture
+def cluster():
+    server, state = fake_opensearch.start_server()
+    client = OpenSearch(hosts=[{"host": "127.0.0.1", "port": server.server_port}], use_ssl=False)
+    yield client, state
+    server.shutdown()
+
+
+def actions(*doc_ids):
+    return [{"_index": INDEX, "_id": doc_id, "_source": {"title": f"제목 {doc_id}"}} for doc_id in doc_ids]
+
+
+def count_bulk(client, fail=lambda call, body: None):
+    """client.bulk 호출 수를 세고, fail(호출 번호, body)이 돌려준 응답이나 예외로 해당 호출을 대신함"""
+    calls = []
+    send = client.bulk
+
+    def bulk(body, *args, **kwargs):
+        calls.append(body)
+        response = fail(len(calls), body)
+        if isinstance(response, Exception):
+            raise response
+        return response or send(body, *args, **kwargs)
+
+    client.bulk = bulk
+    return calls
+
+
+def test_retries_only_rejected_documents(cluster):
+    client, state = cluster
+
+    def reject_second(call, body):
+        if call == 1:  # 첫 요청은 1번만 색인되고 2번은 429
+            response = {"took": 1, "errors": True, "items": [
+                {"index": {"_index": INDEX, "_id": "1", "status": 201, "result": "created"}},
+                {"index": {"_index": INDEX, "_id": "2", "status": 429,
+                           "error": {"type": "es_rejected_execution_exception"}}},
+            ]}
+            state.documents[(INDEX, "1")] = {"title": "제목 1"}
+            return response
+    calls = count_bulk(client, reject_second)
+
+    BulkIndexer(client, INDEX, retry_backoff=0).flush(actions(1, 2))
+
+    assert len(calls) == 2
+    assert "제목 1" not in calls[1] and "제목 2" in calls[1]  # 거부된 문서만 재전송
+    assert set(state.documents) == {(INDEX, "1"), (INDEX, "2")}
+
+
+def test_retries_connection_failure(cluster):
+    client, state = cluster
+    calls = count_bulk(client, lambda call, body: OpenSearchConnectionError("N/A", "연결 실패", None) if call == 1 else None)
+
+    BulkIndexer(client, INDEX, retry_backoff=0).flush(actions(1))
+
+    assert len(calls) == 2
+    assert set(state.documents) == {(INDEX, "1")}
+
+
+def test_unreachable_cluster_is_retried_up_to_max_retries():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]  # 닫힌 포트
+    client = OpenSearch(hosts=[{"host": "127.0.0.1", "port": port}], use_ssl=False, max_retries=0)
+    calls = count_bulk(client)
+
+    BulkIndexer(client, INDEX, max_retries=2, retry_backoff=0).flush(actions(1))
+
+    assert len(calls) == 3
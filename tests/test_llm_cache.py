@@ -0,0 +1,68 @@
+import pytest
+import llm_cache
+from llm_cache import LLMCache, make_key
+
+
+class Clock:
+    """llm_cache.time 대신 쓰는 시계 (now를 직접 옮김)"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return LLMCache(str(tmp_path / "llm_cache.sqlite3"), max_entries=3, ttl=60)
+
+
+def test_get_returns_stored_value_and_counts_hits(cache):
+    key = make_key("summary", {"model": "gpt-4o-mini", "prompt": "본문"})
+
+    assert cache.get(key) is None
+    cache.set(key, {"summary": "요약", "category": "사회"})
+
+    assert cache.get(key) == {"summary": "요약", "category": "사회"}
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_key_depends_on_kind_and_request():
+    request = {"model": "gpt-4o-mini", "prompt": "본문"}
+
+    assert make_key("hs", request) == make_key("hs", dict(reversed(list(request.items()))))
+    assert make_key("hs", request) != make_key("fs", request)
+    assert make_key("hs", request) != make_key("hs", {**request, "prompt": "다른 본문"})
+
+
+def test_expired_entry_is_a_miss_and_evicted(cache, clock):
+    cache.set("old", 1)
+    clock.now += 61
+
+    assert cache.get("old") is None
+    cache.set("new", 2)
+    cache.evict()
+    assert cache.stats()["entries"] == 1 and cache.get("new") == 2
+
+
+def test_eviction_keeps_recently_used_entries(cache, clock, monkeypatch):
+    monkeypatch.setattr(llm_cache, "EVICT_EVERY", 5)
+    for index in range(4):
+        clock.now += 1
+        cache.set(f"key{index}", index)
+    clock.now += 1
+    cache.get("key0")  # 가장 먼저 저장했지만 최근에 사용
+
+    clock.now += 1
+    cache.set("key4", 4)  # 5번째 저장에서 정리
+
+    assert cache.stats()["entries"] == 3
+    assert [cache.get(f"key{index}") for index in range(5)] == [0, None, None, 3, 4]
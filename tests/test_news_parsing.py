@@ -0,0 +1,62 @@
+import os
+import pytest
+from article import Article
+from benchmarks.html_parsing import load_fixtures
+from news_crawler import parse_news, parse_news_bs4, parse_news_list, parse_news_list_bs4
+
+# 기사/속보 리스트 페이지를 benchmarks.html_parsing --save와 같은 형식(UTF-8)으로 저장한 fixture
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "news")
+ARTICLES, LISTS = load_fixtures(FIXTURE_DIR)
+
+DATA = Article(naver_url="https://n.news.naver.com/mnews/article/001/0012345678", news_type="news", listed_at=1.0)
+
+
+def fields(news):
+    """비교용 dict (리스트 항목은 파싱 시각인 listed_at 제외)"""
+    return {name: value for name, value in news.to_dict().items() if name != "listed_at"}
+
+
+@pytest.fixture(autouse=True)
+def lxml_parser(monkeypatch):
+    monkeypatch.setattr("news_crawler.NEWS_HTML_PARSER", "lxml")
+
+
+@pytest.mark.parametrize("page", ARTICLES, ids=[f"article_{index + 1}" for index in range(len(ARTICLES))])
+def test_article_fields_match_bs4(page):
+    expected = parse_news_bs4(page.decode("utf-8"), DATA)
+
+    for actual in (parse_news(page, DATA, "utf-8"), parse_news(page.decode("utf-8"), DATA)):
+        assert (actual is None) == (expected is None)
+        if expected is not None:
+            assert actual.to_dict() == expected.to_dict()
+
+
+def test_article_fixtures_parse():
+    parsed = [parse_news(page, DATA, "utf-8") for page in ARTICLES]
+
+    assert [news is not None for news in parsed] == [True, True, False]  # 마지막은 삭제된 기사 페이지
+    first, second, _ = parsed
+    assert first.title == "국회, 내년도 예산안 본회의 통과…총지출 673조원"
+    assert first.media_name == "연합뉴스" and first.url.startswith("https://www.yna.co.kr/")
+    assert "<!--" not in first.content and "찬성 230명·반대 38명" in first.content
+    assert second.title == "[단독] 반도체 수출 석 달 연속 증가 <속보>"
+    assert "document.write" not in second.content and "\xa0" in second.content
+    assert second.listed_at == DATA.listed_at
+
+
+@pytest.mark.parametrize("fresh_only", [True, False])
+@pytest.mark.parametrize("page", LISTS, ids=[f"list_{index + 1}" for index in range(len(LISTS))])
+def test_list_fields_match_bs4(page, fresh_only):
+    expected = [fields(news) for news in parse_news_list_bs4(page.decode("utf-8"), fresh_only)]
+
+    assert [fields(news) for news in parse_news_list(page, fresh_only, "utf-8")] == expected
+    assert [fields(news) for news in parse_news_list(page.decode("utf-8"), fresh_only)] == expected
+
+
+def test_list_fixtures_stop_at_two_minutes():
+    first, second = LISTS
+
+    assert len(parse_news_list(first, False, "utf-8")) == 20
+    assert len(parse_news_list(first, True, "utf-8")) == 9  # 0~1분 전 기사만
+    assert parse_news_list(second, True, "utf-8") == []
+    assert all(news.listed_at for news in parse_news_list(first, True, "utf-8"))
@@ -0,0 +1,49 @@
+import pytest
+from news_writer import NewsBatchWriter
+from score_probs import unpack_probs
+
+def test_write_batch_skips_existing_and_in_batch_duplicates(engine, analyzed, rows):
+    writer = NewsBatchWriter(engine)
+    first_id, = writer.write_batch([analyzed(1)])
+
+    results = writer.write_batch([analyzed(1), analyzed(2), analyzed(2)])
+
+    assert results[0] is None  # DB에 이미 있음
+    assert results[1] is not None and results[2] is None  # 배치 안에서 중복
+    assert first_id != results[1]
+    assert rows("SELECT COUNT(*) FROM news")[0][0] == 2
+
+
+def test_write_batch_reselects_ids_and_fills_child_tables(engine, analyzed, rows):
+    writer = NewsBatchWriter(engine)
+    news_list = [analyzed(1, "본문 1"), analyzed(2, "본문 2"), analyzed(3, "본문 3")]
+
+    ids = writer.write_batch(news_list)
+
+    assert rows("SELECT news_id, url FROM news ORDER BY news_id") == [
+        (news_id, news.url) for news_id, news in zip(ids, news_list)]
+    assert rows("SELECT news_id, content FROM news_content ORDER BY news_id") == [
+        (news_id, news.content) for news_id, news in zip(ids, news_list)]
+
+    probs = rows("SELECT news_id, headline_probs, fact_probs FROM news_score_probs ORDER BY news_id")
+    assert [news_id for news_id, _, _ in probs] == ids
+    assert unpack_probs(probs[0][2])["5"] == pytest.approx(0.5, abs=1e-4)
+
+    saved = rows(f"SELECT media_name, headline_score_reason, like_count FROM news WHERE news_id = {ids[0]}")
+    assert saved == [("연합뉴스", "제목 근거", 0)]
+
+
+def test_failed_batch_falls_back_to_per_item_writes(engine, analyzed, rows):
+    saved = []
+    writer = NewsBatchWriter(engine, batch_size=3, flush_interval=60,
+                             on_saved=lambda news_id, news: saved.append((news_id, news.url))).start()
+
+    futures = [writer.submit(analyzed(1)), writer.submit(analyzed(2, content=None)), writer.submit(analyzed(3))]
+    writer.close()
+
+    first, broken, third = futures
+    assert first.result() is not None and third.result() is not None
+    with pytest.raises(Exception):
+        broken.result()  # 본문이 없는 뉴스만 실패 처리
+    assert [url for _, url in saved] == [analyzed(1).url, analyzed(3).url]
+    assert rows("SELECT url FROM news ORDER BY news_id") == [(analyzed(1).url,), (analyzed(3).url,)]
@@ -0,0 +1,134 @@
+import pytest
+from sqlalchemy.orm import scoped_session, sessionmaker
+import app
+import db
+import metrics
+from durable_queue import StageJournal
+from pipeline import Pipeline, Stage
+
+PERSIST_OK = "pipeline_stage_items_total{stage=persist,result=ok}"
+
+
+class FakeIndexer:
+    def __init__(self, closed=None):
+        self.added = []
+        self.closed = closed if closed is not None else []
+
+    def add(self, news_id, document):
+        self.added.append(news_id)
+
+    def close(self):
+        self.closed.append(type(self).__name__)
+
+
+class FakeWriter(FakeIndexer):
+    pass
+
+
+class FakeWorkQueue:
+    def __init__(self):
+        self.completed, self.released = [], []
+
+    def complete(self, key):
+        self.completed.append(key)
+
+    def release(self, key):
+        self.released.append(key)
+
+
+@pytest.fixture
+def sqlite_db(engine, monkeypatch):
+    session_factory = scoped_session(sessionmaker(bind=engine))
+    monkeypatch.setitem(vars(db), "SessionLocal", session_factory)  # 모듈 __getattr__로 MySQL 연결을 만들지 않도록
+    monkeypatch.setitem(vars(db), "es_indexer", FakeIndexer())
+    yield engine
+    session_factory.remove()
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    journal = StageJournal(str(tmp_path / "journal.sqlite3"))
+    monkeypatch.setattr(app, "DURABLE_QUEUE_ENABLED", True)
+    monkeypatch.setattr(app, "stage_journal", journal)
+    return journal
+
+
+def journaled(journal, news):
+    journal.record(news)
+    journal.checkpoint(news, "analyzed")
+    return news
+
+
+def test_save_news_returns_id_none_for_duplicate_and_raises_on_failure(sqlite_db, analyzed, rows):
+    news_id = db.save_news(analyzed(1))
+
+    assert news_id is not None
+    assert db.save_news(analyzed(1)) is None
+    with pytest.raises(Exception):
+        db.save_news(analyzed(2, content=None))  # news_content.content NOT NULL
+    assert rows("SELECT news_id FROM news") == [(news_id,)]  # 실패한 뉴스는 rollback
+
+
+def test_persist_returns_saved_id_and_finishes_journal(sqlite_db, journal, analyzed, rows):
+    news = journaled(journal, analyzed(1))
+
+    news_id = app.persist_stage(news)
+
+    assert news_id == rows("SELECT news_id FROM news")[0][0]
+    assert app.persist_stage(journaled(journal, analyzed(1))) is None  # 중복
+    assert journal.stage_of(news) == "saved" and journal.recover() == []
+
+
+def test_failed_save_stays_in_journal(sqlite_db, journal, analyzed):
+    news = journaled(journal, analyzed(1, content=None))
+
+    with pytest.raises(Exception):
+        app.persist_stage(news)
+
+    assert journal.stage_of(news) == "analyzed"
+    assert [(stage, item.url) for stage, item in journal.recover()] == [("analyzed", news.url)]
+
+
+def test_process_claimed_releases_failed_save(sqlite_db, monkeypatch, analyzed):
+    work_queue = FakeWorkQueue()
+    monkeypatch.setitem(vars(db), "work_queue", work_queue)
+    monkeypatch.setattr(app, "fetch_stage", lambda news: news)
+    monkeypatch.setattr(app, "analyze_stage", lambda news: news)
+
+    app.process_claimed("saved", analyzed(1))
+    app.process_claimed("duplicate", analyzed(1))
+    app.process_claimed("failed", analyzed(2, content=None))
+
+    assert work_queue.completed == ["saved", "duplicate"]
+    assert work_queue.released == ["failed"]
+
+
+def test_pipeline_counts_persisted_articles_as_ok(sqlite_db, analyzed):
+    before = metrics.snapshot().get(PERSIST_OK, 0)
+    pipeline = Pipeline([Stage("persist", app.persist_stage, 1, 10)]).start()
+    for index in range(3):
+        pipeline.put(analyzed(index))
+    pipeline.close()
+
+    assert metrics.snapshot().get(PERSIST_OK, 0) - before == 3
+
+
+def test_close_clients_skips_clients_never_created(monkeypatch):
+    indexer = FakeIndexer()
+    monkeypatch.delitem(vars(db), "news_writer", raising=False)
+    monkeypatch.setitem(vars(db), "es_indexer", indexer)
+
+    db.close_clients()
+
+    assert indexer.closed == ["FakeIndexer"]
+    assert "news_writer" not in vars(db)  # 종료 시 writer(MySQL 엔진)를 새로 만들지 않음
+
+
+def test_close_clients_flushes_writer_before_indexer(monkeypatch):
+    closed = []
+    monkeypatch.setitem(vars(db), "news_writer", FakeWriter(closed))
+    monkeypatch.setitem(vars(db), "es_indexer", FakeIndexer(closed))
+
+    db.close_clients()
+
+    assert closed == ["FakeWriter", "FakeIndexer"]
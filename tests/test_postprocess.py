@@ -0,0 +1,30 @@
+import postprocess
+import content_budget
+from article import Article
+from dedupe import NearDuplicateIndex
+from score_probs import pack_probs
+
+CONTENT = " ".join(f"{i}번째 문장은 유사 기사 재사용을 확인하기 위한 충분히 긴 본문입니다." for i in range(40))
+
+
+def analyzed(url):
+    return Article(
+        naver_url=url, news_type="news", title="같은 제목", content=CONTENT, summary="요약", category="사회",
+        headline_score=50.0, headline_score_origin=3.0, headline_score_probs=pack_probs({"3": 1.0}),
+        fact_score=75.0, fact_score_origin=4.0, fact_score_probs=pack_probs({"4": 1.0}),
+        hs_reason="제목 근거", fs_reason="본문 근거",
+    )
+
+
+def test_full_reuse_skips_content_budget(monkeypatch):
+    index = NearDuplicateIndex()
+    index.add("같은 제목", CONTENT, analyzed("https://n.news.naver.com/1"))
+    monkeypatch.setattr(postprocess, "near_duplicates", index)
+    monkeypatch.setattr(postprocess, "NEAR_DUP_ENABLED", True)
+    before = content_budget.stats()
+
+    news = postprocess.analyze_news(Article(naver_url="https://n.news.naver.com/2", news_type="news",
+                                            title="같은 제목", content=CONTENT))
+
+    assert news.summary == "요약" and news.hs_reason == "제목 근거"
+    assert content_budget.stats() == before  # LLM에 보내지 않은 본문은 예산 통계에 포함하지 않음
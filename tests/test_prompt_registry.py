@@ -0,0 +1,68 @@
+import os
+import pytest
+from prompt_registry import PromptRegistry, PromptTemplate, PROMPT_FILES, is_equivalent, _content_lines
+
+SAMPLES = [
+    {"제목": "테스트 제목", "본문": "첫 번째 문장입니다.\n두 번째 문장입니다.", "hs": 75.0, "fs": 50.0},
+    {"제목": "다른 기사", "본문": "완전히 다른 본문.", "hs": 10.0, "fs": 90.0},
+]
+
+PROMPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+
+SOURCE = "지침 1\n지침 2\n\n제목: {{제목}}\n본문: {{본문}}\n\n뒤 지침\n\n출력 형식:\n- HS:"
+
+
+@pytest.mark.parametrize("name", PROMPT_FILES)
+def test_repo_templates_are_equivalent(name):
+    template = PromptRegistry(prompt_dir=PROMPT_DIR).get(name)
+    assert all(is_equivalent(template, values) for values in SAMPLES)
+
+
+def test_cached_layout_moves_article_block_before_cue():
+    template = PromptTemplate("test", SOURCE)
+    rendered = template.render(SAMPLES[0])
+
+    assert rendered.startswith("지침 1\n지침 2\n\n\n뒤 지침\n\n제목: 테스트 제목")
+    assert rendered.endswith("\n\n출력 형식:\n- HS:")
+    assert is_equivalent(template, SAMPLES[0])
+
+
+def test_reordered_instructions_are_not_equivalent():
+    template = PromptTemplate("test", SOURCE)
+    template.static_prefix = "지침 2\n지침 1\n\n뒤 지침\n\n"
+
+    assert not is_equivalent(template, SAMPLES[0])
+
+
+def test_instruction_moved_into_cue_is_not_equivalent():
+    template = PromptTemplate("test", SOURCE)
+    template.static_prefix = "지침 1\n지침 2\n\n"
+    template.cue = "뒤 지침\n\n출력 형식:\n- HS:"
+
+    assert not is_equivalent(template, SAMPLES[0])
+
+
+def test_cue_must_be_last():
+    class CueFirst(PromptTemplate):
+        def render(self, values):
+            return self.static_prefix + self.cue + "\n\n" + self.render_block(values)
+
+    assert not is_equivalent(CueFirst("test", SOURCE), SAMPLES[0])
+
+
+@pytest.mark.parametrize("name", ["summary", "reason"])
+def test_json_output_format_stays_last(name):
+    template = PromptRegistry(prompt_dir=PROMPT_DIR).get(name)
+    rendered = template.render(SAMPLES[0])
+
+    assert template.cue.startswith("출력 형식:") and rendered.rstrip().endswith("}")
+    assert "{" not in template.static_prefix  # JSON 형식이 기사 앞으로 옮겨지지 않음
+
+
+@pytest.mark.parametrize("name", PROMPT_FILES)
+def test_repo_templates_keep_legacy_order(name):
+    # 기사 뒤에 오는 지침이 없으므로 캐시용 렌더링은 기존 렌더링과 줄 순서까지 같음
+    template = PromptRegistry(prompt_dir=PROMPT_DIR).get(name)
+
+    for values in SAMPLES:
+        assert _content_lines(template.render(values)) == _content_lines(template.render_legacy(values))
@@ -0,0 +1,47 @@
+import time
+import pytest
+import postprocess
+from rate_limiter import RateLimiter, RATE_DECREASE, RATE_INCREASE
+from benchmarks import fake_openai
+
+REQUEST = dict(model="gpt-4o-mini", messages=[{"role": "user", "content": "요약해 주세요."}], max_tokens=5)
+
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    server, state = fake_openai.start_server(rate_limit_first=2, retry_after=0.2)
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setattr(postprocess, "OPENAI_API_KEY", "test-key")
+    for name in ("client", "chat_client"):
+        monkeypatch.delitem(vars(postprocess), name, raising=False)
+    limiter = RateLimiter(rpm=6000, tpm=1000000)
+    monkeypatch.setattr(postprocess, "rate_limiter", limiter)
+    yield state, limiter
+    for name in ("client", "chat_client"):
+        monkeypatch.delitem(vars(postprocess), name, raising=False)
+    server.shutdown()
+
+
+def test_429_pauses_halves_rate_and_retries(fake_server):
+    state, limiter = fake_server
+
+    start = time.monotonic()
+    response = postprocess.create_completion(**REQUEST)
+    elapsed = time.monotonic() - start
+
+    assert response.choices[0].message.content
+    assert state.requests == 3 and state.rate_limited == 2  # 429 두 번 뒤 재시도 성공
+    assert limiter.rate_limited == 2
+    assert elapsed >= 0.4  # retry-after(0.2초)만큼 두 번 멈춤
+    assert limiter.rate_factor == pytest.approx(RATE_DECREASE ** 2 + RATE_INCREASE)  # 429마다 절반, 성공 후 회복 시작
+
+
+def test_pause_blocks_other_requests():
+    limiter = RateLimiter(rpm=6000, tpm=1000000)
+    limiter.on_rate_limited(0.2)
+
+    start = time.monotonic()
+    limiter.acquire(10)
+
+    assert time.monotonic() - start >= 0.19
+    assert limiter.rate_factor == RATE_DECREASE
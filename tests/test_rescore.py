@@ -0,0 +1,73 @@
+import math
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from sqlalchemy import text
+from postprocess import calculate_score, normalize_score
+from rescore import compute_scores, rescore
+from score_probs import INSERT_SCORE_PROBS_SQL, SCORE_TOKENS, pack_probs, unpack_probs
+
+# GEval 응답에서 나올 법한 분포 (합이 1이 아니거나 한 토큰에 몰린 경우 포함)
+DISTRIBUTIONS = [
+    {"1": 1.0},
+    {"5": 1.0},
+    {"3": 0.5, "4": 0.5},
+    {"1": 0.05, "2": 0.1, "3": 0.2, "4": 0.4, "5": 0.25},
+    {"2": 0.61, "3": 0.3, "4": 0.07},  # top_logprobs 밖으로 밀린 확률은 빠짐
+    {"1": 0.123456, "2": 0.234567, "3": 0.345678, "4": 0.198765, "5": 0.097534},
+]
+
+
+def completion_logprobs(token_probs):
+    """token_probs를 top_logprobs로 돌려주는 logprobs.content"""
+    top = [SimpleNamespace(token=token, logprob=math.log(prob)) for token, prob in token_probs.items()]
+    return [SimpleNamespace(top_logprobs=top)]
+
+
+@pytest.mark.parametrize("token_probs", DISTRIBUTIONS)
+def test_pack_unpack_round_trip(token_probs):
+    packed = pack_probs(token_probs)
+    unpacked = unpack_probs(packed)
+
+    assert len(packed) == 10 and list(unpacked) == list(SCORE_TOKENS)
+    for token in SCORE_TOKENS:
+        assert unpacked[token] == pytest.approx(token_probs.get(token, 0), abs=0.5 / 65535)
+    assert pack_probs(unpacked) == packed
+
+
+def test_pack_clamps_out_of_range_probs():
+    assert unpack_probs(pack_probs({"1": 1.0000001, "2": -0.1})) == {"1": 1.0, "2": 0.0, "3": 0.0, "4": 0.0, "5": 0.0}
+
+
+def test_compute_scores_matches_per_article_score():
+    scores = [calculate_score(completion_logprobs(token_probs)) for token_probs in DISTRIBUTIONS]
+    probs = np.array([[unpack_probs(pack_probs(token_probs))[token] for token in SCORE_TOKENS]
+                      for _, token_probs in scores])
+
+    expected = [normalize_score(score) for score, _ in scores]
+    assert compute_scores(probs).tolist() == pytest.approx(expected, abs=0.01)  # 양자화 오차는 반올림 한 자리 이내
+    assert compute_scores(probs).tolist() == [
+        normalize_score(sum(int(token) * prob for token, prob in zip(SCORE_TOKENS, row))) for row in probs]
+
+
+def test_compute_scores_other_range():
+    probs = np.array([[0, 0, 0.5, 0.5, 0], [0, 0, 0, 0, 1.0]])
+
+    assert compute_scores(probs, new_range=(0, 10)).tolist() == [
+        normalize_score(3.5, new_range=(0, 10)), normalize_score(5, new_range=(0, 10))]
+
+
+def test_rescore_updates_scores_from_stored_probs(engine, rows):
+    with engine.begin() as connection:
+        for news_id, token_probs in enumerate(DISTRIBUTIONS, start=1):
+            connection.execute(text("INSERT INTO news (news_id, title) VALUES (:news_id, '제목')"),
+                               {"news_id": news_id})
+            connection.execute(INSERT_SCORE_PROBS_SQL, {"news_id": news_id, "headline_probs": pack_probs(token_probs),
+                                                        "fact_probs": pack_probs({"5": 1.0})})
+
+    assert rescore(engine) == len(DISTRIBUTIONS)
+
+    result = rows("SELECT headline_score, fact_score FROM news ORDER BY news_id")
+    expected = [normalize_score(calculate_score(completion_logprobs(token_probs))[0]) for token_probs in DISTRIBUTIONS]
+    assert [hs for hs, _ in result] == pytest.approx(expected, abs=0.01)
+    assert {fs for _, fs in result} == {100.0}
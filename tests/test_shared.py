@@ -0,0 +1,107 @@
+import time
+import pytest
+from sqlalchemy import text
+import app
+import db
+from work_queue import WorkQueue, CREATE_WORK_ITEMS_SQL
+
+
+@pytest.fixture
+def replicas(engine, monkeypatch):
+    """같은 DB를 공유하는 두 replica의 작업 큐 (주기가 끝나면 lease가 바로 만료되도록 POLL_INTERVAL=0)"""
+    queues = [WorkQueue(engine, owner=owner) for owner in ("replica-a", "replica-b")]
+    with engine.begin() as connection:
+        connection.execute(CREATE_WORK_ITEMS_SQL)
+    monkeypatch.setattr(app, "POLL_INTERVAL", 0)
+
+    def run(queue):
+        monkeypatch.setitem(vars(db), "work_queue", queue)
+        app.fetch_news_shared()
+        time.sleep(0.01)  # lease 만료
+    return queues, run
+
+
+def sources(monkeypatch, **list_funcs):
+    monkeypatch.setattr(app, "NEWS_SOURCES", [(name, func, name, 10) for name, func in list_funcs.items()])
+
+
+def queued(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT COUNT(*) FROM crawl_work_items WHERE kind = 'article'")).scalar()
+
+
+def test_stops_on_empty_page(engine, replicas, monkeypatch, news, fake_list):
+    (first, _), run = replicas
+    list_func = fake_list({1: [news(2), news(1)]}, fresh={1: [news(2), news(1)]})
+    sources(monkeypatch, news=list_func)
+
+    run(first)
+
+    assert list_func.calls == [(1, True), (2, True)]  # 10페이지까지 요청하지 않음
+    assert queued(engine) == 2
+
+
+def test_watermark_is_shared_between_replicas(engine, replicas, monkeypatch, news, fake_list):
+    (first, second), run = replicas
+    pages = {1: [news(2), news(1)]}
+    list_func = fake_list(pages, fresh=dict(pages))
+    sources(monkeypatch, news=list_func)
+    run(first)
+
+    pages[1] = [news(4), news(3)]
+    pages[2] = [news(2), news(1)]
+    list_func.calls.clear()
+    run(second)
+
+    assert list_func.calls == [(1, False), (2, False)]  # 첫 replica가 저장한 워터마크에서 중단
+    assert queued(engine) == 4
+    assert first.lease_state("list:news")["urls"][:3] == [news(4).naver_url, news(3).naver_url, news(2).naver_url]
+
+
+def test_source_is_fetched_once_per_interval(engine, replicas, monkeypatch, news, fake_list):
+    (first, second), _ = replicas
+    list_func = fake_list({1: [news(1)]}, fresh={1: [news(1)]})
+    sources(monkeypatch, news=list_func)
+    monkeypatch.setattr(app, "POLL_INTERVAL", 60)
+
+    for queue in (first, second):
+        monkeypatch.setitem(vars(db), "work_queue", queue)
+        app.fetch_news_shared()
+
+    assert list_func.calls == [(1, True), (2, True)]  # 두 번째 replica는 lease를 얻지 못해 요청하지 않음
+
+
+def test_single_replica_polls_every_source_each_interval(engine, replicas, monkeypatch, news, fake_list):
+    (first, _), _ = replicas
+    slow_news = fake_list({1: [news(1)]}, fresh={1: [news(1)]})
+    enter = fake_list({1: [news(11)]}, fresh={1: [news(11)]})
+
+    def news_list(page, fresh_only=True):
+        if len(slow_news.calls) < 2:
+            time.sleep(0.05)  # 첫 주기만 앞 소스 수집이 느림 → 뒤 소스의 lease를 늦게 얻음
+        return slow_news(page, fresh_only)
+
+    sources(monkeypatch, news=news_list, enter=enter)
+    monkeypatch.setattr(app, "POLL_INTERVAL", 1.0)
+    monkeypatch.setitem(vars(db), "work_queue", first)
+
+    start = time.monotonic()
+    app.fetch_news_shared()
+    time.sleep(max(0, start + app.POLL_INTERVAL - time.monotonic()))  # 스케줄러의 다음 주기
+    app.fetch_news_shared()
+
+    assert [page for page, _ in enter.calls].count(1) == 2  # 두 주기 모두 수집
+
+
+def test_start_tolerates_index_created_by_another_replica(engine, monkeypatch):
+    first, second = WorkQueue(engine, owner="replica-a"), WorkQueue(engine, owner="replica-b")
+    stale = [False]  # 두 번째 replica가 인덱스가 없음을 확인한 뒤 첫 replica가 먼저 만든 상황
+    has_index = second._has_claim_index
+    monkeypatch.setattr(second, "_has_claim_index", lambda: stale.pop() if stale else has_index())
+
+    first.start()
+    second.start()
+
+    assert second._has_claim_index()
+    first.close()
+    second.close()
@@ -0,0 +1,66 @@
+from article import Article
+from watermark import poll_source
+
+
+def sport(index, minute):
+    return Article(naver_url=f"https://m.sports.naver.com/{index}", news_type="sport",
+                   created_date=f"2026-10-18T10:{minute:02d}:00.000Z")
+
+
+def test_first_run_seeds_watermark_from_fetched_items(news, fake_list):
+    fresh = {1: [news(3), news(2)]}
+    list_func = fake_list({1: [news(3), news(2), news(1)]}, fresh)
+
+    newer, mark = poll_source(list_func, "news", 3)
+
+    assert [item.naver_url for item in newer] == [news(3).naver_url, news(2).naver_url]
+    assert mark["urls"] == [news(3).naver_url, news(2).naver_url]
+    assert list_func.calls == [(1, True), (2, True)]  # 첫 페이지를 다시 요청하지 않음
+
+
+def test_first_run_without_fresh_items_seeds_from_first_page(news, fake_list):
+    list_func = fake_list({1: [news(2), news(1)]})
+
+    newer, mark = poll_source(list_func, "news", 3)
+
+    assert newer == []
+    assert mark["urls"] == [news(2).naver_url, news(1).naver_url]
+    assert list_func.calls == [(1, True), (1, False)]
+
+
+def test_news_stops_at_first_item_at_watermark(news, fake_list):
+    list_func = fake_list({1: [news(5), news(4)], 2: [news(3), news(2)], 3: [news(1)]})
+    stats = {}
+
+    newer, mark = poll_source(list_func, "news", 3, {"urls": [news(3).naver_url]}, stats=stats)
+
+    assert [item.naver_url for item in newer] == [news(5).naver_url, news(4).naver_url]
+    assert mark["urls"][:3] == [news(5).naver_url, news(4).naver_url, news(3).naver_url]
+    assert stats["pages"] == 2 and stats["reached"]
+
+
+def test_sports_keeps_paging_past_mixed_page(fake_list):
+    # 시리즈 수정 시각순이라 첫 페이지에 이전 기사(10:00)가 섞여 있어도 다음 페이지에 새 기사가 있을 수 있음
+    pages = {
+        0: [sport(1, 10), sport(2, 20)],
+        1: [sport(3, 15), sport(4, 5)],
+        2: [sport(5, 1), sport(6, 2)],
+        3: [sport(7, 30)],
+    }
+    list_func = fake_list(pages)
+    stats = {}
+
+    newer, mark = poll_source(list_func, "sport", 4, {"urls": [], "created": "2026-10-18T10:12:00.000Z"}, stats=stats)
+
+    assert [item.naver_url for item in newer] == [sport(2, 20).naver_url, sport(3, 15).naver_url]
+    assert stats["pages"] == 3 and stats["reached"]  # 모두 이전 기사인 페이지(2)에서 중단
+    assert mark["created"] == "2026-10-18T10:20:00.000Z"
+
+
+def test_sports_not_reached_when_every_page_has_new_items(fake_list):
+    pages = {page: [sport(page * 2, 30), sport(page * 2 + 1, 1)] for page in range(3)}
+    stats = {}
+
+    poll_source(fake_list(pages), "sport", 3, {"urls": [], "created": "2026-10-18T10:12:00.000Z"}, stats=stats)
+
+    assert stats["pages"] == 3 and not stats["reached"]
@@ -0,0 +1,114 @@
+# 소스별 워터마크(마지막으로 수집한 기사) 관리
+# "N분전" 같은 시간 문자열 대신, 워터마크보다 새로운 기사만 수집하고 워터마크에 도달하면 페이지 순회를 중단
+import os
+from datetime import datetime, timezone
+from checkpoint import load_state, save_state
+
+WATERMARK_PATH = os.getenv("WATERMARK_PATH", "./checkpoints/watermarks.json")
+
+# 리스트에서 기사가 삭제되더라도 워터마크를 찾을 수 있도록 최근 URL을 여러 개 보관
+MAX_MARK_URLS = 100
+
+
+def load_watermarks():
+    """저장된 소스별 워터마크 로드"""
+    return load_state(WATERMARK_PATH, {})
+
+
+def save_watermarks(marks):
+    """소스별 워터마크 저장"""
+    save_state(WATERMARK_PATH, marks)
+
+
+def _parse_created(created_date):
+    """스포츠 기사 created_date(ISO 형식, UTC) 파싱"""
+    return datetime.fromisoformat(created_date.rstrip('Z')).replace(tzinfo=timezone.utc)
+
+
+def is_newer(news, mark):
+    """기사가 워터마크보다 새로운지 확인"""
+    # 스포츠는 created_date로 비교 (같은 시각이면 URL로 구분)
+    if news.created_date and mark.get("created"):
+        created, mark_created = _parse_created(news.created_date), _parse_created(mark["created"])
+        if created != mark_created:
+            return created > mark_created
+
+    # 뉴스/엔터는 최신순 리스트이므로, 이미 본 URL이 나오면 그 이후는 모두 이전 기사
+    return news.naver_url not in mark.get("urls", [])
+
+
+def update_watermark(mark, news_list):
+    """새로 수집한 기사(최신순)로 워터마크 갱신"""
+    mark = dict(mark or {})
+
+    urls = [news.naver_url for news in news_list]
+    urls += [url for url in mark.get("urls", []) if url not in urls]
+    mark["urls"] = urls[:MAX_MARK_URLS]
+
+    created_dates = [news.created_date for news in news_list if news.created_date]
+    if mark.get("created"):
+        created_dates.append(mark["created"])
+    if created_dates:
+        mark["created"] = max(created_dates, key=_parse_created)
+
+    mark["updated_at"] = datetime.now(timezone.utc).isoformat()
+    return mark
+
+
+def poll_source(list_func, news_type, max_pages, mark=None, stats=None):
+    """
+    워터마크보다 새로운 기사만 수집하고 (새 기사 리스트, 갱신된 워터마크) 반환.
+    stats(dict)를 넘기면 요청한 페이지 수(pages), 워터마크 도달 여부(reached), 페이지당 기사 수(page_size)를 기록
+    """
+    start_page = 0 if news_type == "sport" else 1  # 스포츠 뉴스는 0부터 시작
+    if stats is None:
+        stats = {}
+    stats.update(pages=0, reached=True, page_size=None)
+
+    # 첫 실행: 기존 2분 규칙으로 수집하고, 수집한 최신 기사로 워터마크 초기화
+    # (새 기사가 하나도 없을 때만 첫 페이지 전체를 다시 요청하여 초기화)
+    if not mark:
+        newer = []
+        for page in range(start_page, max_pages + start_page):
+            news_list = list_func(page)
+            stats["pages"] += 1
+            if not news_list:
+                break
+            newer.extend(news_list)
+        if newer:  # 2분 규칙으로 걸러진 페이지라 page_size는 기록하지 않음
+            return newer, update_watermark(None, newer)
+
+        first_page = list_func(start_page, fresh_only=False)
+        stats["pages"] += 1
+        stats["page_size"] = len(first_page) or None
+        return newer, update_watermark(None, first_page)
+
+    newer = []
+    stats["reached"] = False
+    for page in range(start_page, max_pages + start_page):
+        news_list = list_func(page, fresh_only=False)
+        stats["pages"] += 1
+        if not news_list:
+            stats["reached"] = True  # 리스트 끝까지 수집함
+            break
+        stats["page_size"] = max(stats["page_size"] or 0, len(news_list))
+
+        if news_type == "sport":
+            # 스포츠 리스트는 시리즈(여러 기사 묶음)의 수정 시각순이라 이전 기사가 새 기사 사이에 섞여 있음
+            # → 페이지의 모든 기사가 워터마크 이전일 때만 도달로 판단
+            page_newer = [news for news in news_list if is_newer(news, mark)]
+            newer.extend(page_newer)
+            reached = not page_newer
+        else:
+            reached = False
+            for news in news_list:
+                if not is_newer(news, mark):
+                    reached = True  # 최신순 리스트는 워터마크 이후가 모두 이전 기사
+                    break
+                newer.append(news)
+
+        if reached:
+            stats["reached"] = True
+            break  # 워터마크에 도달하면 다음 페이지는 요청하지 않음
+
+    return newer, update_watermark(mark, newer)
@@ -0,0 +1,256 @@
+# 여러 replica가 공유하는 lease 기반 작업 큐 (운영 MySQL, 테스트/벤치마크는 SQLite)
+# 리스트는 소스 샤드 단위로 lease를 얻은 replica만 수집하고(샤드의 워터마크는 lease 행에 저장), 기사는 claim한 replica만 본문 수집/LLM 분석
+# claim한 기사는 heartbeat로 lease를 연장하고, replica가 죽어 lease가 만료되면 다른 replica가 다시 claim
+import os
+import json
+import time
+import random
+import socket
+import threading
+from sqlalchemy import text, inspect
+from sqlalchemy.exc import DBAPIError
+from seen_index import url_hash
+from article import Article
+import metrics
+
+WORK_LEASE_TTL = float(os.getenv("WORK_LEASE_TTL", "120"))  # 초, heartbeat가 끊긴 뒤 다른 replica가 가져가기까지의 시간
+WORK_MAX_ATTEMPTS = int(os.getenv("WORK_MAX_ATTEMPTS", "3"))  # 기사당 claim 허용 횟수 (처리 실패, lease 만료 포함)
+WORK_RETENTION = float(os.getenv("WORK_RETENTION", str(3 * 24 * 3600)))  # 완료 항목 보관 기간(초), 리스트에 재등장해도 다시 넣지 않음
+WORKER_ID = os.getenv("WORKER_ID") or f"{socket.gethostname()}-{os.getpid()}"  # k8s에서는 pod 이름
+
+# 상태: pending(대기) → leased(처리 중) → done(완료) / failed(재시도 초과)
+# 시각은 epoch 초 (replica 간 시계 오차는 lease TTL에 비해 작다고 가정)
+CREATE_WORK_ITEMS_SQL = text("""
+    CREATE TABLE IF NOT EXISTS crawl_work_items (
+        item_key VARCHAR(64) PRIMARY KEY,
+        kind VARCHAR(16) NOT NULL,
+        payload TEXT,
+        status VARCHAR(16) NOT NULL,
+        owner VARCHAR(128),
+        lease_until DOUBLE NOT NULL,
+        attempts INT NOT NULL,
+        updated_at DOUBLE NOT NULL
+    )
+""")
+
+CREATE_WORK_ITEMS_INDEX_SQL = text("""
+    CREATE INDEX idx_crawl_work_items_claim ON crawl_work_items (kind, status, lease_until)
+""")
+
+# MySQL은 INSERT IGNORE, SQLite는 INSERT OR IGNORE
+INSERT_WORK_ITEM_SQL = """
+    INSERT {ignore} INTO crawl_work_items (item_key, kind, payload, status, owner, lease_until, attempts, updated_at)
+    VALUES (:item_key, :kind, :payload, 'pending', NULL, 0, 0, :now)
+"""
+
+CLAIM_CANDIDATES_SQL = text("""
+    SELECT item_key, payload FROM crawl_work_items
+    WHERE kind = :kind AND status IN ('pending', 'leased') AND lease_until < :now AND attempts < :max_attempts
+    ORDER BY updated_at
+    LIMIT :limit
+""")
+
+# 조건부 UPDATE로 claim (영향받은 행이 1이면 이 replica가 획득, 0이면 다른 replica가 먼저 가져감)
+CLAIM_SQL = text("""
+    UPDATE crawl_work_items
+    SET status = 'leased', owner = :owner, lease_until = :lease_until, attempts = attempts + :attempt, updated_at = :now
+    WHERE item_key = :item_key AND status IN ('pending', 'leased') AND lease_until < :now
+""")
+
+HEARTBEAT_SQL = text("""
+    UPDATE crawl_work_items SET lease_until = :lease_until
+    WHERE owner = :owner AND status = 'leased' AND kind = 'article'
+""")
+
+# 리스트 샤드 상태(워터마크)는 lease 행의 payload에 저장, lease를 보유한 replica만 갱신
+LEASE_STATE_SQL = text("""
+    SELECT payload FROM crawl_work_items WHERE item_key = :item_key
+""")
+
+SAVE_LEASE_STATE_SQL = text("""
+    UPDATE crawl_work_items SET payload = :payload
+    WHERE item_key = :item_key AND owner = :owner AND status = 'leased'
+""")
+
+FINISH_SQL = text("""
+    UPDATE crawl_work_items SET status = :status, owner = NULL, lease_until = 0, updated_at = :now
+    WHERE item_key = :item_key AND owner = :owner
+""")
+
+RELEASE_OWNED_SQL = text("""
+    UPDATE crawl_work_items SET status = 'pending', owner = NULL, lease_until = 0
+    WHERE owner = :owner AND status = 'leased' AND kind = 'article'
+""")
+
+FAIL_EXHAUSTED_SQL = text("""
+    UPDATE crawl_work_items SET status = 'failed', owner = NULL, updated_at = :now
+    WHERE kind = 'article' AND status IN ('pending', 'leased') AND lease_until < :now AND attempts >= :max_attempts
+""")
+
+DELETE_FINISHED_SQL = text("""
+    DELETE FROM crawl_work_items WHERE status IN ('done', 'failed') AND updated_at < :before
+""")
+
+COUNT_BY_STATUS_SQL = text("""
+    SELECT status, COUNT(*) FROM crawl_work_items WHERE kind = 'article' GROUP BY status
+""")
+
+work_items = metrics.Counter("work_queue_items_total", "공유 작업 큐 처리 항목 수 (결과별)", ["result"])
+list_shards = metrics.Counter("work_queue_list_shards_total", "리스트 샤드 lease 시도 수 (결과별)", ["result"])
+
+
+def article_key(news):
+    """기사 작업 키 (네이버 URL 해시)"""
+    return f"article:{url_hash(news.naver_url):016x}"
+
+
+class WorkQueue:
+    """DB 테이블 하나로 구현한 lease 기반 작업 큐. start()로 테이블을 준비하고 heartbeat 스레드 실행"""
+
+    def __init__(self, engine, owner=WORKER_ID, lease_ttl=WORK_LEASE_TTL,
+                 max_attempts=WORK_MAX_ATTEMPTS, retention=WORK_RETENTION):
+        self.engine = engine
+        self.owner = owner
+        self.lease_ttl = lease_ttl
+        self.max_attempts = max_attempts
+        self.retention = retention
+        ignore = "OR IGNORE" if engine.dialect.name == "sqlite" else "IGNORE"
+        self._insert_sql = text(INSERT_WORK_ITEM_SQL.format(ignore=ignore))
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def start(self):
+        """작업 테이블이 없으면 생성하고 heartbeat 시작"""
+        with self.engine.begin() as connection:
+            connection.execute(CREATE_WORK_ITEMS_SQL)
+        if not self._has_claim_index():
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(CREATE_WORK_ITEMS_INDEX_SQL)
+            except DBAPIError:
+                # 여러 replica가 동시에 시작하면 다른 replica가 먼저 만들 수 있음 (MySQL: Duplicate key name)
+                if not self._has_claim_index():
+                    raise
+
+        if self._heartbeat is None:
+            self._stop.clear()
+            self._heartbeat = threading.Thread(target=self._run_heartbeat, name="work-queue-heartbeat", daemon=True)
+            self._heartbeat.start()
+        return self
+
+    def _has_claim_index(self):
+        indexes = inspect(self.engine).get_indexes("crawl_work_items")
+        return any(index["name"] == "idx_crawl_work_items_claim" for index in indexes)
+
+    def close(self):
+        """heartbeat를 멈추고 처리하지 못한 claim은 바로 다른 replica가 가져갈 수 있도록 반환"""
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        with self.engine.begin() as connection:
+            released = connection.execute(RELEASE_OWNED_SQL, {"owner": self.owner}).rowcount
+        if released:
+            work_items.inc(released, result="released")
+            print(f"[info] 처리하지 못한 작업 {released}건 반환")
+
+    def try_lease(self, key, ttl):
+        """key(리스트 샤드 등)에 대한 lease를 ttl초 동안 획득 시도. 다른 replica가 보유 중이면 False"""
+        now = time.time()
+        with self.engine.begin() as connection:
+            connection.execute(self._insert_sql, {"item_key": key, "kind": "list", "payload": None, "now": now})
+            acquired = connection.execute(CLAIM_SQL, {
+                "item_key": key, "owner": self.owner, "lease_until": now + ttl, "attempt": 0, "now": now,
+            }).rowcount == 1
+        list_shards.inc(result="acquired" if acquired else "skipped")
+        return acquired
+
+    def lease_state(self, key):
+        """lease 행에 저장된 상태 (리스트 샤드의 워터마크 등, 없으면 None)"""
+        with self.engine.connect() as connection:
+            row = connection.execute(LEASE_STATE_SQL, {"item_key": key}).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def save_lease_state(self, key, state):
+        """보유 중인 lease 행에 상태 저장. 그 사이 lease가 다른 replica로 넘어갔으면 저장하지 않고 False"""
+        with self.engine.begin() as connection:
+            return connection.execute(SAVE_LEASE_STATE_SQL, {
+                "item_key": key, "owner": self.owner, "payload": json.dumps(state, ensure_ascii=False),
+            }).rowcount == 1
+
+    def enqueue(self, news_list):
+        """기사를 작업 큐에 추가 (이미 있거나 완료된 기사는 무시), 새로 추가된 수 반환"""
+        if not news_list:
+            return 0
+        now = time.time()
+        rows = [{"item_key": article_key(news), "kind": "article", "now": now,
+                 "payload": json.dumps(news.to_dict(), ensure_ascii=False)} for news in news_list]
+        with self.engine.begin() as connection:
+            added = 0
+            for row in rows:
+                added += connection.execute(self._insert_sql, row).rowcount
+        work_items.inc(added, result="enqueued")
+        return added
+
+    def claim(self, limit=1):
+        """대기 중이거나 lease가 만료된 기사를 최대 limit개 claim. [(key, news)] 반환"""
+        now = time.time()
+        with self.engine.connect() as connection:
+            candidates = connection.execute(CLAIM_CANDIDATES_SQL, {
+                "kind": "article", "now": now, "max_attempts": self.max_attempts, "limit": limit * 4,
+            }).fetchall()
+        # 여러 replica가 같은 후보를 동시에 노리지 않도록 순서를 섞음
+        random.shuffle(candidates)
+
+        claimed = []
+        for key, payload in candidates:
+            with self.engine.begin() as connection:
+                won = connection.execute(CLAIM_SQL, {
+                    "item_key": key, "owner": self.owner, "lease_until": now + self.lease_ttl,
+                    "attempt": 1, "now": now,
+                }).rowcount == 1
+            work_items.inc(result="claimed" if won else "claim_conflict")
+            if won:
+                claimed.append((key, Article.from_dict(json.loads(payload))))
+                if len(claimed) >= limit:
+                    break
+        return claimed
+
+    def complete(self, key):
+        """처리 완료 (완료 항목은 보관 기간 동안 남아 재등장한 기사가 다시 들어오지 않음)"""
+        self._finish(key, "done")
+        work_items.inc(result="completed")
+
+    def release(self, key):
+        """처리 실패, 다른 replica(또는 자신)가 다시 claim할 수 있도록 반환"""
+        self._finish(key, "pending")
+        work_items.inc(result="released")
+
+    def _finish(self, key, status):
+        with self.engine.begin() as connection:
+            connection.execute(FINISH_SQL, {"item_key": key, "owner": self.owner, "status": status, "now": time.time()})
+
+    def cleanup(self):
+        """재시도 횟수를 넘긴 기사는 failed 처리, 보관 기간이 지난 완료/실패 항목 삭제"""
+        now = time.time()
+        with self.engine.begin() as connection:
+            failed = connection.execute(FAIL_EXHAUSTED_SQL, {"now": now, "max_attempts": self.max_attempts}).rowcount
+            connection.execute(DELETE_FINISHED_SQL, {"before": now - self.retention})
+        if failed:
+            work_items.inc(failed, result="failed")
+            print(f"[warn] 재시도 횟수를 넘긴 작업 {failed}건 failed 처리")
+
+    def counts(self):
+        """상태별 기사 작업 수"""
+        with self.engine.connect() as connection:
+            return dict(connection.execute(COUNT_BY_STATUS_SQL).fetchall())
+
+    def _run_heartbeat(self):
+        """처리 중인 기사의 lease를 TTL의 1/3 주기로 연장"""
+        interval = max(1.0, self.lease_ttl / 3)
+        while not self._stop.wait(interval):
+            try:
+                with self.engine.begin() as connection:
+                    connection.execute(HEARTBEAT_SQL, {"owner": self.owner, "lease_until": time.time() + self.lease_ttl})
+            except Exception as e:
+                print(f"[warn] 작업 lease 연장 실패: {e}")